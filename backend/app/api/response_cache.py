@@ -0,0 +1,121 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple
+from urllib.parse import urlencode
+from fastapi import Request, Response
+from pydantic import BaseModel
+from app.api.utils import cancel_on_disconnect
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.services.news_events import news_events
+from app.services.singleflight import single_flight
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    generation: int
+    expires: float  # monotonic
+
+
+class ResponseCache:
+    """
+    Serialized responses of hot GET routes, per normalized query
+
+    A hit is answered with the stored bytes, or a bodiless 304 when the
+    client already holds the same ETag, without building or validating
+    models. Entries are dropped when an article is stored or re-analyzed
+    (in this process or, through Redis, another one) and after RESPONSE_CACHE_TTL
+    seconds, which bounds staleness for changes that publish no event
+    (sources added to an existing article).
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.generation = 0
+        self.counters = {"hits": 0, "misses": 0, "not_modified": 0}
+
+    async def start(self):
+        news_events.add_listener(self._on_event)
+
+    async def close(self):
+        news_events.remove_listener(self._on_event)
+
+    def _on_event(self, event: str, data: Dict[str, Any]):
+        if event in ("article", "article_updated"):
+            self.generation += 1
+
+    @staticmethod
+    def key(route: str, params: Dict[str, Any]) -> str:
+        """Cache key from the validated parameters; None values are left out"""
+        return f"response:{route}?" + urlencode(sorted(
+            (name, getattr(value, "value", value))
+            for name, value in params.items()
+            if value is not None
+        ))
+
+    async def serve(
+        self,
+        request: Request,
+        key: str,
+        render: Callable[[], Awaitable[BaseModel]],
+        cacheable: Callable[[BaseModel], bool] = lambda model: True
+    ) -> Any:
+        """
+        Cached response for ``key``, rendering and storing it on a miss
+
+        Concurrent misses share one render. Models ``cacheable`` rejects are
+        served but not stored. Disabled, the rendered model is returned for
+        FastAPI to validate and serialize as usual.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return await cancel_on_disconnect(request, render())
+
+        entry = self._entries.get(key)
+        if entry and entry.generation == self.generation and entry.expires > time.monotonic():
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            record_cache_lookup(key, "l1")
+            return self._response(request, entry.body, entry.etag)
+
+        self.counters["misses"] += 1
+        record_cache_lookup(key, "miss")
+        body, etag = await cancel_on_disconnect(request, single_flight.do(key, lambda: self._render(key, render, cacheable)))
+        return self._response(request, body, etag)
+
+    async def _render(
+        self,
+        key: str,
+        render: Callable[[], Awaitable[BaseModel]],
+        cacheable: Callable[[BaseModel], bool]
+    ):
+        generation = self.generation
+        model = await render()
+        body, etag = self._serialize(model)
+        if cacheable(model):
+            self._entries[key] = CachedResponse(body, etag, generation, time.monotonic() + settings.RESPONSE_CACHE_TTL)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.RESPONSE_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+        return body, etag
+
+    @staticmethod
+    def _serialize(model: BaseModel):
+        # pydantic-core's serializer: the same bytes FastAPI would send
+        body = model.model_dump_json().encode()
+        return body, f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+
+    def _response(self, request: Request, body: bytes, etag: str) -> Response:
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+            self.counters["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "entries": len(self._entries), "generation": self.generation}
+
+
+response_cache = ResponseCache()
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.routes import news, insights, health
+from app.api.routes import news, insights, health, sentiment
 
 api_router = APIRouter()
 
@@ -7,3 +7,4 @@ api_router = APIRouter()
 api_router.include_router(health.router)
 api_router.include_router(news.router)
 api_router.include_router(insights.router)
+api_router.include_router(sentiment.router)
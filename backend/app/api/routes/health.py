@@ -1,8 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
 from datetime import datetime
 
+from app.api.response_cache import response_cache
 from app.models.schemas import HealthResponse
 from app.core.config import settings
+from app.services.cache_service import cache_service
+from app.services.circuit_breaker import circuit_breakers
+from app.services.health_service import health_monitor
+from app.services.llm_governor import llm_governor
+from app.services.news_events import news_events
+from app.services.sentiment_timeseries import sentiment_timeseries
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -12,10 +19,94 @@ async def health_check():
     """
     Health check endpoint
     
-    Returns API status and version information
+    Returns API status ("healthy", or "degraded" while any check fails,
+    shared dependencies included) and version information
     """
+    report = health_monitor.readiness()
+    healthy = report["status"] == "ready" and not report.get("degraded")
     return HealthResponse(
-        status="healthy",
+        status="healthy" if healthy else "degraded",
         version=settings.API_VERSION,
         timestamp=datetime.now()
     )
+
+
+@router.get("/live")
+async def liveness():
+    """
+    Liveness probe
+    
+    Answers as long as the event loop serves requests; checks nothing else
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness(response: Response):
+    """
+    Readiness probe
+    
+    Returns the latest background evaluation of the article store, the
+    event loop, Redis, the OpenAI error rate and circuit, and the NewsAPI
+    circuit; 503 while a check listed in HEALTH_READINESS_CHECKS fails
+    (by default only the worker-local ones)
+    """
+    report = health_monitor.readiness()
+    if report["status"] != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
+@router.get("/cache")
+async def cache_stats():
+    """
+    Cache statistics
+    
+    Returns hit/miss counters for the in-process (L1) and Redis (L2) tiers,
+    and for the serialized GET responses
+    """
+    return {**cache_service.stats(), "responses": response_cache.stats()}
+
+
+@router.get("/llm")
+async def llm_stats():
+    """
+    OpenAI governor statistics
+    
+    Returns in-flight calls, queue depth per priority and remaining
+    per-minute request and token budgets
+    """
+    return llm_governor.stats()
+
+
+@router.get("/circuits")
+async def circuit_stats():
+    """
+    Circuit breaker statistics
+    
+    Returns each dependency's breaker state, the calls, failures and slow
+    calls in its rolling window, and rejected calls
+    """
+    return circuit_breakers.stats()
+
+
+@router.get("/stream")
+async def stream_stats():
+    """
+    News stream statistics
+    
+    Returns connected stream subscribers and published, relayed, delivered
+    and dropped event counts
+    """
+    return news_events.stats()
+
+
+@router.get("/sentiment")
+async def sentiment_stats():
+    """
+    Sentiment time series statistics
+    
+    Returns articles counted, series kept and whether loading from the
+    store has finished
+    """
+    return sentiment_timeseries.stats()
@@ -1,15 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from datetime import datetime
 
 from app.models.schemas import InsightRequest, InsightResponse, SentimentType
 from app.services.openai_service import openai_service
 from app.core.logging import logger
+from app.api.utils import cancel_on_disconnect, stream_json_fields
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
 
+def _insight_response(insights: dict) -> InsightResponse:
+    return InsightResponse(
+        summary=insights.get("summary", ""),
+        confidence=insights.get("confidence", 0.5),
+        recommendations=insights.get("recommendations"),
+        sentiment=SentimentType(insights.get("sentiment", "neutral")),
+        timestamp=datetime.now()
+    )
+
+
 @router.post("", response_model=InsightResponse)
-async def get_market_insights(request: InsightRequest):
+async def get_market_insights(request: InsightRequest, http_request: Request):
     """
     Generate AI-powered market insights for given symbols
     
@@ -19,9 +30,12 @@ async def get_market_insights(request: InsightRequest):
     try:
         logger.info(f"Generating insights for symbols: {request.symbols}")
         
-        insights = await openai_service.generate_market_insights(
-            request.symbols,
-            request.timeframe
+        insights = await cancel_on_disconnect(
+            http_request,
+            openai_service.generate_market_insights(
+                request.symbols,
+                request.timeframe
+            )
         )
         
         if not insights:
@@ -30,15 +44,30 @@ async def get_market_insights(request: InsightRequest):
                 detail="Failed to generate insights"
             )
         
-        return InsightResponse(
-            summary=insights.get("summary", ""),
-            confidence=insights.get("confidence", 0.5),
-            recommendations=insights.get("recommendations"),
-            sentiment=SentimentType(insights.get("sentiment", "neutral")),
-            timestamp=datetime.now()
-        )
+        return _insight_response(insights)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error in get_market_insights endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/stream")
+async def stream_market_insights(request: InsightRequest, http_request: Request):
+    """
+    Generate market insights, streaming the result (Server-Sent Events)
+    
+    - **symbols**: List of stock symbols (1-10)
+    - **timeframe**: Time period for analysis (default: 1d)
+    
+    For a single symbol, sends `delta` events while the summary is written
+    and a `field` event as each field completes. For several, a `field`
+    event named `symbol` carries each symbol's insights as they become
+    available. A final `done` event has the full (combined) insights.
+    """
+    logger.info(f"Streaming insights for symbols: {request.symbols}")
+    return stream_json_fields(
+        http_request,
+        openai_service.stream_market_insights(request.symbols, request.timeframe),
+        _insight_response
+    )
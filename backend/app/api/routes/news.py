@@ -1,28 +1,36 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 from typing import Optional
 from datetime import datetime
 
 from app.models.schemas import (
     NewsResponse,
+    NewsSearchResponse,
     InsightRequest,
     InsightResponse,
     NewsSummaryRequest,
     NewsSummaryResponse,
     CategoryType,
+    SearchSort,
     SentimentType
 )
+from app.api.response_cache import response_cache
+from app.services.article_store import InvalidCursorError
 from app.services.news_service import news_service
 from app.services.openai_service import openai_service
 from app.core.logging import logger
+from app.api.utils import cancel_on_disconnect, event_stream_response, sse_event, stream_json_fields
 
 router = APIRouter(prefix="/news", tags=["news"])
 
 
 @router.get("", response_model=NewsResponse)
 async def get_news(
+    request: Request,
     category: Optional[CategoryType] = Query(None, description="Filter by category"),
     limit: int = Query(10, ge=1, le=50, description="Number of news items"),
-    page: int = Query(1, ge=1, description="Page number")
+    page: int = Query(1, ge=1, description="Page number"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor"),
+    symbol: Optional[str] = Query(None, max_length=10, description="Only news mentioning this ticker")
 ):
     """
     Get news with AI-powered analysis
@@ -30,21 +38,111 @@ async def get_news(
     - **category**: Filter by category (market, tech, crypto, commodities)
     - **limit**: Number of items per page (1-50)
     - **page**: Page number
+    - **cursor**: Continue after the previous page (faster than page for deep pages)
+    - **symbol**: Filter by ticker mentioned in the article (e.g. AAPL, PETR4, BTC)
     """
     try:
-        news_items = await news_service.get_news(category, limit, page)
-        
-        return NewsResponse(
-            news=news_items,
-            total=len(news_items),
-            page=page,
-            page_size=limit
+        # Empty pages are not stored: the store's error fallback is one too
+        return await response_cache.serve(
+            request,
+            response_cache.key("/api/news", {
+                "category": category,
+                "limit": limit,
+                "page": page,
+                "cursor": cursor,
+                "symbol": symbol.upper() if symbol else None,
+            }),
+            lambda: news_service.get_news(category, limit, page, cursor, symbol),
+            cacheable=lambda response: bool(response.news)
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in get_news endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/search", response_model=NewsSearchResponse)
+async def search_news(
+    request: Request,
+    q: str = Query(..., min_length=2, max_length=200, description="Words to search for"),
+    category: Optional[CategoryType] = Query(None, description="Filter by category"),
+    sentiment: Optional[SentimentType] = Query(None, description="Filter by analyzed sentiment"),
+    since: Optional[datetime] = Query(None, alias="from", description="Published at or after"),
+    until: Optional[datetime] = Query(None, alias="to", description="Published at or before"),
+    sort: SearchSort = Query(SearchSort.RELEVANCE, description="relevance or recent"),
+    limit: int = Query(10, ge=1, le=50, description="Number of news items"),
+    page: int = Query(1, ge=1, le=100, description="Page number")
+):
+    """
+    Search analyzed news (full text)
+    
+    - **q**: Words that must all appear in the title, content, summary or
+      key points; accents are ignored, `"exact phrase"` and `prefix*` work
+    - **category**, **sentiment**: Filters
+    - **from**, **to**: Publication date range (ISO 8601)
+    - **sort**: `relevance` (weighted matches per field, over the newest
+      matches) or `recent`
+    """
+    try:
+        return await response_cache.serve(
+            request,
+            response_cache.key("/api/news/search", {
+                "q": " ".join(q.split()),
+                "category": category,
+                "sentiment": sentiment,
+                "from": since.isoformat() if since else None,
+                "to": until.isoformat() if until else None,
+                "sort": sort,
+                "limit": limit,
+                "page": page,
+            }),
+            lambda: news_service.search_news(q, category, sentiment, since, until, sort, limit, page)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in search_news endpoint: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/stream")
+async def stream_news(
+    request: Request,
+    category: Optional[CategoryType] = Query(None, description="Filter by category"),
+    limit: int = Query(10, ge=1, le=50, description="Number of headlines sent up front")
+):
+    """
+    Live news feed (Server-Sent Events)
+    
+    - **headline**: raw NewsAPI article, sent as soon as the search returns
+    - **analysis**: sentiment and summary of a headline, matched by `key`
+    - **article**: newly ingested, analyzed article
+    
+    The stream stays open; idle periods carry keep-alive comments.
+    """
+    async def events():
+        stream = news_service.stream_news(category, limit)
+        try:
+            async for message in stream:
+                if await request.is_disconnected():
+                    break
+                if message is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                event, data = message
+                yield sse_event(event, data)
+        except Exception as e:
+            logger.error(f"Error in stream_news endpoint: {e}")
+            yield sse_event("error", {"detail": "Internal server error"})
+        finally:
+            await stream.aclose()
+
+    return event_stream_response(events())
+
+
 @router.get("/{news_id}/summary")
 async def get_news_summary(news_id: int):
     """
@@ -67,24 +165,50 @@ async def get_news_summary(news_id: int):
 
 
 @router.post("/analyze", response_model=NewsSummaryResponse)
-async def analyze_news(request: NewsSummaryRequest):
+async def analyze_news(request: NewsSummaryRequest, http_request: Request):
     """
     Analyze custom news content with AI
     
     - **content**: News content to analyze
     """
     try:
-        analysis = await openai_service.analyze_news(request.content)
+        analysis = await cancel_on_disconnect(
+            http_request,
+            openai_service.analyze_news(request.content)
+        )
         
         if not analysis:
             raise HTTPException(status_code=500, detail="Failed to analyze news")
         
-        return NewsSummaryResponse(
-            summary=analysis.get("summary", ""),
-            sentiment=SentimentType(analysis.get("sentiment", "neutral")),
-            confidence=analysis.get("confidence", 0.5),
-            key_points=analysis.get("key_points")
-        )
+        return _summary_response(analysis)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in analyze_news endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _summary_response(analysis: dict) -> NewsSummaryResponse:
+    return NewsSummaryResponse(
+        summary=analysis.get("summary", ""),
+        sentiment=SentimentType(analysis.get("sentiment", "neutral")),
+        confidence=analysis.get("confidence", 0.5),
+        key_points=analysis.get("key_points")
+    )
+
+
+@router.post("/analyze/stream")
+async def analyze_news_stream(request: NewsSummaryRequest, http_request: Request):
+    """
+    Analyze custom news content with AI, streaming the result (Server-Sent Events)
+    
+    - **content**: News content to analyze
+    
+    Sends `delta` events while the summary is written, a `field` event as
+    each field completes and a final `done` event with the full analysis.
+    """
+    return stream_json_fields(
+        http_request,
+        openai_service.stream_news_analysis(request.content),
+        _summary_response
+    )
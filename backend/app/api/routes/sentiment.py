@@ -0,0 +1,46 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from datetime import datetime
+
+from app.models.schemas import CategoryType, SentimentTimeseriesResponse, TimeseriesResolution
+from app.services.sentiment_timeseries import sentiment_timeseries
+
+router = APIRouter(prefix="/sentiment", tags=["sentiment"])
+
+
+@router.get("/timeseries", response_model=SentimentTimeseriesResponse)
+async def get_sentiment_timeseries(
+    resolution: TimeseriesResolution = Query(TimeseriesResolution.HOUR, description="Bucket width"),
+    category: Optional[CategoryType] = Query(None, description="Series of one category"),
+    symbol: Optional[str] = Query(None, max_length=10, description="Series of one ticker"),
+    points: int = Query(24, ge=1, le=1440, description="Number of buckets"),
+    until: Optional[datetime] = Query(None, description="Last bucket contains this time (default: now)")
+):
+    """
+    Sentiment of analyzed news over time
+    
+    - **resolution**: 1m, 1h or 1d buckets
+    - **category** or **symbol**: Series to read (default: all news)
+    - **points**: Number of buckets, oldest first (capped at what is kept)
+    
+    Each point has article counts per sentiment, the confidence-weighted
+    score (-1 all negative, 1 all positive) and the mean confidence. Served
+    from incrementally updated buckets.
+    """
+    if category and category != CategoryType.ALL and symbol:
+        raise HTTPException(status_code=400, detail="Filter by category or by symbol, not both")
+
+    category = category if category != CategoryType.ALL else None
+    symbol = symbol.upper() if symbol else None
+    return SentimentTimeseriesResponse(
+        resolution=resolution,
+        category=category,
+        symbol=symbol,
+        points=sentiment_timeseries.query(
+            resolution.value,
+            category.value if category else None,
+            symbol,
+            points,
+            until
+        )
+    )
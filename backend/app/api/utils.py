@@ -0,0 +1,88 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict
+from fastapi import HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.core.logging import logger
+from app.services.json_stream import Event
+
+# Non-standard status used by nginx for "client closed request"
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(
+    request: Request,
+    awaitable: Awaitable[Any],
+    poll_interval: float = 0.25
+) -> Any:
+    """
+    Await a coroutine, cancelling it if the HTTP client goes away
+
+    Long LLM calls keep running after the caller has disconnected unless
+    they are cancelled explicitly, so poll the connection while waiting.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling {request.url.path}")
+                task.cancel()
+                raise HTTPException(
+                    status_code=CLIENT_CLOSED_REQUEST,
+                    detail="Client closed request"
+                )
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def event_stream_response(body: AsyncIterator[str]) -> StreamingResponse:
+    """Server-Sent Events response, unbuffered by proxies"""
+    return StreamingResponse(
+        body,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def stream_json_fields(
+    request: Request,
+    events: AsyncIterator[Event],
+    build: Callable[[Dict], BaseModel]
+) -> StreamingResponse:
+    """
+    Relay a streamed JSON completion as Server-Sent Events
+
+    Sends "delta" ({field, text}) while a string field is generated,
+    "field" ({field, value}) when a field is complete and finally "done"
+    with the validated response built from the whole object. The
+    completion is cancelled if the client goes away.
+    """
+    async def body():
+        try:
+            async for kind, field, value in events:
+                if await request.is_disconnected():
+                    logger.info(f"Client disconnected, cancelling {request.url.path}")
+                    break
+                if kind == "delta":
+                    yield sse_event("delta", {"field": field, "text": value})
+                elif kind == "field":
+                    yield sse_event("field", {"field": field, "value": value})
+                else:
+                    yield sse_event("done", build(value).model_dump(mode="json"))
+        except Exception as e:
+            logger.error(f"Error streaming {request.url.path}: {e}")
+            yield sse_event("error", {"detail": "Internal server error"})
+        finally:
+            await events.aclose()
+
+    return event_stream_response(body())
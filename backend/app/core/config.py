@@ -17,6 +17,41 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-3.5-turbo"
     OPENAI_MAX_TOKENS: int = 300
     OPENAI_TEMPERATURE: float = 0.7
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_TIMEOUT: float = 30.0  # seconds, per completion call
+    OPENAI_CONNECT_TIMEOUT: float = 5.0
+    OPENAI_MAX_RETRIES: int = 2  # retries of 429/5xx/timeouts, with jittered backoff
+    OPENAI_RETRY_BASE_DELAY: float = 0.5  # seconds, doubled per attempt
+    OPENAI_RETRY_MAX_DELAY: float = 20.0
+    OPENAI_MAX_CONNECTIONS: int = 100
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    OPENAI_BATCH_SIZE: int = 10  # articles packed into one analysis prompt
+    OPENAI_MAX_IN_FLIGHT: int = 8  # concurrent completions per process (0 = unlimited)
+    OPENAI_REQUESTS_PER_MINUTE: int = 500  # per-process budgets; 0 disables
+    OPENAI_TOKENS_PER_MINUTE: int = 90000
+    SENTIMENT_PRECLASSIFIER_ENABLED: bool = True  # lexicon classifier in front of analysis calls
+    SENTIMENT_PRECLASSIFIER_THRESHOLD: float = 0.85  # lexicon confidence at which the LLM is skipped
+    INSIGHTS_CONTEXT_ARTICLES: int = 10  # stored headlines per insights prompt (0 = none)
+    
+    # News ingestion
+    INGESTION_ENABLED: bool = False  # poll inside the API process (one per worker); normally worker.py polls
+    INGESTION_INTERVAL: float = 900.0  # seconds between NewsAPI polls
+    INGESTION_PAGE_SIZE: int = 50  # articles fetched per category and poll
+    INGESTION_REANALYZE_LIMIT: int = 100  # fallback-analyzed articles retried per poll
+    NEWS_ANALYSIS_CONCURRENCY: int = 5  # concurrent analysis batches during ingestion
+    STORE_PATH: str = "data/articles.db"  # SQLite article store
+    DEDUP_SIMILARITY: float = 0.7  # estimated Jaccard similarity to cluster near-duplicates
+    DEDUP_WINDOW_HOURS: float = 72.0  # how far back new articles are compared
+    SYMBOLS_FILE: Optional[str] = None  # JSON {symbol: [aliases]} added to the built-in ticker dictionary
+    NEWS_STREAM_QUEUE_SIZE: int = 100  # events buffered per stream subscriber
+    NEWS_STREAM_KEEPALIVE: float = 15.0  # seconds between keep-alive comments on idle streams
+    NEWS_EVENTS_CHANNEL: str = "news:events"  # Redis channel relaying ingestion events
+    SEARCH_RANK_WINDOW: int = 200  # newest matches ranked by relevance in /api/news/search
+    SENTIMENT_TIMESERIES_POINTS: dict = {  # buckets kept per resolution (1 day of minutes, 30 of hours, a year of days)
+        "1m": 1440,
+        "1h": 720,
+        "1d": 365,
+    }
     
     # Security
     SECRET_KEY: str
@@ -25,13 +60,78 @@ class Settings(BaseSettings):
     
     # External APIs
     NEWS_API_KEY: Optional[str] = None
+    NEWS_API_URL: str = "https://newsapi.org/v2/everything"
+    NEWS_API_TIMEOUT: float = 10.0
+    NEWS_API_HTTP2: bool = True  # used when h2 is installed
+    NEWS_API_MAX_CONNECTIONS: int = 20
+    NEWS_API_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    NEWS_API_KEEPALIVE_EXPIRY: float = 60.0  # seconds an idle connection is kept
+    NEWS_API_CACHE_TTL: float = 300.0  # freshness when responses carry no max-age
+    NEWS_API_CACHE_MAX_ENTRIES: int = 256
     ALPHA_VANTAGE_KEY: Optional[str] = None
     
     # Redis
-    REDIS_HOST: str = "localhost"
+    REDIS_HOST: Optional[str] = None  # unset: no Redis, in-process cache and rate limits only
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: float = 1.0  # seconds to wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_HEALTH_INTERVAL: float = 5.0  # seconds between health probes
     CACHE_TTL: int = 300  # 5 minutes
+    CACHE_STALE_TTL: int = 600  # extra seconds a stale entry is served while it refreshes
+    CACHE_REFRESH_AHEAD_ENABLED: bool = False
+    CACHE_REFRESH_AHEAD_INTERVAL: float = 30.0
+    CACHE_REFRESH_AHEAD_KEYS: int = 100  # hottest keys refreshed before going stale
+    CACHE_L1_MAX_BYTES: int = 32 * 1024 * 1024  # in-process cache size bound
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_LOCK_TTL: float = 35.0  # seconds a worker may hold a recompute lock
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05
+    CACHE_SERIALIZER: str = "orjson"  # orjson, msgpack or json; json if not installed
+    CACHE_COMPRESSION: str = "zstd"  # zstd, lz4, zlib or none; zlib if not installed
+    CACHE_COMPRESSION_MIN_BYTES: int = 1024  # smaller values are stored uncompressed
+    CACHE_SCHEMA_VERSION: int = 1  # bump when cached values change shape; older entries become misses
+    
+    # Response cache (serialized GET responses, per process)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: float = 30.0  # seconds; new articles invalidate sooner
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    
+    # Rate limiting
+    RATE_LIMIT_PER_MINUTE: int = 60  # default budget per client
+    RATE_LIMIT_ROUTES: dict = {  # per-client budgets for path prefixes
+        "/api/insights": 10,
+        "/api/news/analyze": 20,
+        "/api/health": 600,
+    }
+    RATE_LIMIT_BACKEND: str = "redis"  # "redis" shares limits across workers, "memory" is per process
+    RATE_LIMIT_MAX_CLIENTS: int = 100000  # in-process clients tracked before evicting the idlest
+    RATE_LIMIT_EXEMPT: list = ["/api/health/live", "/api/health/ready"]  # load balancer probes
+    
+    # Metrics
+    METRICS_ENABLED: bool = True  # /metrics and per-request instrumentation
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5  # seconds between event-loop lag samples
+    
+    # Circuit breakers
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_BREAKERS: dict = {  # per dependency; rates are shares of the calls in the window (seconds)
+        "openai": {"window": 60.0, "min_calls": 10, "failure_rate": 0.5, "slow_call_seconds": 25.0,
+                   "slow_call_rate": 0.8, "open_seconds": 30.0, "half_open_calls": 2},
+        "newsapi": {"window": 300.0, "min_calls": 3, "failure_rate": 0.5, "slow_call_seconds": 5.0,
+                    "slow_call_rate": 0.8, "open_seconds": 60.0, "half_open_calls": 1},
+    }
+    CIRCUIT_SYNC_INTERVAL: float = 1.0  # seconds between reads of the states shared in Redis
+    
+    # Health checks
+    HEALTH_CHECK_INTERVAL: float = 5.0  # seconds between readiness evaluations
+    HEALTH_ERROR_WINDOW: float = 60.0  # seconds of dependency calls the error rates cover
+    HEALTH_MAX_ERROR_RATE: float = 0.5  # above this a dependency counts as failing
+    HEALTH_MIN_CALLS: int = 5  # calls in the window before an error rate is judged
+    HEALTH_STORE_TIMEOUT: float = 2.0  # seconds the article store has to answer
+    HEALTH_MAX_LOOP_LAG: float = 2.0  # seconds of event-loop lag before the worker is not ready
+    # Failing ones make /api/health/ready 503; the others only mark /api/health "degraded".
+    # Keep shared dependencies (redis, openai, newsapi) out: they would fail every worker at once.
+    HEALTH_READINESS_CHECKS: list = ["store", "event_loop"]
     
     # CORS
     CORS_ORIGINS: list = ["*"]
@@ -0,0 +1,143 @@
+import asyncio
+import functools
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.config import settings
+from app.core.logging import logger
+
+# Seconds; from L1 cache hits to slow completions
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUESTS = Counter(
+    "finmarket_http_requests_total",
+    "HTTP requests by route template and status",
+    ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "finmarket_http_request_duration_seconds",
+    "Time until the response starts (streams: until the first byte), per route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+DEPENDENCY_LATENCY = Histogram(
+    "finmarket_dependency_duration_seconds",
+    "Latency of calls to external dependencies",
+    ["dependency", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+DEPENDENCY_ERRORS = Counter(
+    "finmarket_dependency_errors_total",
+    "Failed calls to external dependencies, by exception type",
+    ["dependency", "operation", "error"]
+)
+CACHE_LOOKUPS = Counter(
+    "finmarket_cache_lookups_total",
+    "Cache lookups by key prefix and result (l1, l2 or miss)",
+    ["prefix", "result"]
+)
+LLM_IN_FLIGHT = Gauge("finmarket_llm_in_flight", "OpenAI calls in flight")
+LLM_QUEUED = Gauge("finmarket_llm_queued", "OpenAI calls waiting for the governor")
+LLM_QUEUE_DEPTH = Gauge("finmarket_llm_queue_depth", "OpenAI calls waiting for the governor, by priority", ["priority"])
+LLM_REQUESTS_AVAILABLE = Gauge("finmarket_llm_requests_available", "Requests left in the governor's per-minute budget")
+LLM_TOKENS_AVAILABLE = Gauge("finmarket_llm_tokens_available", "Tokens left in the governor's per-minute budget")
+CIRCUIT_STATE = Gauge(
+    "finmarket_circuit_state",
+    "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+    ["dependency"]
+)
+CIRCUIT_TRANSITIONS = Counter(
+    "finmarket_circuit_transitions_total",
+    "Circuit breaker state changes, by the state entered",
+    ["dependency", "state"]
+)
+CIRCUIT_REJECTED = Counter(
+    "finmarket_circuit_rejected_total",
+    "Calls failed fast by an open circuit breaker",
+    ["dependency"]
+)
+EVENT_LOOP_LAG = Histogram(
+    "finmarket_event_loop_lag_seconds",
+    "How late the event loop runs a timer scheduled every METRICS_LOOP_LAG_INTERVAL",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+# Labelled children are looked up once: .labels() takes a lock per call
+_cache_lookups: Dict[Tuple[str, str], Any] = {}
+
+
+def timed(dependency: str, operation: str) -> Callable:
+    """
+    Decorator for async calls to an external dependency: records their
+    latency and, by exception type, their failures (exceptions propagate)
+    """
+    latency = DEPENDENCY_LATENCY.labels(dependency, operation)
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception as e:
+                DEPENDENCY_ERRORS.labels(dependency, operation, type(e).__name__).inc()
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def record_cache_lookup(key: str, result: str):
+    """Count a lookup of ``prefix:hash`` key as an "l1", "l2" or "miss" result"""
+    prefix = key.split(":", 1)[0]
+    child = _cache_lookups.get((prefix, result))
+    if child is None:
+        child = _cache_lookups[(prefix, result)] = CACHE_LOOKUPS.labels(prefix, result)
+    child.inc()
+
+
+def dependency_totals() -> Dict[str, Tuple[float, float]]:
+    """(calls, errors) so far per dependency, summed over operations"""
+    totals: Dict[str, List[float]] = {}
+    for metric in DEPENDENCY_LATENCY.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_count"):
+                totals.setdefault(sample.labels["dependency"], [0.0, 0.0])[0] += sample.value
+    for metric in DEPENDENCY_ERRORS.collect():
+        for sample in metric.samples:
+            if sample.name.endswith("_total"):
+                totals.setdefault(sample.labels["dependency"], [0.0, 0.0])[1] += sample.value
+    return {dependency: (calls, errors) for dependency, (calls, errors) in totals.items()}
+
+
+class EventLoopMonitor:
+    """Measures event-loop lag: how late a periodic timer actually fires"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self.last_lag = 0.0
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        interval = settings.METRICS_LOOP_LAG_INTERVAL
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.last_lag = max(0.0, time.perf_counter() - started - interval)
+            EVENT_LOOP_LAG.observe(self.last_lag)
+            if self.last_lag > 1.0:
+                logger.warning(f"Event loop lagging: {self.last_lag:.2f}s")
+
+
+loop_monitor = EventLoopMonitor()
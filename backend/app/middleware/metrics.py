@@ -0,0 +1,83 @@
+import time
+from typing import Any, Callable, Dict, Tuple
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import HTTP_LATENCY, HTTP_REQUESTS
+
+# Route endpoint -> path template, built on first use (routes are fixed by then)
+_templates: Dict[Callable, str] = {}
+# Labelled children are looked up once: .labels() takes a lock per call
+_children: Dict[Tuple[str, ...], Any] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the route that handled the request ("/api/news/{news_id}/summary")
+
+    Templates rather than paths keep label cardinality bounded. The router
+    leaves the matched endpoint in the scope; requests answered before
+    routing (rate limited, errors) are matched against the routes instead.
+    """
+    routes = scope["app"].routes
+    if not _templates:
+        _templates.update({
+            route.endpoint: route.path
+            for route in routes
+            if hasattr(route, "endpoint")
+        })
+
+    endpoint = scope.get("endpoint")
+    if endpoint in _templates:
+        return _templates[endpoint]
+    for route in routes:
+        if route.matches(scope)[0] == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    return "unmatched"
+
+
+def _child(metric, *labels: str):
+    child = _children.get((metric._name, *labels))
+    if child is None:
+        child = _children[(metric._name, *labels)] = metric.labels(*labels)
+    return child
+
+
+class MetricsMiddleware:
+    """
+    Counts requests and times them, per route template, until the response
+    starts
+
+    Plain ASGI rather than ``app.middleware("http")``: that wraps every
+    request in a task group and memory streams, which would cost more than
+    the metrics themselves.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        responded = False
+
+        def record(status: int):
+            route = route_template(scope)
+            _child(HTTP_LATENCY, scope["method"], route).observe(time.perf_counter() - started)
+            _child(HTTP_REQUESTS, scope["method"], route, str(status)).inc()
+
+        async def send_wrapper(message: Message):
+            nonlocal responded
+            if message["type"] == "http.response.start":
+                responded = True
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            if not responded:
+                record(500)
+            raise
@@ -1,49 +1,194 @@
-from fastapi import Request, HTTPException, status
-from collections import defaultdict
-from datetime import datetime, timedelta
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from app.core.config import settings
 from app.core.logging import logger
+from app.services.cache_service import cache_service
+
+WINDOW = 60.0  # seconds
+
+# Sliding-window counter shared by all workers. KEYS: current and previous
+# window counters; ARGV: limit, window and elapsed time in the window (ms).
+# Returns the current count before this request, the previous count and
+# whether the request was allowed (and counted).
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local current = tonumber(redis.call("get", KEYS[1]) or "0")
+local previous = tonumber(redis.call("get", KEYS[2]) or "0")
+if previous * (window - elapsed) / window + current >= limit then
+    return {current, previous, 0}
+end
+if redis.call("incr", KEYS[1]) == 1 then
+    redis.call("pexpire", KEYS[1], window * 2)
+end
+return {current, previous, 1}
+"""
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until a request would be allowed
+
+
+def sliding_window(
+    previous: int,
+    current: int,
+    limit: int,
+    elapsed: float,
+    window: float,
+    allowed: Optional[bool] = None
+) -> RateLimitResult:
+    """
+    Decide a request from the previous and current fixed-window counts
+
+    The previous window's count is weighted by the share of it that still
+    overlaps the sliding window ending now. A decision already taken
+    elsewhere (the Redis script) is passed as ``allowed`` and only the
+    remaining budget and retry delay are computed.
+    """
+    rate = previous * (window - elapsed) / window + current
+    if allowed is None:
+        allowed = rate < limit
+    if allowed:
+        return RateLimitResult(True, limit, max(0, math.floor(limit - rate - 1)), 0.0)
+
+    if current < limit and previous:
+        # The previous window's weight decays until the rate drops below limit
+        retry_after = (window - elapsed) - (limit - current) * window / previous
+    else:
+        # Only the next window helps, once this one's weight has decayed enough
+        retry_after = (window - elapsed) + max(0.0, window * (1 - limit / max(current, 1)))
+    return RateLimitResult(False, limit, 0, max(retry_after, 0.0))
+
+
+class SlidingWindowCounter:
+    """
+    In-process sliding-window counters with O(1) state per key
+
+    Each key keeps its window index and two counts. Keys are ordered by last
+    use; a key idle for two windows carries no information and is evicted,
+    as is the idlest key once ``max_keys`` are tracked.
+    """
+
+    def __init__(self, window: float = WINDOW, max_keys: int = 100000):
+        self.window = window
+        self.max_keys = max_keys
+        # key -> [window index, previous count, current count]
+        self._state: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def hit(self, key: str, limit: int) -> RateLimitResult:
+        """Count a request for key if it is within limit"""
+        now = time.monotonic()
+        index = int(now // self.window)
+        self._evict(index)
+
+        state = self._state.get(key)
+        if state is None:
+            state = self._state[key] = [index, 0, 0]
+        else:
+            self._state.move_to_end(key)
+            if state[0] != index:
+                state[1] = state[2] if state[0] == index - 1 else 0
+                state[0], state[2] = index, 0
+
+        result = sliding_window(state[1], state[2], limit, now - index * self.window, self.window)
+        if result.allowed:
+            state[2] += 1
+        return result
+
+    def _evict(self, index: int):
+        while self._state:
+            state = next(iter(self._state.values()))
+            if state[0] >= index - 1 and len(self._state) < self.max_keys:
+                break
+            self._state.popitem(last=False)
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter"""
-    
-    def __init__(self, requests_per_minute: int = 60):
+    """
+    Per-client, per-route rate limiter
+
+    Budgets are requests per minute per client, chosen by the longest
+    matching path prefix in ``routes``. With the Redis backend the counters
+    live in Redis and hold across workers; while Redis is unreachable each
+    worker falls back to its own in-process counters.
+    """
+
+    def __init__(self, requests_per_minute: int, routes: Dict[str, int], backend: str = "redis"):
         self.requests_per_minute = requests_per_minute
-        self.requests = defaultdict(list)
-    
-    def is_allowed(self, client_id: str) -> bool:
-        """Check if request is allowed"""
-        now = datetime.now()
-        minute_ago = now - timedelta(minutes=1)
-        
-        # Clean old requests
-        self.requests[client_id] = [
-            req_time for req_time in self.requests[client_id]
-            if req_time > minute_ago
-        ]
-        
-        # Check limit
-        if len(self.requests[client_id]) >= self.requests_per_minute:
-            return False
-        
-        # Add current request
-        self.requests[client_id].append(now)
-        return True
-
-
-rate_limiter = RateLimiter(requests_per_minute=60)
+        # Longest prefix first
+        self.routes = sorted(routes.items(), key=lambda route: len(route[0]), reverse=True)
+        self.backend = backend
+        self.local = SlidingWindowCounter(max_keys=settings.RATE_LIMIT_MAX_CLIENTS)
+
+    def budget(self, path: str) -> Tuple[str, int]:
+        """(bucket name, requests per minute) for a request path"""
+        for prefix, limit in self.routes:
+            if path.startswith(prefix):
+                return prefix, limit
+        return "default", self.requests_per_minute
+
+    async def hit(self, client_id: str, path: str) -> RateLimitResult:
+        """Count a request, returning whether it is allowed"""
+        bucket, limit = self.budget(path)
+        key = f"{bucket}:{client_id}"
+
+        if self.backend == "redis":
+            now = time.time()
+            index = int(now // WINDOW)
+            elapsed_ms = int((now - index * WINDOW) * 1000)
+            counts = await cache_service.eval(
+                SLIDING_WINDOW_SCRIPT,
+                keys=[f"ratelimit:{key}:{index}", f"ratelimit:{key}:{index - 1}"],
+                args=[limit, int(WINDOW * 1000), elapsed_ms]
+            )
+            if counts is not None:
+                current, previous, allowed = (int(count) for count in counts)
+                # The script counted the request only if it allowed it: its decision stands
+                return sliding_window(previous, current, limit, elapsed_ms / 1000, WINDOW, allowed=bool(allowed))
+
+        return self.local.hit(key, limit)
+
+
+rate_limiter = RateLimiter(
+    requests_per_minute=settings.RATE_LIMIT_PER_MINUTE,
+    routes=settings.RATE_LIMIT_ROUTES,
+    backend=settings.RATE_LIMIT_BACKEND
+)
 
 
 async def rate_limit_middleware(request: Request, call_next):
     """Rate limiting middleware"""
-    client_ip = request.client.host
-    
-    if not rate_limiter.is_allowed(client_ip):
-        logger.warning(f"Rate limit exceeded for {client_ip}")
-        raise HTTPException(
+    if request.url.path in settings.RATE_LIMIT_EXEMPT:
+        return await call_next(request)
+
+    client_ip = request.client.host if request.client else "unknown"
+    result = await rate_limiter.hit(client_ip, request.url.path)
+    headers = {
+        "X-RateLimit-Limit": str(result.limit),
+        "X-RateLimit-Remaining": str(result.remaining),
+    }
+
+    if not result.allowed:
+        logger.warning(f"Rate limit exceeded for {client_ip} on {request.url.path}")
+        # Raising HTTPException here would bypass FastAPI's handlers and end
+        # up as a 500, so the 429 is returned directly
+        return JSONResponse(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="Too many requests. Please try again later."
+            content={"detail": "Too many requests. Please try again later."},
+            headers={**headers, "Retry-After": str(max(1, math.ceil(result.retry_after)))}
         )
-    
+
     response = await call_next(request)
+    response.headers.update(headers)
     return response
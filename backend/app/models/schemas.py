@@ -28,6 +28,8 @@ class NewsItem(BaseModel):
     confidence: Optional[float] = Field(None, ge=0.0, le=1.0)
     source: Optional[str] = None
     symbols: Optional[List[str]] = None
+    sources: Optional[List[str]] = None
+    analysis_pending: bool = False
 
 
 class NewsResponse(BaseModel):
@@ -35,6 +37,43 @@ class NewsResponse(BaseModel):
     total: int
     page: int = 1
     page_size: int = 10
+    next_cursor: Optional[str] = None
+
+
+class SearchSort(str, Enum):
+    RELEVANCE = "relevance"
+    RECENT = "recent"
+
+
+class NewsSearchResponse(BaseModel):
+    query: str
+    news: List[NewsItem]
+    page: int = 1
+    page_size: int = 10
+    has_more: bool = False
+
+
+class TimeseriesResolution(str, Enum):
+    MINUTE = "1m"
+    HOUR = "1h"
+    DAY = "1d"
+
+
+class SentimentPoint(BaseModel):
+    timestamp: datetime  # bucket start (UTC)
+    count: int
+    positive: int
+    negative: int
+    neutral: int
+    score: float = Field(..., ge=-1.0, le=1.0)  # confidence-weighted mean polarity
+    confidence: Optional[float] = None  # mean confidence of the bucket's analyses
+
+
+class SentimentTimeseriesResponse(BaseModel):
+    resolution: TimeseriesResolution
+    category: Optional[CategoryType] = None
+    symbol: Optional[str] = None
+    points: List[SentimentPoint]
 
 
 class InsightRequest(BaseModel):
@@ -0,0 +1,582 @@
+import asyncio
+import base64
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    category TEXT NOT NULL,
+    published_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published
+    ON articles (published_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_articles_category_published
+    ON articles (category, published_at DESC, id DESC);
+-- Articles stored with the fallback analysis, waiting to be re-analyzed
+CREATE INDEX IF NOT EXISTS idx_articles_analysis_pending
+    ON articles (published_at DESC) WHERE json_extract(data, '$.analysis.method') = 'fallback';
+
+CREATE TABLE IF NOT EXISTS article_symbols (
+    symbol TEXT NOT NULL,
+    published_at REAL NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    PRIMARY KEY (symbol, published_at, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_article_symbols_article
+    ON article_symbols (article_id);
+
+-- Near-duplicate reports of a stored article (same story, other outlets)
+CREATE TABLE IF NOT EXISTS article_sources (
+    key TEXT PRIMARY KEY,
+    article_id INTEGER NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    source TEXT,
+    title TEXT,
+    url TEXT,
+    published_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_article_sources_article
+    ON article_sources (article_id, published_at);
+
+-- Row counts kept by triggers so totals never need a scan
+CREATE TABLE IF NOT EXISTS category_counts (
+    category TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS symbol_counts (
+    symbol TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS articles_count_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO category_counts (category, count) VALUES (NEW.category, 1)
+        ON CONFLICT (category) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS articles_count_delete AFTER DELETE ON articles BEGIN
+    UPDATE category_counts SET count = count - 1 WHERE category = OLD.category;
+END;
+CREATE TRIGGER IF NOT EXISTS symbols_count_insert AFTER INSERT ON article_symbols BEGIN
+    INSERT INTO symbol_counts (symbol, count) VALUES (NEW.symbol, 1)
+        ON CONFLICT (symbol) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS symbols_count_delete AFTER DELETE ON article_symbols BEGIN
+    UPDATE symbol_counts SET count = count - 1 WHERE symbol = OLD.symbol;
+END;
+"""
+
+# Full-text index of title, content, AI summary and key points. It is
+# contentless (the text lives in articles.data) and kept in sync by
+# triggers; accents are folded so "acoes" finds "ações". The analyzed
+# sentiment is indexed too, so filtering on it is part of the MATCH.
+FTS_TEXT_COLUMNS = ["title", "content", "summary", "key_points"]
+FTS_COLUMNS = ", ".join(FTS_TEXT_COLUMNS + ["sentiment"])
+
+
+def _fts_values(row: str) -> str:
+    """SQL expressions for the indexed columns of an articles row"""
+    return (
+        f"json_extract({row}.data, '$.title'), "
+        f"COALESCE(NULLIF(json_extract({row}.data, '$.content'), ''), json_extract({row}.data, '$.description')), "
+        f"json_extract({row}.data, '$.analysis.summary'), "
+        f"(SELECT group_concat(value, ' ') FROM json_each({row}.data, '$.analysis.key_points')), "
+        f"json_extract({row}.data, '$.analysis.sentiment')"
+    )
+
+
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    {FTS_COLUMNS}, content='', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, {FTS_COLUMNS}) VALUES (NEW.id, {_fts_values("NEW")});
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', OLD.id, {_fts_values("OLD")});
+END;
+CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF data ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', OLD.id, {_fts_values("OLD")});
+    INSERT INTO articles_fts (rowid, {FTS_COLUMNS}) VALUES (NEW.id, {_fts_values("NEW")});
+END;
+"""
+# Relevance weight of a query term found in each column: a title match counts most
+FTS_WEIGHTS = {"title": 4, "content": 1, "summary": 2, "key_points": 2}
+SCHEMA_VERSION = 1  # 1: full-text index
+# Same expression as the partial index, so queries can use it
+ANALYSIS_PENDING = "json_extract(data, '$.analysis.method') = 'fallback'"
+
+
+def fts_terms(text: str) -> List[str]:
+    """
+    FTS5 query terms for free text: words, "quoted phrases" as phrases
+    and a trailing * as a prefix; all of them must match
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"|(\S+)', text):
+        words = re.findall(r"\w+", phrase or word)
+        if not words:
+            continue
+        term = '"' + " ".join(words) + '"'
+        if word.endswith("*"):
+            term += "*"
+        terms.append(term)
+    return terms
+
+
+def parse_published_at(value: Optional[str]) -> datetime:
+    """Parse a NewsAPI/ISO timestamp into an aware UTC datetime"""
+    try:
+        published = datetime.fromisoformat((value or "").replace("Z", "+00:00"))
+    except ValueError:
+        published = datetime.now(timezone.utc)
+    if published.tzinfo is None:
+        published = published.astimezone()
+    return published.astimezone(timezone.utc)
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a pagination cursor that was not produced by encode_cursor"""
+
+
+def encode_cursor(published_at: float, article_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{published_at!r}:{article_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_cursor"""
+    try:
+        published_at, article_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return float(published_at), int(article_id)
+    except Exception as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+class ArticleStore:
+    """
+    Persistent store of enriched (analyzed) articles, backed by SQLite
+
+    Articles get a stable integer id on insert and are deduplicated by
+    article_key. Near-duplicate reports of a stored article are kept as its
+    sources rather than as articles of their own. Listing is keyset-paginated
+    on the (category, published_at) and (symbol, published_at) indexes, and
+    totals come from trigger-kept counters, so both stay fast at millions of
+    rows. An FTS5 index, also kept by triggers, serves full-text search. The
+    database runs in WAL mode, which lets a separate ingestion process write
+    while API workers read.
+
+    sqlite3 calls are blocking, so they run in a worker thread; a lock
+    serializes use of the shared connection.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def article_key(article: Dict) -> str:
+        """Deduplication key: the URL, or title and source when there is none"""
+        identity = article.get("url") or f"{article.get('title', '')}|{article.get('source', '')}"
+        return hashlib.sha1(identity.encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            conn.executescript(FTS_SCHEMA)
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # Stores created before the full-text index: index what is there
+                self._rebuild_search_index(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn = conn
+            logger.info(f"Article store opened: {self.path}")
+        return self._conn
+
+    @staticmethod
+    def _rebuild_search_index(conn: sqlite3.Connection) -> int:
+        """Re-index every stored article; returns how many were indexed"""
+        conn.execute("BEGIN")
+        try:
+            conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('delete-all')")
+            indexed = conn.execute(
+                f"INSERT INTO articles_fts (rowid, {FTS_COLUMNS}) "
+                f"SELECT id, {_fts_values('articles')} FROM articles"
+            ).rowcount
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return indexed
+
+    async def rebuild_search_index(self) -> int:
+        return await self._run(self._rebuild_search_index)
+
+    async def _run(self, fn, *args):
+        def call():
+            with self._lock:
+                return fn(self._connect(), *args)
+        return await asyncio.to_thread(call)
+
+    async def close(self):
+        def close():
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+        await asyncio.to_thread(close)
+
+    @staticmethod
+    def _row_to_article(row) -> Dict:
+        article_id, category, published_at, data = row
+        article = json.loads(data)
+        article["id"] = article_id
+        article["category"] = category
+        article["published_at"] = datetime.fromtimestamp(published_at, timezone.utc).isoformat()
+        return article
+
+    async def known_keys(self, keys: List[str]) -> Set[str]:
+        """Subset of keys already stored, as articles or as sources"""
+        def known_keys(conn):
+            known = set()
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(keys), 250):
+                chunk = keys[i:i + 250]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key FROM articles WHERE key IN ({placeholders}) "
+                    f"UNION ALL SELECT key FROM article_sources WHERE key IN ({placeholders})",
+                    chunk + chunk
+                ).fetchall()
+                known.update(row[0] for row in rows)
+            return known
+        return await self._run(known_keys)
+
+    async def add(self, article: Dict) -> Optional[int]:
+        """Insert an article; returns its id, or None if it was already stored"""
+        return (await self.add_many([article]))[0]
+
+    async def add_many(self, articles: List[Dict]) -> List[Optional[int]]:
+        """Insert articles in one transaction; None marks already stored ones"""
+        def add_many(conn):
+            ids = []
+            conn.execute("BEGIN")
+            try:
+                for article in articles:
+                    ids.append(self._insert(conn, article))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return ids
+        return await self._run(add_many)
+
+    def _insert(self, conn: sqlite3.Connection, article: Dict) -> Optional[int]:
+        published_at = parse_published_at(article.get("published_at")).timestamp()
+        data = {k: v for k, v in article.items() if k not in ("id", "category", "published_at")}
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO articles (key, category, published_at, data) VALUES (?, ?, ?, ?)",
+            (self.article_key(article), article["category"], published_at, json.dumps(data))
+        )
+        if cursor.rowcount == 0:
+            return None
+
+        article_id = cursor.lastrowid
+        symbols = sorted(set(article.get("symbols") or []))
+        conn.executemany(
+            "INSERT OR IGNORE INTO article_symbols (symbol, published_at, article_id) VALUES (?, ?, ?)",
+            [(symbol, published_at, article_id) for symbol in symbols]
+        )
+        return article_id
+
+    async def add_sources(self, sources: List[Tuple[int, Dict]]):
+        """Attach (article id, near-duplicate article) pairs as extra sources"""
+        def add_sources(conn):
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_sources (key, article_id, source, title, url, published_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.article_key(article),
+                        article_id,
+                        article.get("source"),
+                        article.get("title"),
+                        article.get("url"),
+                        parse_published_at(article.get("published_at")).timestamp()
+                    )
+                    for article_id, article in sources
+                ]
+            )
+        await self._run(add_sources)
+
+    async def sources(self, article_ids: List[int]) -> Dict[int, List[Dict]]:
+        """Near-duplicate sources of each article, oldest first"""
+        def sources(conn):
+            if not article_ids:
+                return []
+            return conn.execute(
+                "SELECT article_id, source, title, url, published_at FROM article_sources "
+                f"WHERE article_id IN ({', '.join('?' * len(article_ids))}) "
+                "ORDER BY article_id, published_at",
+                article_ids
+            ).fetchall()
+
+        result: Dict[int, List[Dict]] = {}
+        for article_id, source, title, url, published_at in await self._run(sources):
+            result.setdefault(article_id, []).append({
+                "source": source,
+                "title": title,
+                "url": url,
+                "published_at": datetime.fromtimestamp(published_at, timezone.utc).isoformat()
+            })
+        return result
+
+    async def recent(self, since: datetime) -> List[Dict]:
+        """Articles published at or after ``since``, newest first"""
+        def recent(conn):
+            return conn.execute(
+                "SELECT id, category, published_at, data FROM articles "
+                "WHERE published_at >= ? ORDER BY published_at DESC, id DESC",
+                (since.timestamp(),)
+            ).fetchall()
+        return [self._row_to_article(row) for row in await self._run(recent)]
+
+    async def last_id(self) -> int:
+        def last_id(conn):
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+        return await self._run(last_id)
+
+    async def sentiment_points(
+        self,
+        since: datetime,
+        up_to_id: int,
+        after: Optional[Tuple[float, int]] = None,
+        limit: int = 10000
+    ) -> List[Tuple[int, float, str, Optional[str], Optional[float], List[str]]]:
+        """
+        (id, published_at, category, sentiment, confidence, symbols) of
+        articles published since ``since``, oldest first, without decoding
+        whole articles. Page with ``after`` = (published_at, id) of the last
+        row; ``up_to_id`` excludes articles stored later. Articles whose
+        analysis is pending (the fallback) are left out.
+        """
+        conditions = ["published_at >= ?", "id <= ?", "json_extract(data, '$.analysis.method') IS NOT 'fallback'"]
+        params = [since.timestamp(), up_to_id]
+        if after:
+            conditions.append("(published_at, id) > (?, ?)")
+            params.extend(after)
+
+        def sentiment_points(conn):
+            return conn.execute(
+                "SELECT id, published_at, category, json_extract(data, '$.analysis.sentiment'), "
+                "json_extract(data, '$.analysis.confidence'), json_extract(data, '$.symbols') "
+                f"FROM articles WHERE {' AND '.join(conditions)} ORDER BY published_at, id LIMIT ?",
+                params + [limit]
+            ).fetchall()
+
+        return [
+            (article_id, published_at, category, sentiment, confidence, json.loads(symbols) if symbols else [])
+            for article_id, published_at, category, sentiment, confidence, symbols in await self._run(sentiment_points)
+        ]
+
+    async def pending_analysis(self, limit: int) -> List[Dict]:
+        """Newest articles stored with the fallback analysis (OpenAI was unavailable)"""
+        def pending_analysis(conn):
+            return conn.execute(
+                "SELECT id, category, published_at, data FROM articles "
+                f"WHERE {ANALYSIS_PENDING} ORDER BY published_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [self._row_to_article(row) for row in await self._run(pending_analysis)]
+
+    async def update_analyses(self, analyses: List[Tuple[int, Dict]]):
+        """Replace the analysis of (article id, analysis) pairs in one transaction"""
+        def update_analyses(conn):
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "UPDATE articles SET data = json_set(data, '$.analysis', json(?)) WHERE id = ?",
+                    [(json.dumps(analysis), article_id) for article_id, analysis in analyses]
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        await self._run(update_analyses)
+
+    async def get(self, article_id: int) -> Optional[Dict]:
+        def get(conn):
+            row = conn.execute(
+                "SELECT id, category, published_at, data FROM articles WHERE id = ?",
+                (article_id,)
+            ).fetchone()
+            return self._row_to_article(row) if row else None
+        return await self._run(get)
+
+    async def list(
+        self,
+        category: Optional[str] = None,
+        symbol: Optional[str] = None,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        offset: int = 0
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Newest articles first, optionally filtered by category and/or symbol
+
+        Pass the returned cursor back to get the next page; it seeks on the
+        index instead of skipping rows. ``offset`` is kept for page-number
+        clients and costs a scan of the skipped rows.
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        if symbol:
+            base = (
+                "SELECT a.id, a.category, a.published_at, a.data FROM article_symbols s "
+                "JOIN articles a ON a.id = s.article_id"
+            )
+            published_column, id_column, category_column = "s.published_at", "s.article_id", "a.category"
+            conditions, params = ["s.symbol = ?"], [symbol]
+        else:
+            base = "SELECT id, category, published_at, data FROM articles"
+            published_column, id_column, category_column = "published_at", "id", "category"
+            conditions, params = [], []
+
+        if category:
+            conditions.append(f"{category_column} = ?")
+            params.append(category)
+        if after:
+            conditions.append(f"({published_column}, {id_column}) < (?, ?)")
+            params.extend(after)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"{base}{where} ORDER BY {published_column} DESC, {id_column} DESC "
+            "LIMIT ? OFFSET ?"
+        )
+        # One row past the page tells whether there is a next one
+        params.extend([limit + 1, offset])
+
+        def list_articles(conn):
+            return conn.execute(sql, params).fetchall()
+
+        rows = await self._run(list_articles)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][2], rows[-1][0]) if rows else None
+        return [self._row_to_article(row) for row in rows], next_cursor
+
+    async def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        sentiment: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sort: str = "relevance",
+        limit: int = 10,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Full-text search over title, content, summary and key points
+
+        ``sort="recent"`` returns matches newest-stored first. The index is
+        read in rowid order and stops at the page, so a very common term
+        costs no more than a rare one.
+
+        ``sort="relevance"`` ranks only the newest SEARCH_RANK_WINDOW
+        matches. Each term scores its FTS_WEIGHTS for every column it
+        appears in, and ties go to the newest. FTS5's bm25() is not used:
+        it counts every row matching each term, which takes seconds for
+        common words at millions of articles.
+        """
+        terms = fts_terms(query)
+        if not terms:
+            return []
+
+        match = f"{{{' '.join(FTS_TEXT_COLUMNS)}}} : ({' '.join(terms)})"
+        if sentiment:
+            match += f" AND {{sentiment}} : {' '.join(fts_terms(sentiment))}"
+        conditions, params = ["articles_fts MATCH ?"], [match]
+        if category:
+            conditions.append("a.category = ?")
+            params.append(category)
+        if since:
+            conditions.append("a.published_at >= ?")
+            params.append(since.timestamp())
+        if until:
+            conditions.append("a.published_at <= ?")
+            params.append(until.timestamp())
+
+        def matches(conn, columns: str, count: int, skip: int = 0):
+            return conn.execute(
+                f"SELECT {columns} FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid "
+                f"WHERE {' AND '.join(conditions)} ORDER BY articles_fts.rowid DESC LIMIT ? OFFSET ?",
+                params + [count, skip]
+            ).fetchall()
+
+        def search(conn):
+            if sort != "relevance":
+                return matches(conn, "a.id, a.category, a.published_at, a.data", limit, offset)
+
+            window = [row[0] for row in matches(conn, "a.id", max(settings.SEARCH_RANK_WINDOW, offset + limit))]
+            if not window:
+                return []
+            scores = dict.fromkeys(window, 0)
+            # Column-filtered lookups, bounded to the window's rowid range
+            for term in terms:
+                for column, weight in FTS_WEIGHTS.items():
+                    for (article_id,) in conn.execute(
+                        "SELECT rowid FROM articles_fts WHERE articles_fts MATCH ? AND rowid BETWEEN ? AND ?",
+                        (f"{{{column}}} : {term}", window[-1], window[0])
+                    ):
+                        if article_id in scores:
+                            scores[article_id] += weight
+
+            # window is newest first and sorted() is stable: ties stay newest first
+            page = sorted(window, key=scores.get, reverse=True)[offset:offset + limit]
+            rows = {
+                row[0]: row for row in conn.execute(
+                    "SELECT id, category, published_at, data FROM articles "
+                    f"WHERE id IN ({', '.join('?' * len(page))})",
+                    page
+                )
+            }
+            return [rows[article_id] for article_id in page]
+
+        return [self._row_to_article(row) for row in await self._run(search)]
+
+    async def count(self, category: Optional[str] = None, symbol: Optional[str] = None) -> int:
+        """Exact number of articles matching the filters"""
+        def count(conn):
+            if symbol and category:
+                row = conn.execute(
+                    "SELECT COUNT(*) FROM article_symbols s JOIN articles a ON a.id = s.article_id "
+                    "WHERE s.symbol = ? AND a.category = ?",
+                    (symbol, category)
+                ).fetchone()
+            elif symbol:
+                row = conn.execute("SELECT count FROM symbol_counts WHERE symbol = ?", (symbol,)).fetchone()
+            elif category:
+                row = conn.execute("SELECT count FROM category_counts WHERE category = ?", (category,)).fetchone()
+            else:
+                row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM category_counts").fetchone()
+            return row[0] if row else 0
+        return await self._run(count)
+
+
+article_store = ArticleStore(path=settings.STORE_PATH)
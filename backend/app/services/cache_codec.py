@@ -0,0 +1,186 @@
+import json
+import zlib
+from typing import Any, Callable, Dict, Tuple
+from app.core.logging import logger
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# Ids stored in the format byte: serializer in the low nibble, compression
+# in the high one. Never renumber, entries in Redis outlive deploys.
+SERIALIZERS = {"json": 0, "orjson": 1, "msgpack": 2}
+COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+
+class CacheCodecError(Exception):
+    """A cached value could not be decoded (other schema version, unknown format, corrupt)"""
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value).encode()
+
+
+def _orjson_dumps(value: Any) -> bytes:
+    # Non-string keys become strings, as with json.dumps
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+# orjson and json write the same documents, so either reads both
+_json_loads: Callable[[bytes], Any] = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+class CacheCodec:
+    """
+    Turns cached values into bytes for Redis and back
+
+    A blob is ``[schema version][format][payload]``. The format byte names
+    the serializer and the compression, so a worker reads entries written
+    with any setting it has the libraries for; entries written under another
+    ``version`` raise CacheCodecError, which the cache treats as a miss.
+    Bumping the version on a deploy that changes the shape of cached values
+    retires the old ones without a flush.
+
+    Payloads of ``min_compress_bytes`` or more are compressed, and kept
+    compressed only when that makes them smaller. Serializers and
+    compressors that are not installed fall back to json and zlib.
+    """
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "zstd",
+        min_compress_bytes: int = 1024,
+        version: int = 1
+    ):
+        if not 1 <= version <= 100:
+            # 123 ("{") and 91 ("[") would be mistaken for values written before the codec
+            raise ValueError("cache schema version must be between 1 and 100")
+        self.version = version
+        self.min_compress_bytes = min_compress_bytes
+        self.serializer = self._available_serializer(serializer)
+        self.compression = self._available_compression(compression)
+        self._dumps = {"json": _json_dumps, "orjson": _orjson_dumps, "msgpack": self._msgpack_dumps}[self.serializer]
+        self._compress = self._compressors().get(self.compression)
+        self._decompressors = self._available_decompressors()
+        self._header = bytes([version, SERIALIZERS[self.serializer]])
+        self._compressed_header = bytes([
+            version, SERIALIZERS[self.serializer] | COMPRESSIONS[self.compression] << 4
+        ])
+
+    @staticmethod
+    def _available_serializer(name: str) -> str:
+        available = {"json": True, "orjson": ORJSON_AVAILABLE, "msgpack": MSGPACK_AVAILABLE}
+        if name not in available:
+            raise ValueError(f"Unknown cache serializer: {name}")
+        if not available[name]:
+            logger.info(f"{name} not installed, serializing cached values with json")
+            return "json"
+        return name
+
+    @staticmethod
+    def _available_compression(name: str) -> str:
+        available = {"none": True, "zlib": True, "zstd": ZSTD_AVAILABLE, "lz4": LZ4_AVAILABLE}
+        if name not in available:
+            raise ValueError(f"Unknown cache compression: {name}")
+        if not available[name]:
+            logger.info(f"{name} not installed, compressing cached values with zlib")
+            return "zlib"
+        return name
+
+    def _compressors(self) -> Dict[str, Callable[[bytes], bytes]]:
+        compressors = {"zlib": lambda data: zlib.compress(data, 1)}
+        if ZSTD_AVAILABLE:
+            compressors["zstd"] = zstandard.ZstdCompressor(level=3).compress
+        if LZ4_AVAILABLE:
+            compressors["lz4"] = lz4.frame.compress
+        return compressors
+
+    @staticmethod
+    def _available_decompressors() -> Dict[int, Callable[[bytes], bytes]]:
+        decompressors = {COMPRESSIONS["zlib"]: zlib.decompress}
+        if ZSTD_AVAILABLE:
+            decompressors[COMPRESSIONS["zstd"]] = zstandard.ZstdDecompressor().decompress
+        if LZ4_AVAILABLE:
+            decompressors[COMPRESSIONS["lz4"]] = lz4.frame.decompress
+        return decompressors
+
+    @staticmethod
+    def _msgpack_dumps(value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def encode(self, value: Any) -> Tuple[bytes, int]:
+        """(blob for Redis, serialized size before compression)"""
+        payload = self._dumps(value)
+        if self._compress is not None and len(payload) >= self.min_compress_bytes:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                return self._compressed_header + compressed, len(payload)
+        return self._header + payload, len(payload)
+
+    def decode(self, blob: bytes) -> Tuple[Any, int]:
+        """(value, serialized size before compression) of a blob from Redis"""
+        if blob[:1] in (b"{", b"["):
+            # Plain JSON, written before values carried a header
+            try:
+                return _json_loads(blob), len(blob)
+            except ValueError as e:
+                raise CacheCodecError(f"corrupt cached value: {e}") from e
+        if len(blob) < 2 or blob[0] != self.version:
+            raise CacheCodecError(f"schema version {blob[0] if blob else None}, expected {self.version}")
+
+        serializer, compression = blob[1] & 0x0F, blob[1] >> 4
+        payload = memoryview(blob)[2:]
+        try:
+            if compression:
+                decompress = self._decompressors.get(compression)
+                if decompress is None:
+                    raise CacheCodecError(f"unsupported compression {compression}")
+                payload = decompress(payload)
+            return self._loads(serializer, payload), len(payload)
+        except CacheCodecError:
+            raise
+        except Exception as e:
+            raise CacheCodecError(f"corrupt cached value: {e}") from e
+
+    @staticmethod
+    def _loads(serializer: int, payload: Any) -> Any:
+        if serializer == SERIALIZERS["msgpack"]:
+            if not MSGPACK_AVAILABLE:
+                raise CacheCodecError("msgpack not installed")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if serializer in (SERIALIZERS["json"], SERIALIZERS["orjson"]):
+            return _json_loads(bytes(payload) if isinstance(payload, memoryview) else payload)
+        raise CacheCodecError(f"unknown serializer {serializer}")
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "serializer": self.serializer,
+            "compression": self.compression,
+            "min_compress_bytes": self.min_compress_bytes,
+            "schema_version": self.version,
+        }
@@ -1,103 +1,514 @@
+import asyncio
 import json
 import hashlib
-from typing import Optional, Any
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Any
+from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import record_cache_lookup, timed
+from app.services.cache_codec import CacheCodec, CacheCodecError
+from app.services.memory_cache import MemoryCache
+from app.services.refresh_ahead import AccessTracker
+from app.services.singleflight import single_flight
 
 try:
-    import redis
-    from app.core.config import settings
-    
-    redis_client = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        db=settings.REDIS_DB,
-        decode_responses=True
-    )
+    import redis.asyncio as redis
+
     REDIS_AVAILABLE = True
 except Exception as e:
-    logger.warning(f"Redis not available: {e}. Caching disabled.")
+    logger.warning(f"Redis not available: {e}. Using in-process cache only.")
     REDIS_AVAILABLE = False
-    redis_client = None
+
+# Delete a lock only if it still holds our token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
 
 
 class CacheService:
-    """Service for caching with Redis"""
-    
+    """
+    Two-tier cache: in-process LRU (L1) in front of Redis (L2)
+
+    Reads try L1 first and fall back to Redis, promoting hits into L1 with
+    the TTL Redis has left. Writes go to both tiers with the same TTL, so L1
+    keeps serving while Redis is unreachable.
+
+    Redis is accessed through an asyncio client on a bounded connection
+    pool. A background probe pings it periodically; while it is unreachable
+    the service runs in degraded mode and skips L2 entirely instead of
+    paying a connection attempt per lookup.
+
+    Values are stored in Redis as compact binary blobs (see CacheCodec):
+    orjson or msgpack, compressed above a size threshold, behind a schema
+    version byte. The client returns raw bytes, so scripts and other
+    callers sharing it get bytes rather than str.
+
+    Entries have a soft TTL (``ttl``) and a hard TTL (``ttl + stale_ttl``).
+    Both tiers expire entries at the hard TTL; between the two,
+    get_or_compute serves the stale value immediately and refreshes it in
+    the background.
+    """
+
+    def __init__(self):
+        self.memory = MemoryCache(
+            max_bytes=settings.CACHE_L1_MAX_BYTES,
+            max_entries=settings.CACHE_L1_MAX_ENTRIES
+        )
+        self.counters = {
+            "l1_hits": 0,
+            "l1_misses": 0,
+            "l2_hits": 0,
+            "l2_misses": 0,
+            "l2_errors": 0,
+            "l2_undecodable": 0,
+            "lock_acquired": 0,
+            "lock_waited": 0,
+            "lock_timeouts": 0,
+            "stale_served": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "refresh_ahead": 0,
+            "compute_skipped": 0,
+        }
+        self.redis = None
+        if REDIS_AVAILABLE and settings.REDIS_HOST:
+            self.redis = redis.Redis(
+                connection_pool=redis.BlockingConnectionPool(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.REDIS_DB,
+                    max_connections=settings.REDIS_MAX_CONNECTIONS,
+                    timeout=settings.REDIS_POOL_TIMEOUT,
+                    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                    decode_responses=False
+                )
+            )
+        self.codec = CacheCodec(
+            serializer=settings.CACHE_SERIALIZER,
+            compression=settings.CACHE_COMPRESSION,
+            min_compress_bytes=settings.CACHE_COMPRESSION_MIN_BYTES,
+            version=settings.CACHE_SCHEMA_VERSION
+        )
+        self.healthy = self.redis is not None
+        self._last_failure = 0.0
+        self._scripts: Dict[str, Any] = {}
+        self._probe_task: Optional[asyncio.Task] = None
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self._refresh_ahead_task: Optional[asyncio.Task] = None
+        self.tracker = AccessTracker(max_keys=settings.CACHE_REFRESH_AHEAD_KEYS * 10)
+
     @staticmethod
     def _generate_key(prefix: str, data: Any) -> str:
         """Generate cache key from data"""
         data_str = json.dumps(data, sort_keys=True)
         hash_obj = hashlib.md5(data_str.encode())
         return f"{prefix}:{hash_obj.hexdigest()}"
-    
-    @staticmethod
-    def get(key: str) -> Optional[Any]:
+
+    async def start(self):
+        """Probe Redis and start the background loops"""
+        if settings.CACHE_REFRESH_AHEAD_ENABLED:
+            self._refresh_ahead_task = asyncio.create_task(self._refresh_ahead_loop())
+        if self.redis is None:
+            return
+        await self.ping()
+        self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def close(self):
+        """Stop background loops and release pooled connections"""
+        for task in [self._probe_task, self._refresh_ahead_task, *self._refreshes.values()]:
+            if task:
+                task.cancel()
+        if self.redis is not None:
+            await self.redis.close()
+            await self.redis.connection_pool.disconnect()
+
+    async def ping(self) -> bool:
+        """Check that Redis answers, switching degraded mode on or off"""
+        if self.redis is None:
+            return False
+        try:
+            await self.redis.ping()
+            self._mark_up()
+        except Exception as e:
+            self._mark_down(e)
+        return self.healthy
+
+    async def _probe_loop(self):
+        while True:
+            await asyncio.sleep(settings.REDIS_HEALTH_INTERVAL)
+            await self.ping()
+
+    def _mark_up(self):
+        if not self.healthy:
+            logger.info("Redis reachable again, leaving degraded mode")
+        self.healthy = True
+
+    def _mark_down(self, error: Exception):
+        self.counters["l2_errors"] += 1
+        self._last_failure = time.monotonic()
+        if self.healthy:
+            logger.warning(f"Redis unreachable ({error}), cache running in degraded mode")
+        self.healthy = False
+
+    def _l2_ready(self) -> bool:
+        """Whether to try Redis; retries lazily when no probe is running"""
+        if self.redis is None:
+            return False
+        if self.healthy:
+            return True
+        return (
+            self._probe_task is None
+            and time.monotonic() - self._last_failure >= settings.REDIS_HEALTH_INTERVAL
+        )
+
+    async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
-        if not REDIS_AVAILABLE:
-            return None
-        
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values, fresh or stale, in one Redis round trip"""
+        entries = await self._get_entries(keys)
+        return [entry["value"] if entry else None for entry in entries]
+
+    async def _get_entries(self, keys: List[str]) -> List[Optional[Dict]]:
+        """Get stored entries ({"value", "fresh_until"}), L1 misses from Redis in one pipeline"""
+        values: List[Optional[Dict]] = [self.memory.get(key) for key in keys]
+        missing = [idx for idx, value in enumerate(values) if value is None]
+        self.counters["l1_hits"] += len(keys) - len(missing)
+        self.counters["l1_misses"] += len(missing)
+        for key, value in zip(keys, values):
+            if value is not None:
+                record_cache_lookup(key, "l1")
+
+        if not missing or not self._l2_ready():
+            for idx in missing:
+                record_cache_lookup(keys[idx], "miss")
+            return values
+
+        found = await self._l2_entries([keys[idx] for idx in missing])
+        for idx, value in zip(missing, found):
+            values[idx] = value
+
+        logger.info(f"Cache lookup: {len(keys)} keys, {sum(v is not None for v in values)} hits")
+        return values
+
+    async def _l2_entries(self, keys: List[str]) -> List[Optional[Dict]]:
+        """Stored entries read from Redis only, promoted into L1 with the TTL Redis has left"""
         try:
-            value = redis_client.get(key)
-            if value:
-                logger.info(f"Cache hit: {key}")
-                return json.loads(value)
-            logger.info(f"Cache miss: {key}")
-            return None
+            replies = await self._redis_get(keys)
+            self._mark_up()
         except Exception as e:
+            self._mark_down(e)
             logger.error(f"Cache get error: {e}")
-            return None
-    
-    @staticmethod
-    def set(key: str, value: Any, ttl: int = None) -> bool:
+            for key in keys:
+                record_cache_lookup(key, "miss")
+            return [None] * len(keys)
+
+        entries: List[Optional[Dict]] = []
+        for key, raw, ttl_ms in zip(keys, replies[::2], replies[1::2]):
+            value = None
+            if raw:
+                try:
+                    value, size = self.codec.decode(raw)
+                    if not (isinstance(value, dict) and "value" in value and "fresh_until" in value):
+                        # Plain values written before entries carried their freshness
+                        raise CacheCodecError("not a cache entry")
+                except CacheCodecError as e:
+                    value = None
+                    self.counters["l2_undecodable"] += 1
+                    logger.warning(f"Ignoring cached value for {key}: {e}")
+            if value is not None:
+                self.counters["l2_hits"] += 1
+                record_cache_lookup(key, "l2")
+                if ttl_ms and ttl_ms > 0:
+                    self.memory.set(key, value, ttl_ms / 1000, size)
+            else:
+                self.counters["l2_misses"] += 1
+                record_cache_lookup(key, "miss")
+            entries.append(value)
+        return entries
+
+    @timed("redis", "get")
+    async def _redis_get(self, keys: List[str]) -> List[Any]:
+        """GET and PTTL of every key in one pipeline: [value, ttl_ms, value, ttl_ms, ...]"""
+        pipe = self.redis.pipeline(transaction=False)
+        for key in keys:
+            pipe.get(key)
+            pipe.pttl(key)
+        return await pipe.execute()
+
+    @timed("redis", "set")
+    async def _redis_set(self, encoded: Dict[str, bytes], ttl: int):
+        pipe = self.redis.pipeline(transaction=False)
+        for key, blob in encoded.items():
+            pipe.setex(key, ttl, blob)
+        await pipe.execute()
+
+    async def set(self, key: str, value: Any, ttl: int = None, stale_ttl: int = None) -> bool:
         """Set value in cache"""
-        if not REDIS_AVAILABLE:
-            return False
-        
+        return await self.set_many({key: value}, ttl, stale_ttl)
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = None, stale_ttl: int = None) -> bool:
+        """Set several values with the same TTLs in one pipeline"""
+        ttl = ttl or settings.CACHE_TTL
+        stale_ttl = settings.CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        fresh_until = time.time() + ttl
+        entries = {key: {"value": value, "fresh_until": fresh_until} for key, value in items.items()}
+        encoded = {key: self.codec.encode(entry) for key, entry in entries.items()}
+        ttl += stale_ttl
+        stored = True
+        for key, entry in entries.items():
+            stored = self.memory.set(key, entry, ttl, encoded[key][1]) and stored
+
+        if not items or not self._l2_ready():
+            return stored
+
         try:
-            from app.core.config import settings
-            ttl = ttl or settings.CACHE_TTL
-            
-            redis_client.setex(
-                key,
-                ttl,
-                json.dumps(value)
-            )
-            logger.info(f"Cache set: {key} (TTL: {ttl}s)")
+            await self._redis_set({key: blob for key, (blob, _) in encoded.items()}, ttl)
+            self._mark_up()
+            logger.info(f"Cache set: {len(items)} keys (TTL: {ttl}s)")
             return True
         except Exception as e:
+            self._mark_down(e)
             logger.error(f"Cache set error: {e}")
-            return False
-    
-    @staticmethod
-    def delete(key: str) -> bool:
+            return stored
+
+    async def delete(self, key: str) -> bool:
         """Delete value from cache"""
-        if not REDIS_AVAILABLE:
-            return False
-        
+        deleted = self.memory.delete(key)
+
+        if not self._l2_ready():
+            return deleted
+
         try:
-            redis_client.delete(key)
+            await self.redis.delete(key)
+            self._mark_up()
             logger.info(f"Cache deleted: {key}")
             return True
         except Exception as e:
+            self._mark_down(e)
             logger.error(f"Cache delete error: {e}")
-            return False
-    
-    @staticmethod
-    def clear_pattern(pattern: str) -> int:
+            return deleted
+
+    async def clear_pattern(self, pattern: str) -> int:
         """Clear all keys matching pattern"""
-        if not REDIS_AVAILABLE:
-            return 0
-        
+        count = self.memory.clear_pattern(pattern)
+
+        if not self._l2_ready():
+            return count
+
         try:
-            keys = redis_client.keys(pattern)
+            # SCAN instead of KEYS so large keyspaces don't block Redis
+            keys = [key async for key in self.redis.scan_iter(match=pattern, count=500)]
             if keys:
-                count = redis_client.delete(*keys)
+                count = await self.redis.delete(*keys)
                 logger.info(f"Cache cleared: {count} keys matching {pattern}")
-                return count
-            return 0
+            self._mark_up()
+            return count
         except Exception as e:
+            self._mark_down(e)
             logger.error(f"Cache clear error: {e}")
-            return 0
+            return count
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int = None
+    ) -> Any:
+        """
+        Return the cached value for key, computing and caching it on a miss
+
+        Concurrent misses for the same key in this process share a single
+        computation, and a Redis lock keeps other workers from recomputing
+        the key at the same time. Exceptions from compute propagate and are
+        not cached. Stale entries are returned at once and refreshed in the
+        background. Holding the lock, Redis is read again before computing,
+        so a key another worker has just refreshed is not computed twice.
+        """
+        if settings.CACHE_REFRESH_AHEAD_ENABLED:
+            self.tracker.record(key, compute, ttl)
+
+        entry = (await self._get_entries([key]))[0]
+        if entry is not None:
+            if entry["fresh_until"] <= time.time():
+                self.counters["stale_served"] += 1
+                self._refresh_in_background(key, compute, ttl)
+            return entry["value"]
+        return await single_flight.do(key, lambda: self._compute_locked(key, compute, ttl))
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int]
+    ):
+        """Recompute key without making the caller wait; at most one refresh per key"""
+        if key in self._refreshes:
+            return
+        self.counters["refreshes"] += 1
+        task = asyncio.create_task(
+            single_flight.do(f"refresh:{key}", lambda: self._compute_locked(key, compute, ttl, refresh=True))
+        )
+        self._refreshes[key] = task
+        task.add_done_callback(lambda done: self._refresh_done(key, done))
+
+    def _refresh_done(self, key: str, task: asyncio.Task):
+        self._refreshes.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.counters["refresh_errors"] += 1
+            logger.error(f"Cache refresh error for {key}: {task.exception()}")
+
+    async def _refresh_ahead_loop(self):
+        """Refresh the most accessed keys shortly before they go stale"""
+        interval = settings.CACHE_REFRESH_AHEAD_INTERVAL
+        while True:
+            await asyncio.sleep(interval)
+            hottest = self.tracker.hottest(settings.CACHE_REFRESH_AHEAD_KEYS)
+            self.tracker.decay()
+            if not hottest:
+                continue
+
+            entries = await self._get_entries([key for key, _, _ in hottest])
+            horizon = time.time() + interval
+            for (key, compute, ttl), entry in zip(hottest, entries):
+                if entry is None or entry["fresh_until"] <= horizon:
+                    self.counters["refresh_ahead"] += 1
+                    self._refresh_in_background(key, compute, ttl)
+
+    async def _compute_locked(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        refresh: bool = False
+    ) -> Any:
+        # Freshness of the copy this worker holds: anything newer in Redis was
+        # computed by another worker since then
+        held = self.memory.get(key)
+        token = await self._acquire_lock(key)
+        if token is None:
+            if refresh:
+                # Another worker is already refreshing this key
+                return None
+            # Another worker holds the lock: wait for it to fill the cache
+            value = await self._wait_for_value(key)
+            if value is not None:
+                return value
+        try:
+            if token:
+                # Each worker's L1 copy goes stale on its own: skip compute if
+                # another worker refreshed the key before this one got the lock
+                entry = (await self._l2_entries([key]))[0]
+                if entry is not None and entry["fresh_until"] > max(
+                    time.time(), held["fresh_until"] if held else 0.0
+                ):
+                    self.counters["compute_skipped"] += 1
+                    return entry["value"]
+            value = await compute()
+            await self.set(key, value, ttl)
+            return value
+        finally:
+            if token:
+                await self._release_lock(key, token)
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        """
+        Try to take the cross-worker lock for key
+
+        Returns the lock token, "" when Redis is not in use (proceed without a
+        lock), or None when another worker holds it.
+        """
+        if not self._l2_ready():
+            return ""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.redis.set(
+                f"lock:{key}", token, nx=True, px=int(settings.CACHE_LOCK_TTL * 1000)
+            )
+            self._mark_up()
+        except Exception as e:
+            self._mark_down(e)
+            return ""
+        if acquired:
+            self.counters["lock_acquired"] += 1
+            return token
+        self.counters["lock_waited"] += 1
+        return None
+
+    async def _release_lock(self, key: str, token: str):
+        """Release the lock only if this worker still owns it"""
+        try:
+            await self.redis.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+        except Exception as e:
+            logger.error(f"Cache lock release error: {e}")
+
+    async def eval(self, script: str, keys: List[str], args: List[Any]) -> Optional[Any]:
+        """Run a Lua script on Redis (EVALSHA); None when Redis is not in use or fails"""
+        if not self._l2_ready():
+            return None
+        if script not in self._scripts:
+            self._scripts[script] = self.redis.register_script(script)
+        try:
+            result = await self._scripts[script](keys=keys, args=args)
+            self._mark_up()
+            return result
+        except Exception as e:
+            self._mark_down(e)
+            return None
+
+    async def publish(self, channel: str, message: str) -> bool:
+        """Publish a message on a Redis channel; False when Redis is not in use or fails"""
+        if not self._l2_ready():
+            return False
+        try:
+            await self.redis.publish(channel, message)
+            self._mark_up()
+            return True
+        except Exception as e:
+            self._mark_down(e)
+            return False
+
+    async def _wait_for_value(self, key: str) -> Optional[Any]:
+        """Poll Redis for a value another worker is computing"""
+        deadline = time.monotonic() + settings.CACHE_LOCK_TTL
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+            value = await self.get(key)
+            if value is not None:
+                return value
+            if not self._l2_ready():
+                break
+            try:
+                if not await self.redis.exists(f"lock:{key}"):
+                    # Lock released without a value (the other worker failed)
+                    return await self.get(key)
+            except Exception as e:
+                self._mark_down(e)
+                break
+        self.counters["lock_timeouts"] += 1
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters per tier and L1 occupancy"""
+        return {
+            **self.counters,
+            "l1_entries": len(self.memory),
+            "l1_bytes": self.memory.current_bytes,
+            "redis_available": REDIS_AVAILABLE,
+            "redis_healthy": self.healthy,
+            "codec": self.codec.describe(),
+            "single_flight_executed": single_flight.counters["executed"],
+            "single_flight_coalesced": single_flight.counters["coalesced"],
+            "single_flight_in_flight": single_flight.in_flight,
+            "refreshing": len(self._refreshes),
+            "tracked_keys": len(self.tracker),
+        }
 
 
 cache_service = CacheService()
@@ -0,0 +1,280 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Type, TypeVar
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, CIRCUIT_TRANSITIONS
+from app.services.cache_service import cache_service
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Share an opening with the other workers. KEYS: breaker key; ARGV: epoch ms
+# the breaker stays open until, and the same as a TTL. Keeps the latest.
+OPEN_SCRIPT = """
+local current = tonumber(redis.call("get", KEYS[1]) or "0")
+if tonumber(ARGV[1]) > current then
+    redis.call("set", KEYS[1], ARGV[1], "px", ARGV[2])
+end
+return 1
+"""
+READ_SCRIPT = """
+return redis.call("mget", unpack(KEYS))
+"""
+
+
+class CircuitOpenError(Exception):
+    """A call was rejected because the dependency's circuit breaker is open"""
+
+
+class RollingWindow:
+    """Call outcomes over the last ``seconds``, kept in ten time slices"""
+
+    SLICES = 10
+
+    def __init__(self, seconds: float):
+        self.width = seconds / self.SLICES
+        # Per slice: [slice number, calls, failures, slow calls]
+        self._slices: List[List[int]] = [[-1, 0, 0, 0] for _ in range(self.SLICES)]
+
+    def record(self, failed: bool, slow: bool):
+        number = int(time.monotonic() // self.width)
+        counts = self._slices[number % self.SLICES]
+        if counts[0] != number:
+            counts[:] = [number, 0, 0, 0]
+        counts[1] += 1
+        counts[2] += failed
+        counts[3] += slow
+
+    def totals(self) -> Tuple[int, int, int]:
+        """(calls, failures, slow calls) in the window"""
+        oldest = int(time.monotonic() // self.width) - self.SLICES
+        calls = failures = slow = 0
+        for number, *counts in self._slices:
+            if number > oldest:
+                calls, failures, slow = calls + counts[0], failures + counts[1], slow + counts[2]
+        return calls, failures, slow
+
+    def reset(self):
+        for counts in self._slices:
+            counts[:] = [-1, 0, 0, 0]
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a dependency fast while it is failing or slow
+
+    Closed: calls go through and their outcomes fill a rolling window; once
+    it holds ``min_calls``, a failure or slow-call share above its threshold
+    opens the breaker. Open: calls raise CircuitOpenError at once, for
+    ``open_seconds``. Half-open: up to ``half_open_calls`` trial calls go
+    through; as many successes close the breaker, one failure reopens it.
+    Only exceptions of ``failure_types`` count as failures: a rejected
+    request says nothing about the dependency's health.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_types: Tuple[Type[BaseException], ...] = (Exception,),
+        window: float = 60.0,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_calls: int = 1,
+        enabled: bool = True
+    ):
+        self.name = name
+        self.failure_types = failure_types
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.enabled = enabled
+        self.window = RollingWindow(window)
+        self._state = CLOSED
+        self.opened_until = 0.0  # epoch seconds, comparable across workers
+        self._trials = 0  # half-open calls in flight
+        self._successes = 0  # successful half-open calls
+        # Called with the breaker when it opens on its own outcomes
+        self.on_open: Optional[Callable[["CircuitBreaker"], None]] = None
+        self.counters = {"rejected": 0, "opened": 0, "opened_by_peer": 0}
+        CIRCUIT_STATE.labels(name).set_function(lambda: STATE_VALUES[self.state])
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.time() >= self.opened_until:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call would go through now; takes no trial slot"""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._trials < self.half_open_calls)
+
+    def check(self):
+        """Raise CircuitOpenError if a call would be rejected now"""
+        if not self.enabled or self.allow():
+            return
+        self.counters["rejected"] += 1
+        CIRCUIT_REJECTED.labels(self.name).inc()
+        raise CircuitOpenError(f"{self.name} circuit open")
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` through the breaker, recording its outcome"""
+        if not self.enabled:
+            return await fn()
+        self.check()
+        trial = self._state == HALF_OPEN
+        if trial:
+            self._trials += 1
+
+        started = time.monotonic()
+        failed = None
+        try:
+            result = await fn()
+            failed = False
+            return result
+        except self.failure_types:
+            failed = True
+            raise
+        except Exception:
+            failed = False
+            raise
+        finally:
+            if trial:
+                self._trials = max(0, self._trials - 1)
+            if failed is not None:  # not cancelled
+                self._record(failed, time.monotonic() - started >= self.slow_call_seconds, trial)
+
+    def _record(self, failed: bool, slow: bool, trial: bool):
+        if trial:
+            if self._state != HALF_OPEN:
+                return
+            if failed or slow:
+                self._open()
+            else:
+                self._successes += 1
+                if self._successes >= self.half_open_calls:
+                    self._transition(CLOSED)
+            return
+
+        if self._state != CLOSED:
+            return
+        self.window.record(failed, slow)
+        calls, failures, slow_calls = self.window.totals()
+        if calls >= self.min_calls and (
+            failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate
+        ):
+            logger.warning(
+                f"Opening {self.name} circuit for {self.open_seconds:g}s "
+                f"({failures}/{calls} failed, {slow_calls}/{calls} slow)"
+            )
+            self._open()
+
+    def _open(self, until: Optional[float] = None):
+        self.opened_until = until or time.time() + self.open_seconds
+        self._transition(OPEN)
+        if until is None:
+            self.counters["opened"] += 1
+            if self.on_open:
+                self.on_open(self)
+        else:
+            self.counters["opened_by_peer"] += 1
+
+    def open_until(self, until: float):
+        """Open until ``until`` (epoch seconds) as another worker did, unless already open as long"""
+        if until > max(self.opened_until, time.time()) and self._state != OPEN:
+            logger.warning(f"{self.name} circuit opened by another worker")
+            self._open(until)
+
+    def _transition(self, state: str):
+        if state == self._state:
+            return
+        if state == CLOSED:
+            logger.info(f"{self.name} circuit closed")
+            self.window.reset()
+        self._state = state
+        self._trials = self._successes = 0
+        CIRCUIT_TRANSITIONS.labels(self.name, state).inc()
+
+    def stats(self) -> Dict[str, Any]:
+        calls, failures, slow = self.window.totals()
+        return {
+            **self.counters,
+            "state": self.state,
+            "opened_until": self.opened_until if self._state == OPEN else None,
+            "window_calls": calls,
+            "window_failures": failures,
+            "window_slow": slow,
+        }
+
+
+class CircuitBreakers:
+    """
+    The circuit breakers of this process, shared with other workers
+
+    An opening is written to Redis with the time it lasts until; every
+    CIRCUIT_SYNC_INTERVAL seconds the shared states are read back in one
+    round trip, so a dependency one worker found failing is skipped by all
+    of them. Without Redis each worker decides alone.
+    """
+
+    def __init__(self):
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._publishing: Set[asyncio.Task] = set()
+
+    def register(self, name: str, failure_types: Tuple[Type[BaseException], ...]) -> CircuitBreaker:
+        """Breaker for a dependency, configured by CIRCUIT_BREAKERS[name]"""
+        breaker = CircuitBreaker(
+            name,
+            failure_types=failure_types,
+            enabled=settings.CIRCUIT_BREAKER_ENABLED,
+            **settings.CIRCUIT_BREAKERS.get(name, {})
+        )
+        breaker.on_open = self._share
+        self.breakers[name] = breaker
+        return breaker
+
+    async def start(self):
+        if cache_service.redis is not None and settings.CIRCUIT_BREAKER_ENABLED:
+            self._task = asyncio.create_task(self._sync_loop())
+
+    async def close(self):
+        for task in [self._task, *self._publishing]:
+            if task:
+                task.cancel()
+
+    def _share(self, breaker: CircuitBreaker):
+        if cache_service.redis is None:
+            return
+        task = asyncio.create_task(cache_service.eval(
+            OPEN_SCRIPT,
+            keys=[f"circuit:{breaker.name}"],
+            args=[int(breaker.opened_until * 1000), int(breaker.open_seconds * 1000)]
+        ))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _sync_loop(self):
+        names = list(self.breakers)
+        keys = [f"circuit:{name}" for name in names]
+        while True:
+            await asyncio.sleep(settings.CIRCUIT_SYNC_INTERVAL)
+            values = await cache_service.eval(READ_SCRIPT, keys=keys, args=[])
+            for name, value in zip(names, values or []):
+                if value:
+                    self.breakers[name].open_until(int(value) / 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: breaker.stats() for name, breaker in self.breakers.items()}
+
+
+circuit_breakers = CircuitBreakers()
@@ -0,0 +1,147 @@
+import hashlib
+import random
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# NewsAPI truncates content and appends e.g. "… [+2345 chars]"
+TRUNCATION_MARKER = re.compile(r"\s*(…|\.\.\.)?\s*\[\+\d+ chars\]\s*$")
+NON_WORD = re.compile(r"[^\w\s]")
+WHITESPACE = re.compile(r"\s+")
+
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS = NUM_PERMUTATIONS // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+
+# Fixed seed: signatures must be comparable across processes and restarts
+_rng = random.Random(1729)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+Signature = Tuple[int, ...]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents, punctuation and NewsAPI truncation markers"""
+    text = TRUNCATION_MARKER.sub("", text or "")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = NON_WORD.sub(" ", text.lower())
+    return WHITESPACE.sub(" ", text).strip()
+
+
+def article_text(article: Dict) -> str:
+    """The text an article is compared on"""
+    return " ".join(
+        article.get(field) or ""
+        for field in ("title", "description", "content")
+    )
+
+
+def content_hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> List[str]:
+    """Word n-grams; short texts become a single shingle"""
+    words = normalized.split()
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def minhash(normalized: str) -> Signature:
+    """MinHash signature of the text's shingle set"""
+    hashes = {
+        int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for shingle in shingles(normalized)
+    }
+    if not hashes:
+        return (MERSENNE_PRIME,) * NUM_PERMUTATIONS
+    return tuple(
+        min((a * value + b) % MERSENNE_PRIME for value in hashes)
+        for a, b in PERMUTATIONS
+    )
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERMUTATIONS
+
+
+def signature(article: Dict) -> Tuple[str, Signature]:
+    """(content hash, MinHash signature) of an article's normalized text"""
+    normalized = normalize(article_text(article))
+    return content_hash(normalized), minhash(normalized)
+
+
+class NearDuplicateIndex:
+    """
+    In-process index of article signatures for near-duplicate lookups
+
+    Exact matches are found through the normalized content hash. Near
+    matches use LSH over the MinHash signature: it is split into BANDS bands
+    of ROWS values, articles sharing any band become candidates, and a
+    candidate matches when its estimated Jaccard similarity reaches
+    ``threshold``. Entries carry a timestamp so old ones can be pruned.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self._by_hash: Dict[str, int] = {}
+        self._entries: Dict[int, Tuple[str, Signature, float]] = {}
+        self._buckets: Dict[Tuple[int, Signature], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _bands(minhash_signature: Signature):
+        for band in range(BANDS):
+            yield band, minhash_signature[band * ROWS:(band + 1) * ROWS]
+
+    def add(self, cluster_id: int, digest: str, minhash_signature: Signature, timestamp: float = 0.0):
+        if cluster_id in self._entries:
+            return
+        self._by_hash.setdefault(digest, cluster_id)
+        self._entries[cluster_id] = (digest, minhash_signature, timestamp)
+        for bucket in self._bands(minhash_signature):
+            self._buckets.setdefault(bucket, []).append(cluster_id)
+
+    def prune(self, before: float) -> int:
+        """Drop entries older than ``before``; returns how many were dropped"""
+        expired = [
+            cluster_id for cluster_id, (_, _, timestamp) in self._entries.items()
+            if timestamp < before
+        ]
+        for cluster_id in expired:
+            digest, minhash_signature, _ = self._entries.pop(cluster_id)
+            if self._by_hash.get(digest) == cluster_id:
+                del self._by_hash[digest]
+            for bucket in self._bands(minhash_signature):
+                members = self._buckets[bucket]
+                members.remove(cluster_id)
+                if not members:
+                    del self._buckets[bucket]
+        return len(expired)
+
+    def find(self, digest: str, minhash_signature: Signature) -> Optional[int]:
+        """Cluster id of an exact or near duplicate, if any"""
+        if digest in self._by_hash:
+            return self._by_hash[digest]
+
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for bucket in self._bands(minhash_signature):
+            for cluster_id in self._buckets.get(bucket, ()):
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+                score = similarity(minhash_signature, self._entries[cluster_id][1])
+                if score >= best_similarity:
+                    best, best_similarity = cluster_id, score
+        return best
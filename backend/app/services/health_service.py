@@ -0,0 +1,142 @@
+import asyncio
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import dependency_totals, loop_monitor
+from app.services.article_store import article_store
+from app.services.cache_service import cache_service
+from app.services.circuit_breaker import CLOSED, OPEN, circuit_breakers
+
+
+class HealthMonitor:
+    """
+    Readiness of this worker, evaluated in the background
+
+    Every HEALTH_CHECK_INTERVAL the checks are recomputed: the article
+    store answers a query, the event loop is not lagging, and, from state
+    other tasks already keep, the Redis probe of the cache service, the
+    circuit breakers and the error counters of the dependency metrics.
+    Probe requests only read the last report, so they cost no I/O however
+    often a load balancer polls.
+
+    Only HEALTH_READINESS_CHECKS make the worker not ready. They default to
+    the worker-local checks: Redis and OpenAI are shared by every worker,
+    so failing readiness on them would pull the whole fleet at once while
+    news is still served from the store and the fallbacks. Their failures
+    are reported as "degraded" instead.
+    """
+
+    def __init__(self):
+        # (monotonic time, per-dependency (calls, errors)) at each evaluation
+        self._samples: Deque[Tuple[float, Dict[str, Tuple[float, float]]]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._checked_at = 0.0
+        self.report: Dict[str, Any] = {"status": "starting", "checks": {}}
+
+    async def start(self):
+        await self.evaluate()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+            try:
+                await self.evaluate()
+            except Exception as e:
+                logger.error(f"Error evaluating health checks: {e}")
+
+    async def evaluate(self):
+        """Recompute every check and the overall status"""
+        now = time.monotonic()
+        totals = dependency_totals()
+        self._samples.append((now, totals))
+        # Keep the newest sample at least a window old as the baseline
+        while len(self._samples) > 1 and self._samples[1][0] <= now - settings.HEALTH_ERROR_WINDOW:
+            self._samples.popleft()
+
+        checks = {
+            "store": await self._store_check(),
+            "event_loop": self._event_loop_check(),
+            "redis": self._redis_check(),
+            "openai": self._error_rate_check("openai", totals),
+            "newsapi": self._newsapi_check(),
+        }
+        unhealthy = [name for name, check in checks.items() if check["status"] not in ("ok", "disabled")]
+        failing = [name for name in unhealthy if name in settings.HEALTH_READINESS_CHECKS]
+        if failing and self.report.get("failing") != failing:
+            logger.warning(f"Worker not ready, failing checks: {', '.join(failing)}")
+
+        self._checked_at = now
+        self.report = {
+            "status": "not_ready" if failing else "ready",
+            "failing": failing,
+            "degraded": [name for name in unhealthy if name not in failing],
+            "checks": checks,
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    @staticmethod
+    async def _store_check() -> Dict[str, Any]:
+        try:
+            await asyncio.wait_for(article_store.last_id(), settings.HEALTH_STORE_TIMEOUT)
+            return {"status": "ok"}
+        except Exception as e:
+            return {"status": "failing", "error": str(e) or type(e).__name__}
+
+    @staticmethod
+    def _event_loop_check() -> Dict[str, Any]:
+        lag = loop_monitor.last_lag
+        return {"status": "failing" if lag > settings.HEALTH_MAX_LOOP_LAG else "ok", "lag": round(lag, 4)}
+
+    def _redis_check(self) -> Dict[str, Any]:
+        """Disabled when no REDIS_HOST is configured"""
+        if cache_service.redis is None:
+            return {"status": "disabled"}
+        return {"status": "ok" if cache_service.healthy else "down"}
+
+    def _error_rate_check(self, dependency: str, totals: Dict[str, Tuple[float, float]]) -> Dict[str, Any]:
+        """Share of failed calls over the last HEALTH_ERROR_WINDOW seconds, and the circuit state"""
+        calls, errors = totals.get(dependency, (0.0, 0.0))
+        base_calls, base_errors = self._samples[0][1].get(dependency, (0.0, 0.0))
+        calls, errors = calls - base_calls, errors - base_errors
+        rate = errors / calls if calls else 0.0
+        circuit = self._circuit(dependency)
+        failing = circuit == OPEN or (calls >= settings.HEALTH_MIN_CALLS and rate > settings.HEALTH_MAX_ERROR_RATE)
+        return {
+            "status": "failing" if failing else "ok",
+            "calls": int(calls),
+            "error_rate": round(rate, 3),
+            "circuit": circuit,
+        }
+
+    def _newsapi_check(self) -> Dict[str, Any]:
+        """Circuit breaker state: NewsAPI is polled too rarely for a windowed rate"""
+        if not settings.NEWS_API_KEY:
+            return {"status": "disabled"}
+        circuit = self._circuit("newsapi")
+        return {"status": "failing" if circuit == OPEN else "ok", "circuit": circuit}
+
+    @staticmethod
+    def _circuit(dependency: str) -> str:
+        breaker = circuit_breakers.breakers.get(dependency)
+        return breaker.state if breaker else CLOSED
+
+    def readiness(self) -> Dict[str, Any]:
+        """The last report; not ready if the checks stopped being evaluated"""
+        if time.monotonic() - self._checked_at > 3 * settings.HEALTH_CHECK_INTERVAL:
+            return {**self.report, "status": "not_ready", "failing": ["stale"]}
+        return self.report
+
+
+health_monitor = HealthMonitor()
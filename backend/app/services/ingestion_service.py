@@ -0,0 +1,233 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.article_store import ArticleStore, article_store, parse_published_at
+from app.services.dedup_service import NearDuplicateIndex, Signature, article_text, signature
+from app.services.llm_governor import Priority
+from app.services.news_events import news_events
+from app.services.news_service import NewsService
+from app.services.openai_service import openai_service
+from app.services.search_service import search_service
+from app.services.symbol_service import symbol_matcher
+
+
+class IngestionService:
+    """
+    Background news ingestion
+
+    Polls NewsAPI for every category on a schedule, drops articles already
+    in the store and writes the enriched result to the article store.
+    Request handlers only read from the store.
+
+    Articles are tagged with the ticker symbols they mention, which feeds
+    the store's symbol index. Newly stored articles are published to news
+    stream subscribers.
+
+    Near-duplicates (the same story from several outlets) are clustered
+    before analysis: only the first report of a story is analyzed and
+    stored as an article, later ones are attached to it as sources.
+
+    Articles analyzed while OpenAI was unavailable are stored with the
+    fallback analysis (shown as analysis_pending) and re-analyzed on the
+    following polls, newest first.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._index: Optional[NearDuplicateIndex] = None
+        self.last_run: Optional[datetime] = None
+        self.counters = {
+            "runs": 0,
+            "fetched": 0,
+            "ingested": 0,
+            "duplicates": 0,
+            "clustered": 0,
+            "reanalyzed": 0,
+            "errors": 0,
+        }
+
+    async def start(self):
+        """Start polling in the background"""
+        self._task = asyncio.create_task(self.run_forever())
+        logger.info(f"News ingestion started (every {settings.INGESTION_INTERVAL:.0f}s)")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_forever(self):
+        """Poll every INGESTION_INTERVAL seconds until cancelled"""
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.counters["errors"] += 1
+                logger.error(f"News ingestion error: {e}")
+            await asyncio.sleep(settings.INGESTION_INTERVAL)
+
+    async def run_once(self) -> int:
+        """Poll every category once; returns the number of new articles stored"""
+        categories = list(search_service.CATEGORY_QUERIES)
+        # No mock news: nothing is stored while NewsAPI is unavailable
+        results = await asyncio.gather(*(
+            search_service.search_by_category(
+                category, page_size=settings.INGESTION_PAGE_SIZE, fallback=False
+            )
+            for category in categories
+        ))
+
+        fetched = [
+            (ArticleStore.article_key(article), category, article)
+            for category, articles in zip(categories, results)
+            for article in articles
+        ]
+        known = await article_store.known_keys([key for key, _, _ in fetched])
+        self.counters["fetched"] += len(fetched)
+
+        new_articles: Dict[str, Dict] = {}
+        for key, category, article in fetched:
+            if key in known or key in new_articles:
+                self.counters["duplicates"] += 1
+                continue
+            new_articles[key] = {**article, "category": category}
+
+        index = await self._load_index()
+        articles = list(new_articles.values())
+        signatures = await asyncio.to_thread(lambda: [signature(article) for article in articles])
+        symbols = await asyncio.to_thread(lambda: [
+            symbol_matcher.extract(article_text(article)) for article in articles
+        ])
+        for article, article_symbols in zip(articles, symbols):
+            article["symbols"] = article_symbols
+
+        # Cluster against stored articles first, then within this batch
+        batch_index = NearDuplicateIndex(settings.DEDUP_SIMILARITY)
+        canonical: List[Tuple[Dict, Tuple[str, Signature]]] = []
+        stored_sources: List[Tuple[int, Dict]] = []
+        batch_sources: List[Tuple[int, Dict]] = []
+        for article, article_signature in zip(articles, signatures):
+            article_id = index.find(*article_signature)
+            if article_id is not None:
+                stored_sources.append((article_id, article))
+                continue
+            position = batch_index.find(*article_signature)
+            if position is not None:
+                batch_sources.append((position, article))
+                continue
+            batch_index.add(len(canonical), *article_signature)
+            canonical.append((article, article_signature))
+        self.counters["clustered"] += len(stored_sources) + len(batch_sources)
+
+        analyses = await self._analyze([
+            article.get("content") or article.get("description", "")
+            for article, _ in canonical
+        ])
+
+        ids = await article_store.add_many([
+            {**article, "analysis": analysis}
+            for (article, _), analysis in zip(canonical, analyses)
+        ])
+        for (article, article_signature), article_id in zip(canonical, ids):
+            if article_id is not None:
+                index.add(article_id, *article_signature, self._timestamp(article))
+        await article_store.add_sources(stored_sources + [
+            (ids[position], article)
+            for position, article in batch_sources
+            if ids[position] is not None
+        ])
+        stored = sum(article_id is not None for article_id in ids)
+        await self._publish([
+            {**article, "analysis": analysis, "id": article_id}
+            for (article, _), analysis, article_id in zip(canonical, analyses, ids)
+            if article_id is not None
+        ])
+
+        reanalyzed = await self._reanalyze_pending(set(ids))
+
+        self.counters["runs"] += 1
+        self.counters["ingested"] += stored
+        self.last_run = datetime.now()
+        logger.info(
+            f"News ingestion: {stored} new articles stored, "
+            f"{len(stored_sources) + len(batch_sources)} near-duplicates clustered, "
+            f"{reanalyzed} pending analyses completed"
+        )
+        return stored
+
+    async def _reanalyze_pending(self, skip: Set[Optional[int]]) -> int:
+        """Retry the analysis of articles stored with the fallback; returns how many got a real one"""
+        pending = [
+            article for article in await article_store.pending_analysis(settings.INGESTION_REANALYZE_LIMIT)
+            if article["id"] not in skip  # just failed in this run
+        ]
+        if not pending:
+            return 0
+
+        analyses = await self._analyze([
+            article.get("content") or article.get("description", "") for article in pending
+        ])
+        updated = [
+            (article, analysis)
+            for article, analysis in zip(pending, analyses)
+            if analysis.get("method") != "fallback"
+        ]
+        if not updated:
+            return 0
+
+        await article_store.update_analyses([(article["id"], analysis) for article, analysis in updated])
+        await self._publish(
+            [{**article, "analysis": analysis} for article, analysis in updated],
+            event="article_updated"
+        )
+        self.counters["reanalyzed"] += len(updated)
+        return len(updated)
+
+    async def _publish(self, articles: List[Dict], event: str = "article"):
+        """Push newly stored (or re-analyzed) articles to stream subscribers"""
+        for article in articles:
+            article["published_at"] = parse_published_at(article.get("published_at")).isoformat()
+            item = NewsService._to_news_item(article, [])
+            await news_events.publish(event, item.model_dump(mode="json"))
+
+    @staticmethod
+    def _timestamp(article: Dict) -> float:
+        return parse_published_at(article.get("published_at")).timestamp()
+
+    async def _load_index(self) -> NearDuplicateIndex:
+        """Near-duplicate index of articles within DEDUP_WINDOW_HOURS, built once from the store"""
+        since = datetime.now(timezone.utc) - timedelta(hours=settings.DEDUP_WINDOW_HOURS)
+        if self._index is None:
+            recent = await article_store.recent(since)
+            signatures = await asyncio.to_thread(lambda: [signature(article) for article in recent])
+            index = NearDuplicateIndex(settings.DEDUP_SIMILARITY)
+            for article, article_signature in zip(recent, signatures):
+                index.add(article["id"], *article_signature, self._timestamp(article))
+            self._index = index
+            logger.info(f"Near-duplicate index loaded with {len(index)} articles")
+        else:
+            self._index.prune(since.timestamp())
+        return self._index
+
+    async def _analyze(self, contents: List[str]) -> List[Dict]:
+        """Analyze contents in OPENAI_BATCH_SIZE batches, NEWS_ANALYSIS_CONCURRENCY at a time"""
+        semaphore = asyncio.Semaphore(settings.NEWS_ANALYSIS_CONCURRENCY)
+
+        async def analyze(batch: List[str]) -> List[Dict]:
+            async with semaphore:
+                return await openai_service.analyze_news_batch(batch, Priority.BACKGROUND)
+
+        batches = [
+            contents[i:i + settings.OPENAI_BATCH_SIZE]
+            for i in range(0, len(contents), settings.OPENAI_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(analyze(batch) for batch in batches))
+        return [analysis for batch in results for analysis in batch]
+
+
+ingestion_service = IngestionService()
@@ -0,0 +1,129 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+# Parser events: ("delta", field, text) while a top-level string grows and
+# ("field", field, value) once a top-level value is complete
+Event = Tuple[str, str, Any]
+
+WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object
+
+    Completion text is fed in arbitrary chunks. Each top-level field is
+    reported as soon as its value is complete, and top-level string values
+    are also reported piece by piece while they are generated, so a summary
+    can be shown before the rest of the object arrives. Anything before the
+    first "{" (a markdown fence, a stray sentence) is skipped.
+
+    The scanner only tracks nesting and string state; values themselves are
+    decoded with json.loads once their extent is known.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._start: Optional[int] = None  # index of the opening brace
+        self._end: Optional[int] = None  # index past the closing brace
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._emitted = ""  # decoded text of the current string value already reported
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, text: str) -> List[Event]:
+        """Consume a chunk and return the events it completes"""
+        self.buffer += text
+        events: List[Event] = []
+        while self._pos < len(self.buffer) and self._end is None:
+            self._step(self.buffer[self._pos], events)
+            self._pos += 1
+        self._string_delta(events)
+        return events
+
+    def result(self) -> Any:
+        """The whole object; raises json.JSONDecodeError if it is incomplete or invalid"""
+        if self._start is None:
+            raise json.JSONDecodeError("No JSON object in completion", self.buffer, 0)
+        return json.loads(self.buffer[self._start:self._end or len(self.buffer)])
+
+    def _step(self, char: str, events: List[Event]):
+        position = self._pos
+        if self._start is None:
+            if char == "{":
+                self._start, self._depth = position, 1
+            return
+
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1 and self._key is None and self._key_start is not None:
+                    self._key = json.loads(self.buffer[self._key_start:position + 1])
+                elif self._depth == 1 and self._value_start is not None:
+                    self._finish_value(position + 1, events)
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1:
+                if self._key is None:
+                    self._key_start = position
+                elif self._value_start is None:
+                    self._value_start, self._emitted = position, ""
+        elif char in "{[":
+            if self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = position
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 1 and self._value_start is not None:
+                self._finish_value(position + 1, events)
+            elif self._depth == 0:
+                if self._value_start is not None:
+                    self._finish_value(position, events)
+                self._end = position + 1
+        elif self._depth == 1 and self._key is not None:
+            if char == ",":
+                if self._value_start is not None:
+                    self._finish_value(position, events)
+            elif char not in WHITESPACE and char != ":" and self._value_start is None:
+                self._value_start = position  # number, true, false or null
+
+    def _finish_value(self, end: int, events: List[Event]):
+        raw = self.buffer[self._value_start:end].strip()
+        if raw:
+            value = json.loads(raw)
+            if isinstance(value, str):
+                self._emit_delta(value, events)
+            events.append(("field", self._key, value))
+        self._key = self._key_start = self._value_start = None
+
+    def _string_delta(self, events: List[Event]):
+        """Report the part of a still-open top-level string value decoded so far"""
+        if not (self._in_string and self._depth == 1 and self._value_start is not None):
+            return
+        raw = self.buffer[self._value_start:]
+        if self._escaped:
+            raw = raw[:-1]
+        try:
+            value = json.loads(raw + '"')
+        except json.JSONDecodeError:
+            return  # an escape sequence is split across chunks
+        self._emit_delta(value, events)
+
+    def _emit_delta(self, value: str, events: List[Event]):
+        if len(value) > len(self._emitted):
+            events.append(("delta", self._key, value[len(self._emitted):]))
+            self._emitted = value
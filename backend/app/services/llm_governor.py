@@ -0,0 +1,260 @@
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+import openai
+from app.core.config import settings
+from app.core.logging import logger
+from app.core.metrics import (
+    LLM_IN_FLIGHT, LLM_QUEUE_DEPTH, LLM_QUEUED, LLM_REQUESTS_AVAILABLE, LLM_TOKENS_AVAILABLE
+)
+
+T = TypeVar("T")
+
+# Errors worth retrying: rate limits, timeouts, dropped connections and 5xx
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class Priority(IntEnum):
+    """Queue order for completion calls; lower runs first"""
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+def estimate_tokens(messages: List[Dict], max_tokens: int) -> int:
+    """Rough token cost of a completion: ~4 characters per prompt token plus the completion cap"""
+    return sum(len(message.get("content") or "") for message in messages) // 4 + max_tokens
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from Retry-After(-ms) headers"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        if "retry-after-ms" in response.headers:
+            return float(response.headers["retry-after-ms"]) / 1000
+        if "retry-after" in response.headers:
+            return float(response.headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+class LLMGovernor:
+    """
+    Admission control in front of every completion call
+
+    A call waits until an in-flight slot is free and the per-minute request
+    and token budgets (token buckets refilled continuously) cover it. Token
+    cost is estimated up front and reconciled with the usage the API
+    reports. Waiters are served strictly by priority, then arrival, so
+    interactive requests overtake queued background enrichment.
+
+    Retryable errors are retried with jittered exponential backoff; each
+    attempt goes through admission again. A 429 with Retry-After also pauses
+    admission for everyone until then, since the limit it reports is shared.
+    A limit of 0 disables that budget.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float
+    ):
+        self.max_in_flight = max_in_flight
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.in_flight = 0
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.counters = {
+            "admitted": 0,
+            "queued": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failed": 0,
+            "tokens_estimated": 0,
+            "tokens_used": 0,
+        }
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        estimated_tokens: int,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> T:
+        """Run ``call`` under the budgets, retrying retryable errors"""
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(estimated_tokens, priority)
+            try:
+                result = await call()
+                self._reconcile(estimated_tokens, getattr(result, "usage", None))
+                return result
+            except RETRYABLE_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    self.counters["rate_limited"] += 1
+                if attempt == self.max_retries:
+                    self.counters["failed"] += 1
+                    raise
+                # Full jitter: spread retries of a burst over the backoff window
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                server_delay = retry_after(e)
+                if server_delay is not None:
+                    self._paused_until = max(self._paused_until, time.monotonic() + server_delay)
+                    delay += server_delay
+                self.counters["retries"] += 1
+                logger.warning(f"OpenAI call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            finally:
+                self._release()
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, tokens: int, priority: Priority):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), tokens, future))
+        self._dispatch()
+        if not future.done():
+            self.counters["queued"] += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller went away: hand the slot back
+                self._release()
+            raise
+
+    def _release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        if self.requests_per_minute:
+            self._requests = min(
+                self.requests_per_minute,
+                self._requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(
+                self.tokens_per_minute,
+                self._tokens + elapsed * self.tokens_per_minute / 60
+            )
+
+    def _budget_wait(self, tokens: int) -> float:
+        """Seconds until the budgets cover one request of ``tokens``"""
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self.requests_per_minute and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+        if self.tokens_per_minute:
+            # A call larger than the whole budget only waits for a full bucket
+            needed = min(tokens, self.tokens_per_minute)
+            if self._tokens < needed:
+                wait = max(wait, (needed - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    def _dispatch(self):
+        """Admit waiters in priority order while slots and budget allow"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+
+        while self._waiters:
+            _, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return  # the next release dispatches again
+            wait = self._budget_wait(tokens)
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+
+            heapq.heappop(self._waiters)
+            self.in_flight += 1
+            self._requests -= 1
+            self._tokens -= tokens
+            self.counters["admitted"] += 1
+            self.counters["tokens_estimated"] += tokens
+            future.set_result(None)
+
+    def _reconcile(self, estimated: int, usage: Any):
+        """Give back (or charge) the difference between estimated and reported tokens"""
+        used = getattr(usage, "total_tokens", None)
+        if used is None:
+            return
+        self.counters["tokens_used"] += used
+        self._tokens += estimated - used
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget usage and queue depth"""
+        self._refill()
+        queued = [waiter for waiter in self._waiters if not waiter[3].done()]
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queue_depth": len(queued),
+            "queue_depth_interactive": sum(waiter[0] == Priority.INTERACTIVE for waiter in queued),
+            "queue_depth_background": sum(waiter[0] == Priority.BACKGROUND for waiter in queued),
+            "requests_available": round(self._requests, 2) if self.requests_per_minute else None,
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_available": round(self._tokens) if self.tokens_per_minute else None,
+            "tokens_per_minute": self.tokens_per_minute,
+        }
+
+
+llm_governor = LLMGovernor(
+    max_in_flight=settings.OPENAI_MAX_IN_FLIGHT,
+    requests_per_minute=settings.OPENAI_REQUESTS_PER_MINUTE,
+    tokens_per_minute=settings.OPENAI_TOKENS_PER_MINUTE,
+    max_retries=settings.OPENAI_MAX_RETRIES,
+    base_delay=settings.OPENAI_RETRY_BASE_DELAY,
+    max_delay=settings.OPENAI_RETRY_MAX_DELAY
+)
+# Read at scrape time, nothing to update on the hot path
+LLM_IN_FLIGHT.set_function(lambda: llm_governor.in_flight)
+LLM_QUEUED.set_function(lambda: sum(not waiter[3].done() for waiter in llm_governor._waiters))
+
+
+def _queue_depth(priority: Priority) -> Callable[[], int]:
+    return lambda: sum(waiter[0] == priority and not waiter[3].done() for waiter in llm_governor._waiters)
+
+
+def _available(budget: str, limit: str) -> Callable[[], float]:
+    """Budget left at scrape time, refilled first; NaN when that budget is off"""
+    def read() -> float:
+        if not getattr(llm_governor, limit):
+            return float("nan")
+        llm_governor._refill()
+        return getattr(llm_governor, budget)
+    return read
+
+
+for _priority in Priority:
+    LLM_QUEUE_DEPTH.labels(priority=_priority.name.lower()).set_function(_queue_depth(_priority))
+LLM_REQUESTS_AVAILABLE.set_function(_available("_requests", "requests_per_minute"))
+LLM_TOKENS_AVAILABLE.set_function(_available("_tokens", "tokens_per_minute"))
@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Optional, Tuple
+
+
+class MemoryCache:
+    """
+    In-process LRU cache bounded by total byte size
+
+    Entries carry their own expiry so TTLs can be aligned with Redis. Sizes
+    are supplied by the caller (the length of the serialized value), which
+    keeps the bound honest without walking Python object graphs.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live entry and mark it as most recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, size: int) -> bool:
+        """Store an entry for ttl seconds, evicting LRU entries to fit"""
+        self.delete(key)
+        if ttl <= 0 or size > self.max_bytes:
+            return False
+
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+        return True
+
+    def delete(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.current_bytes -= entry[2]
+        return True
+
+    def clear_pattern(self, pattern: str) -> int:
+        """Delete all keys matching a Redis-style glob pattern"""
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in keys:
+            self.delete(key)
+        return len(keys)
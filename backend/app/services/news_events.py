@@ -0,0 +1,118 @@
+import asyncio
+import json
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Set
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.cache_service import cache_service
+
+
+class NewsEventBroker:
+    """
+    Fan-out of news events (newly ingested articles) to stream subscribers
+
+    Each subscriber gets a bounded queue; a subscriber that falls behind
+    loses its oldest events rather than holding up ingestion.
+
+    Events are delivered to subscribers in this process and, while Redis is
+    reachable, published on NEWS_EVENTS_CHANNEL so API workers also see
+    articles ingested by other processes (e.g. worker.py). Messages carry
+    the publishing process' id so a process ignores its own.
+    """
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._relay_task: Optional[asyncio.Task] = None
+        self.counters = {
+            "published": 0,
+            "relayed": 0,
+            "delivered": 0,
+            "dropped": 0,
+        }
+
+    async def start(self):
+        """Relay events published by other processes"""
+        if cache_service.redis is not None:
+            self._relay_task = asyncio.create_task(self._relay_loop())
+
+    async def close(self):
+        if self._relay_task:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving every event published from now on"""
+        queue = asyncio.Queue(maxsize=settings.NEWS_STREAM_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def add_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    async def publish(self, event: str, data: Dict[str, Any]):
+        """Deliver an event to local subscribers and to other processes"""
+        self.counters["published"] += 1
+        self._deliver(event, data)
+        await cache_service.publish(
+            settings.NEWS_EVENTS_CHANNEL,
+            json.dumps({"origin": self.origin, "event": event, "data": data})
+        )
+
+    def _deliver(self, event: str, data: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                logger.error(f"News event listener error: {e}")
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.counters["dropped"] += 1
+            queue.put_nowait((event, data))
+            self.counters["delivered"] += 1
+
+    async def _relay_loop(self):
+        while True:
+            if not cache_service.healthy:
+                await asyncio.sleep(settings.REDIS_HEALTH_INTERVAL)
+                continue
+            pubsub = cache_service.redis.pubsub()
+            try:
+                await pubsub.subscribe(settings.NEWS_EVENTS_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload.get("origin") == self.origin:
+                        continue
+                    self.counters["relayed"] += 1
+                    self._deliver(payload["event"], payload["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"News event relay error: {e}")
+                await asyncio.sleep(settings.REDIS_HEALTH_INTERVAL)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "subscribers": len(self._subscribers)}
+
+
+news_events = NewsEventBroker()
@@ -1,6 +1,18 @@
-from typing import List, Optional
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-from app.models.schemas import NewsItem, CategoryType, SentimentType
+from app.core.config import settings
+from app.models.schemas import (
+    NewsItem,
+    NewsResponse,
+    NewsSearchResponse,
+    NewsSummaryResponse,
+    CategoryType,
+    SearchSort,
+    SentimentType
+)
+from app.services.article_store import ArticleStore, InvalidCursorError, article_store, parse_published_at
+from app.services.news_events import news_events
 from app.services.openai_service import openai_service
 from app.services.search_service import search_service
 from app.core.logging import logger
@@ -8,126 +20,245 @@ from app.core.logging import logger
 
 class NewsService:
     """Service for news management"""
-    
-    # Mock news data - Replace with real API integration
-    MOCK_NEWS = [
-        {
-            "title": "Mercados globais em alta com dados econômicos positivos",
-            "content": "Os mercados globais registraram ganhos significativos hoje, impulsionados por dados econômicos melhores que o esperado. O índice S&P 500 subiu 1.2%, enquanto o Nasdaq avançou 1.5%.",
-            "category": "market",
-            "symbols": ["SPY", "QQQ"]
-        },
-        {
-            "title": "Big Tech lidera ganhos com inovações em IA",
-            "content": "Empresas de tecnologia lideram os ganhos do mercado após anúncios de novos produtos baseados em inteligência artificial. Apple, Microsoft e Google apresentaram avanços significativos.",
-            "category": "tech",
-            "symbols": ["AAPL", "MSFT", "GOOGL"]
-        },
-        {
-            "title": "Bitcoin ultrapassa marca de $50k com otimismo institucional",
-            "content": "O Bitcoin ultrapassou a marca de $50,000 pela primeira vez em meses, impulsionado por crescente interesse institucional e aprovação de ETFs.",
-            "category": "crypto",
-            "symbols": ["BTC"]
-        },
-        {
-            "title": "Petróleo em queda com aumento de produção",
-            "content": "Os preços do petróleo caíram 2% após anúncios de aumento na produção da OPEC+. Analistas preveem pressão adicional nos próximos meses.",
-            "category": "commodities",
-            "symbols": ["USO", "XLE"]
-        },
-        {
-            "title": "Fed mantém taxas de juros estáveis",
-            "content": "O Federal Reserve decidiu manter as taxas de juros inalteradas, sinalizando uma abordagem cautelosa em relação à inflação e crescimento econômico.",
-            "category": "market",
-            "symbols": ["SPY", "TLT"]
-        },
-    ]
-    
+
     async def get_news(
-        self, 
+        self,
         category: Optional[CategoryType] = None,
         limit: int = 10,
-        page: int = 1
-    ) -> List[NewsItem]:
-        """Get news with AI analysis"""
+        page: int = 1,
+        cursor: Optional[str] = None,
+        symbol: Optional[str] = None
+    ) -> NewsResponse:
+        """
+        Get analyzed news from the article store
+
+        With a cursor the page is read by index seek; otherwise ``page`` is
+        translated to an offset. ``symbol`` restricts the page to articles
+        mentioning a ticker, through the store's symbol index. Raises
+        InvalidCursorError for a malformed cursor.
+        """
+        category_value = category.value if category and category != CategoryType.ALL else None
+        symbol = symbol.upper() if symbol else None
         try:
-            logger.info(f"Fetching news - category: {category}, limit: {limit}")
-            
-            # Limit to max 3 items for faster response
-            limit = min(limit, 3)
-            
-            # Search real news from external API
-            if category and category != CategoryType.ALL:
-                real_news = await search_service.search_by_category(category.value)
-            else:
-                real_news = await search_service.search_financial_news(page_size=limit)
-            
-            # If no real news, use mock data
-            if not real_news:
-                news_data = self.MOCK_NEWS
-                if category and category != CategoryType.ALL:
-                    news_data = [n for n in news_data if n["category"] == category.value]
-                
-                start_idx = (page - 1) * limit
-                end_idx = start_idx + limit
-                news_data = news_data[start_idx:end_idx]
-                
-                real_news = [
-                    {
-                        "title": n["title"],
-                        "content": n["content"],
-                        "source": "Mock Data",
-                        "url": "",
-                        "published_at": datetime.now().isoformat()
-                    }
-                    for n in news_data
-                ]
-            
-            # Analyze each news with AI
-            news_items = []
-            for idx, news in enumerate(real_news[:limit]):
-                content = news.get("content") or news.get("description", "")
-                analysis = await openai_service.analyze_news(content)
-                
-                if analysis:
-                    # Determine category from content if not specified
-                    news_category = category if category and category != CategoryType.ALL else CategoryType.MARKET
-                    
-                    news_item = NewsItem(
-                        id=idx + 1,
-                        title=news.get("title", ""),
-                        summary=analysis.get("summary", content[:150]),
-                        sentiment=SentimentType(analysis.get("sentiment", "neutral")),
-                        category=news_category,
-                        timestamp=datetime.fromisoformat(news.get("published_at", datetime.now().isoformat()).replace("Z", "+00:00")),
-                        confidence=analysis.get("confidence", 0.8),
-                        source=news.get("source", "Unknown")
-                    )
-                    news_items.append(news_item)
-            
+            logger.info(f"Fetching news - category: {category}, symbol: {symbol}, limit: {limit}")
+
+            # Articles are fetched and analyzed by the ingestion worker;
+            # serving a page is a pure read from the store
+            articles, next_cursor = await article_store.list(
+                category_value,
+                symbol=symbol,
+                limit=limit,
+                cursor=cursor,
+                offset=0 if cursor else (page - 1) * limit
+            )
+            total = await article_store.count(category_value, symbol)
+            sources = await article_store.sources([article["id"] for article in articles])
+
+            news_items = [
+                self._to_news_item(article, sources.get(article["id"], []))
+                for article in articles
+            ]
+
             logger.info(f"Returned {len(news_items)} news items")
-            return news_items
-            
+            return NewsResponse(
+                news=news_items,
+                total=total,
+                page=page,
+                page_size=limit,
+                next_cursor=next_cursor
+            )
+
+        except InvalidCursorError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching news: {e}")
-            return []
-    
+            return NewsResponse(news=[], total=0, page=page, page_size=limit)
+
+    async def search_news(
+        self,
+        query: str,
+        category: Optional[CategoryType] = None,
+        sentiment: Optional[SentimentType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sort: SearchSort = SearchSort.RELEVANCE,
+        limit: int = 10,
+        page: int = 1
+    ) -> NewsSearchResponse:
+        """Full-text search over stored (analyzed) articles, through the store's FTS index"""
+        logger.info(f"Searching news - query: {query!r}, category: {category}, sentiment: {sentiment}")
+        # One extra row tells whether there is a next page without counting matches
+        articles = await article_store.search(
+            query,
+            category.value if category and category != CategoryType.ALL else None,
+            sentiment.value if sentiment else None,
+            since,
+            until,
+            sort.value,
+            limit=limit + 1,
+            offset=(page - 1) * limit
+        )
+        sources = await article_store.sources([article["id"] for article in articles[:limit]])
+        return NewsSearchResponse(
+            query=query,
+            news=[
+                self._to_news_item(article, sources.get(article["id"], []))
+                for article in articles[:limit]
+            ],
+            page=page,
+            page_size=limit,
+            has_more=len(articles) > limit
+        )
+
+    @staticmethod
+    def _to_news_item(article: Dict, sources: List[Dict]) -> NewsItem:
+        """Build the API representation of a stored article and its near-duplicate sources"""
+        content = article.get("content") or article.get("description", "")
+        analysis = article.get("analysis") or {}
+        source = article.get("source", "Unknown")
+
+        return NewsItem(
+            id=article["id"],
+            title=article.get("title", ""),
+            summary=analysis.get("summary", content[:150]),
+            sentiment=SentimentType(analysis.get("sentiment", "neutral")),
+            category=CategoryType(article["category"]),
+            timestamp=datetime.fromisoformat(article["published_at"]),
+            confidence=analysis.get("confidence", 0.8),
+            source=source,
+            symbols=article.get("symbols"),
+            sources=list(dict.fromkeys([source] + [s["source"] for s in sources if s["source"]])),
+            # The fallback analysis is replaced once OpenAI answers again
+            analysis_pending=analysis.get("method") == "fallback"
+        )
+
+    async def stream_news(
+        self,
+        category: Optional[CategoryType] = None,
+        limit: int = 10
+    ) -> AsyncIterator[Optional[Tuple[str, Dict]]]:
+        """
+        Live news feed as (event, data) pairs
+
+        Yields a "headline" per current NewsAPI article as soon as the search
+        returns, then an "analysis" per headline as its analysis completes
+        (cached ones first), then an "article" for every newly ingested
+        article in the category until the caller stops iterating. Headlines
+        and analyses are matched by "key". Yields None after
+        NEWS_STREAM_KEEPALIVE idle seconds so the caller can keep the
+        connection alive.
+        """
+        category_value = category.value if category and category != CategoryType.ALL else None
+        # Subscribe first so articles ingested while headlines load are not missed
+        subscription = news_events.subscribe()
+        pending: Dict[asyncio.Task, str] = {}
+        getter: Optional[asyncio.Task] = None
+        try:
+            headlines = await self._headlines(category_value, limit)
+            for headline in headlines:
+                yield "headline", {
+                    key: value for key, value in headline.items() if key != "content"
+                }
+
+            contents = [headline["content"] for headline in headlines]
+            cached = await openai_service.get_cached_analyses(contents)
+            for headline, content, analysis in zip(headlines, contents, cached):
+                if analysis is not None:
+                    yield "analysis", self._analysis_event(headline["key"], analysis)
+                else:
+                    pending[asyncio.create_task(openai_service.analyze_news(content))] = headline["key"]
+
+            while True:
+                if getter is None:
+                    getter = asyncio.create_task(subscription.get())
+                done, _ = await asyncio.wait(
+                    [getter, *pending],
+                    timeout=settings.NEWS_STREAM_KEEPALIVE,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    yield None
+                for task in done:
+                    if task is getter:
+                        getter = None
+                        event, data = task.result()
+                        if category_value is None or data.get("category") == category_value:
+                            yield event, data
+                    else:
+                        key = pending.pop(task)
+                        yield "analysis", self._analysis_event(key, task.result())
+        finally:
+            news_events.unsubscribe(subscription)
+            for task in [getter, *pending]:
+                if task:
+                    task.cancel()
+
+    async def _headlines(self, category: Optional[str], limit: int) -> List[Dict]:
+        """Latest raw NewsAPI articles for a category (all categories when None)"""
+        categories = [category] if category else list(search_service.CATEGORY_QUERIES)
+        results = await asyncio.gather(*(
+            search_service.search_by_category(name, page_size=limit)
+            for name in categories
+        ))
+
+        headlines: Dict[str, Dict] = {}
+        for name, articles in zip(categories, results):
+            for article in articles:
+                key = ArticleStore.article_key(article)
+                if key in headlines:
+                    continue
+                headlines[key] = {
+                    "key": key,
+                    "title": article.get("title", ""),
+                    "description": article.get("description", ""),
+                    "category": name,
+                    "timestamp": parse_published_at(article.get("published_at")).isoformat(),
+                    "source": article.get("source"),
+                    "url": article.get("url"),
+                    "image_url": article.get("image_url"),
+                    "content": article.get("content") or article.get("description", "")
+                }
+        latest = sorted(headlines.values(), key=lambda headline: headline["timestamp"], reverse=True)
+        return latest[:limit]
+
+    @staticmethod
+    def _analysis_event(key: str, analysis: Optional[Dict]) -> Dict:
+        analysis = analysis or {}
+        try:
+            sentiment = SentimentType(analysis.get("sentiment", "neutral"))
+        except ValueError:
+            sentiment = SentimentType.NEUTRAL
+        response = NewsSummaryResponse(
+            summary=analysis.get("summary", ""),
+            sentiment=sentiment,
+            confidence=analysis.get("confidence", 0.5),
+            key_points=analysis.get("key_points")
+        )
+        return {"key": key, **response.model_dump(mode="json")}
+
     async def get_news_summary(self, news_id: int) -> Optional[dict]:
         """Get detailed summary of specific news"""
         try:
-            if news_id <= 0 or news_id > len(self.MOCK_NEWS):
+            article = await article_store.get(news_id)
+            if not article:
                 return None
-            
-            news = self.MOCK_NEWS[news_id - 1]
-            analysis = await openai_service.analyze_news(news["content"])
-            
+            sources = await article_store.sources([news_id])
+
             return {
                 "id": news_id,
-                "title": news["title"],
-                "content": news["content"],
-                "analysis": analysis
+                "title": article["title"],
+                "content": article.get("content") or article.get("description", ""),
+                "analysis": article.get("analysis"),
+                "sources": [
+                    {
+                        "source": article.get("source"),
+                        "title": article["title"],
+                        "url": article.get("url"),
+                        "published_at": article["published_at"]
+                    }
+                ] + sources.get(news_id, [])
             }
-            
+
         except Exception as e:
             logger.error(f"Error getting news summary: {e}")
             return None
@@ -1,157 +1,633 @@
+import asyncio
+import itertools
 import json
-from typing import Dict, List, Optional
-from openai import OpenAI
+import httpx
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from openai import AsyncOpenAI
+from openai.types import CompletionUsage
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import timed
 from app.models.schemas import SentimentType
+from app.services.article_store import article_store
 from app.services.cache_service import cache_service
+from app.services.circuit_breaker import circuit_breakers
+from app.services.json_stream import Event, IncrementalJSONParser
+from app.services.llm_governor import RETRYABLE_ERRORS, Priority, estimate_tokens, llm_governor
+from app.services.sentiment_service import SentimentScore, sentiment_classifier
+
+SENTIMENTS = [sentiment.value for sentiment in SentimentType]
+
+
+class StreamInterruptedError(Exception):
+    """A completion stream failed after part of it was relayed; not retried"""
+
+
+def stream_usage(reported: Any, messages: List[Dict], streamed_chars: int) -> CompletionUsage:
+    """Usage the stream reported, or ~4 characters per token of prompt and streamed text"""
+    if reported is not None:
+        return CompletionUsage.model_validate(reported) if isinstance(reported, dict) else reported
+    prompt_tokens = estimate_tokens(messages, 0)
+    completion_tokens = streamed_chars // 4
+    return CompletionUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens
+    )
 
 
 class OpenAIService:
     """Service for OpenAI API interactions"""
-    
+
     def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        # One shared async client per process: completions run on the event
+        # loop instead of blocking it, and connections are pooled across calls
+        self.timeout = httpx.Timeout(
+            settings.OPENAI_TIMEOUT,
+            connect=settings.OPENAI_CONNECT_TIMEOUT
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=self.timeout,
+            # Retries go through llm_governor so they respect the budgets
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
+        # Fails completions fast while OpenAI errors or times out
+        self.breaker = circuit_breakers.register("openai", RETRYABLE_ERRORS + (StreamInterruptedError,))
         self.model = settings.OPENAI_MODEL
         self.max_tokens = settings.OPENAI_MAX_TOKENS
         self.temperature = settings.OPENAI_TEMPERATURE
-    
-    async def analyze_news(self, content: str) -> Optional[Dict]:
+
+    async def close(self):
+        """Close the shared HTTP connection pool"""
+        await self.client.close()
+
+    async def _complete_json(
+        self,
+        messages: List[Dict],
+        max_tokens: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> Any:
+        """Run a chat completion through the governor and parse the JSON it returns"""
+        max_tokens = max_tokens or self.max_tokens
+        # Checked before queueing too, so a rejected call spends no budget
+        self.breaker.check()
+        response = await llm_governor.run(
+            lambda: self.breaker.call(lambda: self._create_completion(messages, max_tokens)),
+            estimated_tokens=estimate_tokens(messages, max_tokens),
+            priority=priority
+        )
+
+        content_response = response.choices[0].message.content.strip()
+
+        # Remove markdown code blocks if present
+        if content_response.startswith("```"):
+            content_response = content_response.split("```")[1]
+            if content_response.startswith("json"):
+                content_response = content_response[4:]
+
+        return self._validate(json.loads(content_response))
+
+    @timed("openai", "completion")
+    async def _create_completion(self, messages: List[Dict], max_tokens: int) -> Any:
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=self.temperature,
+            max_tokens=max_tokens,
+            timeout=self.timeout,
+        )
+
+    @staticmethod
+    def _validate(result: Any) -> Any:
+        """
+        Normalize fields the model gets wrong
+
+        A confidence that is not a number between 0 and 1 raises ValueError,
+        so callers use their fallback instead of caching and storing a value
+        the response models would reject.
+        """
+        if isinstance(result, dict):
+            if result.get("sentiment") not in SENTIMENTS:
+                result["sentiment"] = "neutral"
+            if "confidence" in result and not OpenAIService._is_valid_confidence(result["confidence"]):
+                raise ValueError(f"Invalid confidence in completion: {result['confidence']!r}")
+
+        return result
+
+    @staticmethod
+    def _is_valid_confidence(confidence: Any) -> bool:
+        return isinstance(confidence, (int, float)) and not isinstance(confidence, bool) and 0 <= confidence <= 1
+
+    async def _stream_completion(
+        self,
+        messages: List[Dict],
+        max_tokens: Optional[int] = None,
+        priority: Priority = Priority.INTERACTIVE
+    ) -> AsyncIterator[str]:
+        """
+        Run a streaming chat completion through the governor, yielding text deltas
+
+        The governor slot is held until the stream ends. Failures before the
+        first token are retried like any call; a stream that breaks midway
+        is not, since its beginning has already been relayed.
+        """
+        max_tokens = max_tokens or self.max_tokens
+        self.breaker.check()
+        deltas: asyncio.Queue = asyncio.Queue()
+        started = False
+
+        @timed("openai", "completion_stream")
+        async def consume():
+            nonlocal started
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                timeout=self.timeout,
+                stream=True,
+                # The last chunk then carries the usage, with no choices
+                extra_body={"stream_options": {"include_usage": True}},
+            )
+            usage = None
+            streamed_chars = 0
+            try:
+                async for chunk in stream:
+                    usage = getattr(chunk, "usage", None) or usage
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text:
+                        started = True
+                        streamed_chars += len(text)
+                        deltas.put_nowait(text)
+            except RETRYABLE_ERRORS as e:
+                if started:
+                    raise StreamInterruptedError(str(e)) from e
+                raise
+            return SimpleNamespace(usage=stream_usage(usage, messages, streamed_chars))
+
+        async def run():
+            try:
+                await llm_governor.run(
+                    lambda: self.breaker.call(consume),
+                    estimated_tokens=estimate_tokens(messages, max_tokens),
+                    priority=priority
+                )
+            finally:
+                deltas.put_nowait(None)
+
+        task = asyncio.create_task(run())
+        try:
+            while (text := await deltas.get()) is not None:
+                yield text
+            await task
+        finally:
+            task.cancel()
+
+    async def _stream_json(
+        self,
+        cache_key: str,
+        messages: List[Dict],
+        fallback: Callable[[], Dict],
+        ttl: int = None
+    ) -> AsyncIterator[Event]:
+        """
+        Stream a JSON completion as IncrementalJSONParser events
+
+        Ends with ("done", None, result), which is authoritative: the
+        validated object, cached as get_or_compute would cache it, or the
+        fallback (not cached) if the completion failed partway. A cached
+        result is replayed field by field without calling the API.
+        """
+        cached = await cache_service.get(cache_key)
+        if cached is not None:
+            for name, value in cached.items():
+                yield "field", name, value
+            yield "done", None, cached
+            return
+
+        parser = IncrementalJSONParser()
+        try:
+            async for text in self._stream_completion(messages):
+                for event in parser.feed(text):
+                    yield event
+            result = self._validate(parser.result())
+            await cache_service.set(cache_key, result, ttl=ttl)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            result = fallback()
+        except Exception as e:
+            logger.error(f"OpenAI streaming error: {e}")
+            result = fallback()
+        yield "done", None, result
+
+    async def get_cached_analyses(self, contents: List[str]) -> List[Optional[Dict]]:
+        """Return the cached analysis for each news content, if any"""
+        return await cache_service.get_many([
+            cache_service._generate_key("news_analysis", content)
+            for content in contents
+        ])
+
+    async def analyze_news(self, content: str, priority: Priority = Priority.INTERACTIVE) -> Optional[Dict]:
         """Analyze news content and extract sentiment"""
         cache_key = cache_service._generate_key("news_analysis", content)
-        cached = cache_service.get(cache_key)
-        
-        if cached:
-            return cached
-        
+
         try:
-            logger.info("Analyzing news with OpenAI")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            # Concurrent misses for the same content share one completion
+            return await cache_service.get_or_compute(
+                cache_key,
+                lambda: self._analyze(content, priority)
+            )
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            return self._fallback_analysis(content)
+        except Exception as e:
+            logger.error(f"OpenAI analysis error: {e}")
+            return self._fallback_analysis(content)
+
+    async def stream_news_analysis(self, content: str) -> AsyncIterator[Event]:
+        """analyze_news, streamed field by field as the completion is generated"""
+        local = self._preclassify(content)
+        if local is not None:
+            for name, value in local.items():
+                yield "field", name, value
+            yield "done", None, local
+            return
+
+        async for event in self._stream_json(
+            cache_service._generate_key("news_analysis", content),
+            self._analysis_messages(content),
+            lambda: self._fallback_analysis(content)
+        ):
+            yield event
+
+    async def _analyze(self, content: str, priority: Priority) -> Dict:
+        """Lexicon classification when it is confident enough, the LLM otherwise"""
+        local = self._preclassify(content)
+        if local is not None:
+            return local
+        return await self._analyze_with_llm(content, priority)
+
+    def _preclassify(self, content: str) -> Optional[Dict]:
+        """Local analysis if the lexicon classifier clears SENTIMENT_PRECLASSIFIER_THRESHOLD"""
+        if not settings.SENTIMENT_PRECLASSIFIER_ENABLED:
+            return None
+        score = sentiment_classifier.classify(content)
+        if score.confidence < settings.SENTIMENT_PRECLASSIFIER_THRESHOLD:
+            return None
+        return self._local_analysis(content, score)
+
+    @staticmethod
+    def _local_analysis(
+        content: str,
+        score: SentimentScore,
+        key_points: Optional[List[str]] = None,
+        method: str = "lexicon"
+    ) -> Dict:
+        """Analysis without a completion: truncated content as summary, lexicon sentiment"""
+        return {
+            "summary": content[:150] + "..." if len(content) > 150 else content,
+            "sentiment": score.sentiment.value,
+            "confidence": score.confidence,
+            "key_points": key_points,
+            "method": method
+        }
+
+    async def _analyze_with_llm(self, content: str, priority: Priority) -> Dict:
+        """Single-article analysis completion"""
+        logger.info("Analyzing news with OpenAI")
+
+        result = await self._complete_json(self._analysis_messages(content), priority=priority)
+
+        logger.info("News analysis completed")
+        return result
+
+    @staticmethod
+    def _analysis_messages(content: str) -> List[Dict]:
+        return [
+            {
+                "role": "system",
+                "content": """Você é um analista financeiro especializado.
+                Analise a notícia e retorne um JSON com:
+                - summary: resumo conciso em português (max 150 caracteres)
+                - sentiment: "positive", "negative" ou "neutral"
+                - confidence: número entre 0 e 1
+                - key_points: lista de 2-3 pontos principais
+
+                Retorne APENAS o JSON, sem texto adicional."""
+            },
+            {
+                "role": "user",
+                "content": f"Analise esta notícia:\n\n{content}"
+            }
+        ]
+
+    async def analyze_news_batch(
+        self,
+        contents: List[str],
+        priority: Priority = Priority.INTERACTIVE
+    ) -> List[Dict]:
+        """
+        Analyze several news contents, packing cache misses into shared prompts
+
+        Misses the lexicon classifier is confident about are analyzed
+        locally. The rest are sent OPENAI_BATCH_SIZE articles per completion,
+        each tagged with an id; entries missing from or invalid in the
+        returned JSON array are retried one by one through analyze_news.
+        Results keep the order of ``contents``.
+        """
+        results = await self.get_cached_analyses(contents)
+
+        # Clear-cut misses are classified locally; identical contents share one analysis
+        misses: Dict[str, List[int]] = {}
+        local: Dict[str, Dict] = {}
+        for idx, content in enumerate(contents):
+            if results[idx]:
+                continue
+            if content not in local and content not in misses:
+                analysis = self._preclassify(content)
+                if analysis is not None:
+                    local[content] = analysis
+            if content in local:
+                results[idx] = local[content]
+            else:
+                misses.setdefault(content, []).append(idx)
+        if local:
+            await cache_service.set_many({
+                cache_service._generate_key("news_analysis", content): analysis
+                for content, analysis in local.items()
+            })
+
+        pending = list(misses)
+        chunks = [
+            pending[i:i + settings.OPENAI_BATCH_SIZE]
+            for i in range(0, len(pending), settings.OPENAI_BATCH_SIZE)
+        ]
+        batch_results = await asyncio.gather(*(self._analyze_chunk(chunk, priority) for chunk in chunks))
+
+        for chunk, analyses in zip(chunks, batch_results):
+            for content, analysis in zip(chunk, analyses):
+                for idx in misses[content]:
+                    results[idx] = analysis
+
+        return results
+
+    async def _analyze_chunk(self, contents: List[str], priority: Priority) -> List[Dict]:
+        """Analyze up to OPENAI_BATCH_SIZE contents in a single completion"""
+        if len(contents) == 1:
+            return [await self.analyze_news(contents[0], priority)]
+
+        analyses: Dict[int, Dict] = {}
+        try:
+            logger.info(f"Analyzing batch of {len(contents)} news with OpenAI")
+
+            articles = "\n\n".join(
+                f"[ID {idx}]\n{content}" for idx, content in enumerate(contents)
+            )
+            result = await self._complete_json(
+                [
                     {
                         "role": "system",
-                        "content": """Você é um analista financeiro especializado. 
-                        Analise a notícia e retorne um JSON com:
+                        "content": """Você é um analista financeiro especializado.
+                        Você receberá várias notícias, cada uma precedida por [ID n].
+                        Retorne um array JSON com um objeto por notícia contendo:
+                        - id: o número n da notícia
                         - summary: resumo conciso em português (max 150 caracteres)
                         - sentiment: "positive", "negative" ou "neutral"
                         - confidence: número entre 0 e 1
                         - key_points: lista de 2-3 pontos principais
-                        
-                        Retorne APENAS o JSON, sem texto adicional."""
+
+                        Retorne APENAS o array JSON, sem texto adicional."""
                     },
                     {
                         "role": "user",
-                        "content": f"Analise esta notícia:\n\n{content}"
+                        "content": f"Analise estas notícias:\n\n{articles}"
                     }
                 ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+                max_tokens=self.max_tokens * len(contents),
+                priority=priority
             )
-            
-            content_response = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if content_response.startswith("```"):
-                content_response = content_response.split("```")[1]
-                if content_response.startswith("json"):
-                    content_response = content_response[4:]
-            
-            result = json.loads(content_response)
-            
-            # Validate sentiment
-            if result.get("sentiment") not in ["positive", "negative", "neutral"]:
-                result["sentiment"] = "neutral"
-            
-            cache_service.set(cache_key, result)
-            logger.info("News analysis completed")
-            
-            return result
-            
+
+            for entry in result if isinstance(result, list) else []:
+                if not isinstance(entry, dict):
+                    continue
+                idx = entry.pop("id", None)
+                if isinstance(idx, int) and 0 <= idx < len(contents) and self._is_valid_analysis(entry):
+                    analyses[idx] = entry
+
+            await cache_service.set_many({
+                cache_service._generate_key("news_analysis", contents[idx]): analysis
+                for idx, analysis in analyses.items()
+            })
+
+            logger.info(f"Batch analysis completed: {len(analyses)}/{len(contents)} valid")
+
         except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {e}")
-            return self._fallback_analysis(content)
+            logger.error(f"Batch JSON decode error: {e}")
         except Exception as e:
-            logger.error(f"OpenAI analysis error: {e}")
-            return self._fallback_analysis(content)
-    
+            logger.error(f"OpenAI batch analysis error: {e}")
+
+        # Failed or missing entries go through the single-article path
+        retry = [idx for idx in range(len(contents)) if idx not in analyses]
+        retried = await asyncio.gather(*(self.analyze_news(contents[idx], priority) for idx in retry))
+        analyses.update(zip(retry, retried))
+
+        return [analyses[idx] for idx in range(len(contents))]
+
+    @staticmethod
+    def _is_valid_analysis(entry: Dict) -> bool:
+        """Check that an analysis entry has the expected fields and types"""
+        key_points = entry.get("key_points")
+        return (
+            isinstance(entry.get("summary"), str)
+            and entry.get("sentiment") in SENTIMENTS
+            and OpenAIService._is_valid_confidence(entry.get("confidence"))
+            and (key_points is None or isinstance(key_points, list))
+        )
+
     async def generate_market_insights(
-        self, 
-        symbols: List[str], 
+        self,
+        symbols: List[str],
         timeframe: str = "1d"
     ) -> Optional[Dict]:
-        """Generate market insights for given symbols"""
-        cache_key = cache_service._generate_key(
-            "market_insights", 
-            {"symbols": symbols, "timeframe": timeframe}
-        )
-        cached = cache_service.get(cache_key)
-        
-        if cached:
-            return cached
-        
+        """
+        Generate market insights for given symbols
+
+        Each (symbol, timeframe) is analyzed and cached on its own, so
+        watchlists that overlap share work regardless of order or size:
+        only symbols without a cached insight cost a completion, and those
+        run concurrently. The per-symbol insights are then combined locally.
+        """
+        symbols = self.canonical_symbols(symbols)
+        insights = await asyncio.gather(*(
+            self._symbol_insight(symbol, timeframe) for symbol in symbols
+        ))
+        return self._combine_insights(dict(zip(symbols, insights)))
+
+    async def _symbol_insight(self, symbol: str, timeframe: str) -> Dict:
+        """Cached insight for one symbol; the fallback (not cached) if the completion fails"""
         try:
-            logger.info(f"Generating insights for {symbols}")
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """Você é um analista de mercado experiente.
-                        Forneça insights sobre as ações mencionadas e retorne um JSON com:
-                        - summary: análise geral do mercado (max 200 caracteres)
-                        - sentiment: "positive", "negative" ou "neutral"
-                        - confidence: número entre 0 e 1
-                        - recommendations: lista de 2-3 recomendações práticas
-                        
-                        Retorne APENAS o JSON, sem texto adicional."""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analise as seguintes ações para o período {timeframe}: {', '.join(symbols)}"
-                    }
-                ],
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
+            # Concurrent misses for the same symbol share one completion
+            return await cache_service.get_or_compute(
+                self._symbol_insight_key(symbol, timeframe),
+                lambda: self._insights_with_llm(symbol, timeframe),
+                ttl=180  # 3 minutes
             )
-            
-            content_response = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if content_response.startswith("```"):
-                content_response = content_response.split("```")[1]
-                if content_response.startswith("json"):
-                    content_response = content_response[4:]
-            
-            result = json.loads(content_response)
-            
-            # Validate sentiment
-            if result.get("sentiment") not in ["positive", "negative", "neutral"]:
-                result["sentiment"] = "neutral"
-            
-            cache_service.set(cache_key, result, ttl=180)  # 3 minutes
-            logger.info("Market insights generated")
-            
-            return result
-            
         except json.JSONDecodeError as e:
             logger.error(f"JSON decode error: {e}")
-            return self._fallback_insights(symbols)
+            return self._fallback_insights([symbol])
         except Exception as e:
             logger.error(f"OpenAI insights error: {e}")
-            return self._fallback_insights(symbols)
-    
-    def _fallback_analysis(self, content: str) -> Dict:
-        """Fallback analysis when OpenAI fails"""
+            return self._fallback_insights([symbol])
+
+    async def stream_market_insights(self, symbols: List[str], timeframe: str = "1d") -> AsyncIterator[Event]:
+        """
+        generate_market_insights, streamed as it is generated
+
+        A single symbol is streamed field by field as its completion is
+        generated. For several, a ("field", "symbol", insight) event is sent
+        as each symbol's insight becomes available, cached ones first.
+        """
+        symbols = self.canonical_symbols(symbols)
+        if len(symbols) == 1:
+            symbol = symbols[0]
+            async for event in self._stream_json(
+                self._symbol_insight_key(symbol, timeframe),
+                self._insights_messages([symbol], timeframe, await self._symbol_news(symbol)),
+                lambda: self._fallback_insights([symbol]),
+                ttl=180  # 3 minutes, as _symbol_insight
+            ):
+                yield event
+            return
+
+        insights: Dict[str, Dict] = {}
+
+        async def analyze(symbol: str):
+            return symbol, await self._symbol_insight(symbol, timeframe)
+
+        tasks = [asyncio.create_task(analyze(symbol)) for symbol in symbols]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                symbol, insight = await completed
+                insights[symbol] = insight
+                yield "field", "symbol", {"symbol": symbol, **insight}
+        finally:
+            for task in tasks:
+                task.cancel()
+        yield "done", None, self._combine_insights({symbol: insights[symbol] for symbol in symbols})
+
+    @staticmethod
+    def canonical_symbols(symbols: List[str]) -> List[str]:
+        """Uppercased, deduplicated and sorted: the same watchlist in any order is one set"""
+        return sorted({symbol.strip().upper() for symbol in symbols if symbol.strip()})
+
+    @staticmethod
+    def _symbol_insight_key(symbol: str, timeframe: str) -> str:
+        return cache_service._generate_key("symbol_insight", {"symbol": symbol, "timeframe": timeframe})
+
+    def _combine_insights(self, insights: Dict[str, Dict]) -> Dict:
+        """
+        Merge per-symbol insights without another completion
+
+        Sentiment is the confidence-weighted majority; confidence is the
+        weight behind it per symbol, so disagreement lowers it.
+        Recommendations are taken round-robin across symbols.
+        """
+        if not insights:
+            return self._fallback_insights([])
+        if len(insights) == 1:
+            return next(iter(insights.values()))
+
+        weights = {sentiment: 0.0 for sentiment in SENTIMENTS}
+        for insight in insights.values():
+            sentiment = insight.get("sentiment")
+            weights[sentiment if sentiment in weights else "neutral"] += insight.get("confidence", 0.5)
+        sentiment = max(weights, key=weights.get)
+
+        recommendations = [insight.get("recommendations") or [] for insight in insights.values()]
+        merged = list(dict.fromkeys(
+            recommendation
+            for round_ in itertools.zip_longest(*recommendations)
+            for recommendation in round_
+            if recommendation
+        ))
+
         return {
-            "summary": content[:150] + "..." if len(content) > 150 else content,
-            "sentiment": "neutral",
-            "confidence": 0.5,
-            "key_points": ["Análise automática indisponível"]
+            "summary": " ".join(
+                f"{symbol}: {insight.get('summary', '')}" for symbol, insight in insights.items()
+            ),
+            "sentiment": sentiment,
+            "confidence": round(weights[sentiment] / len(insights), 3),
+            "recommendations": merged[:max(3, len(insights))]
         }
-    
+
+    async def _insights_with_llm(self, symbol: str, timeframe: str) -> Dict:
+        """Market insights completion for one symbol"""
+        logger.info(f"Generating insights for {symbol}")
+
+        news = await self._symbol_news(symbol)
+        result = await self._complete_json(self._insights_messages([symbol], timeframe, news))
+
+        logger.info("Market insights generated")
+        return result
+
+    async def _symbol_news(self, symbol: str) -> List[Dict]:
+        """Latest stored articles mentioning the symbol, from the store's symbol index"""
+        if not settings.INSIGHTS_CONTEXT_ARTICLES:
+            return []
+        try:
+            articles, _ = await article_store.list(symbol=symbol, limit=settings.INSIGHTS_CONTEXT_ARTICLES)
+            return articles
+        except Exception as e:
+            logger.error(f"Error loading news for insights: {e}")
+            return []
+
+    @staticmethod
+    def _insights_messages(symbols: List[str], timeframe: str, news: Optional[List[Dict]] = None) -> List[Dict]:
+        prompt = f"Analise as seguintes ações para o período {timeframe}: {', '.join(symbols)}"
+        if news:
+            headlines = "\n".join(
+                f"- {article['published_at'][:10]} [{', '.join(article.get('symbols') or [])}] "
+                f"{article.get('title', '')} (sentimento: {(article.get('analysis') or {}).get('sentiment', 'neutral')})"
+                for article in news
+            )
+            prompt += f"\n\nNotícias recentes sobre esses ativos:\n{headlines}"
+        return [
+            {
+                "role": "system",
+                "content": """Você é um analista de mercado experiente.
+                Forneça insights sobre as ações mencionadas e retorne um JSON com:
+                - summary: análise geral do mercado (max 200 caracteres)
+                - sentiment: "positive", "negative" ou "neutral"
+                - confidence: número entre 0 e 1
+                - recommendations: lista de 2-3 recomendações práticas
+
+                Retorne APENAS o JSON, sem texto adicional."""
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _fallback_analysis(self, content: str) -> Dict:
+        """Fallback analysis when OpenAI fails: the lexicon classifier's best guess"""
+        return self._local_analysis(
+            content,
+            sentiment_classifier.classify(content),
+            key_points=["Análise automática indisponível"],
+            method="fallback"
+        )
+
     def _fallback_insights(self, symbols: List[str]) -> Dict:
         """Fallback insights when OpenAI fails"""
         return {
@@ -0,0 +1,49 @@
+import heapq
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Compute = Callable[[], Awaitable[Any]]
+
+
+class AccessTracker:
+    """
+    Bounded access-frequency table for cache keys
+
+    Remembers how to recompute each tracked key so the hottest ones can be
+    refreshed before they go stale. Counts are halved on every decay() so
+    ranking follows recent traffic; once the table is full the coldest half
+    is dropped.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._entries: Dict[str, List[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, key: str, compute: Compute, ttl: Optional[int]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] = compute
+            return
+
+        if len(self._entries) >= self.max_keys:
+            self._prune(self.max_keys // 2)
+        self._entries[key] = [1, compute, ttl]
+
+    def hottest(self, count: int) -> List[Tuple[str, Compute, Optional[int]]]:
+        """Most accessed keys first"""
+        top = heapq.nlargest(count, self._entries.items(), key=lambda item: item[1][0])
+        return [(key, compute, ttl) for key, (_, compute, ttl) in top]
+
+    def decay(self):
+        for key in list(self._entries):
+            entry = self._entries[key]
+            entry[0] //= 2
+            if entry[0] == 0:
+                del self._entries[key]
+
+    def _prune(self, keep: int):
+        top = heapq.nlargest(keep, self._entries.items(), key=lambda item: item[1][0])
+        self._entries = dict(top)
@@ -1,28 +1,140 @@
+import re
+import time
 import httpx
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import timed
+from app.services.circuit_breaker import CircuitOpenError, circuit_breakers
+from app.services.singleflight import single_flight
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+MAX_AGE = re.compile(r"max-age=(\d+)")
 
 
 class SearchService:
     """Service for searching real news from external APIs"""
     
+    CATEGORY_QUERIES = {
+        "market": "stock market OR financial markets",
+        "tech": "technology stocks OR tech companies",
+        "crypto": "cryptocurrency OR bitcoin OR ethereum",
+        "commodities": "commodities OR oil OR gold"
+    }
+    
     def __init__(self):
         self.news_api_key = settings.NEWS_API_KEY
-        self.news_api_url = "https://newsapi.org/v2/everything"
+        self.news_api_url = settings.NEWS_API_URL
+        self.client: Optional[httpx.AsyncClient] = None
+        # Upstream responses by query: (fresh until, ETag, Last-Modified, body)
+        self._responses: "OrderedDict[str, Tuple[float, Optional[str], Optional[str], Dict]]" = OrderedDict()
+        self.counters = {"requests": 0, "cache_hits": 0, "not_modified": 0, "stale_served": 0}
+        # Fails polls fast while NewsAPI errors or times out
+        self.breaker = circuit_breakers.register("newsapi", (httpx.HTTPError,))
+    
+    async def start(self):
+        """Open the shared keep-alive connection pool"""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=settings.NEWS_API_HTTP2 and HTTP2_AVAILABLE,
+                timeout=settings.NEWS_API_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=settings.NEWS_API_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.NEWS_API_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.NEWS_API_KEEPALIVE_EXPIRY
+                )
+            )
+    
+    async def close(self):
+        """Close the shared connection pool"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+    
+    async def _get_json(self, params: Dict) -> Dict:
+        """
+        GET the NewsAPI endpoint through the shared client and response cache
+
+        Fresh responses are served from memory. Stale ones are revalidated
+        with If-None-Match / If-Modified-Since, so an unchanged result costs
+        an empty 304 instead of a full download. While the circuit breaker is
+        open, stale responses are served as they are.
+        """
+        key = urlencode(sorted((k, v) for k, v in params.items() if k != "apiKey"))
+        cached = self._responses.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.counters["cache_hits"] += 1
+            self._responses.move_to_end(key)
+            return cached[3]
+        if cached and not self.breaker.allow():
+            self.counters["stale_served"] += 1
+            return cached[3]
+        return await single_flight.do(
+            f"newsapi:{key}",
+            lambda: self.breaker.call(lambda: self._fetch(key, params))
+        )
+    
+    @timed("newsapi", "everything")
+    async def _fetch(self, key: str, params: Dict) -> Dict:
+        if self.client is None:
+            await self.start()
+        
+        cached = self._responses.get(key)
+        headers = {}
+        if cached and cached[1]:
+            headers["If-None-Match"] = cached[1]
+        if cached and cached[2]:
+            headers["If-Modified-Since"] = cached[2]
+        
+        self.counters["requests"] += 1
+        response = await self.client.get(self.news_api_url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            self.counters["not_modified"] += 1
+            data = cached[3]
+        else:
+            response.raise_for_status()
+            data = response.json()
+        
+        cache_control = response.headers.get("cache-control", "")
+        if data.get("status") == "ok" and "no-store" not in cache_control:
+            max_age = MAX_AGE.search(cache_control)
+            ttl = int(max_age.group(1)) if max_age else settings.NEWS_API_CACHE_TTL
+            self._responses[key] = (
+                time.monotonic() + ttl,
+                response.headers.get("etag") or (cached and cached[1]),
+                response.headers.get("last-modified") or (cached and cached[2]),
+                data
+            )
+            self._responses.move_to_end(key)
+            while len(self._responses) > settings.NEWS_API_CACHE_MAX_ENTRIES:
+                self._responses.popitem(last=False)
+        return data
     
     async def search_financial_news(
         self, 
         query: str = "stock market",
         language: str = "en",
-        page_size: int = 5
+        page_size: int = 5,
+        fallback: bool = True
     ) -> List[Dict]:
-        """Search financial news using NewsAPI"""
+        """
+        Search financial news using NewsAPI
+
+        When NewsAPI can't be used, returns mock news, or an empty list with
+        ``fallback=False`` (callers that persist what they get).
+        """
         
         if not self.news_api_key:
             logger.warning("NewsAPI key not configured, using fallback")
-            return self._get_fallback_news(query)
+            return self._fallback(query, fallback)
         
         try:
             # Calculate date range (last 7 days)
@@ -39,56 +151,56 @@ class SearchService:
                 "apiKey": self.news_api_key
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.news_api_url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
+            data = await self._get_json(params)
+            
+            if data.get("status") == "ok":
+                articles = data.get("articles", [])
+                logger.info(f"Found {len(articles)} articles for query: {query}")
                 
-                if data.get("status") == "ok":
-                    articles = data.get("articles", [])
-                    logger.info(f"Found {len(articles)} articles for query: {query}")
-                    
-                    return [
-                        {
-                            "title": article.get("title", ""),
-                            "description": article.get("description", ""),
-                            "content": article.get("content", ""),
-                            "source": article.get("source", {}).get("name", "Unknown"),
-                            "url": article.get("url", ""),
-                            "published_at": article.get("publishedAt", ""),
-                            "image_url": article.get("urlToImage")
-                        }
-                        for article in articles
-                        if article.get("title") and article.get("description")
-                    ]
-                else:
-                    logger.error(f"NewsAPI error: {data.get('message')}")
-                    return self._get_fallback_news(query)
+                return [
+                    self.parse_article(article)
+                    for article in articles
+                    if article.get("title") and article.get("description")
+                ]
+            else:
+                logger.error(f"NewsAPI error: {data.get('message')}")
+                return self._fallback(query, fallback)
                     
+        except CircuitOpenError:
+            logger.warning("NewsAPI circuit open, using fallback")
+            return self._fallback(query, fallback)
         except httpx.TimeoutException:
             logger.error("NewsAPI timeout")
-            return self._get_fallback_news(query)
+            return self._fallback(query, fallback)
         except Exception as e:
             logger.error(f"Error searching news: {e}")
-            return self._get_fallback_news(query)
+            return self._fallback(query, fallback)
+    
+    @staticmethod
+    def parse_article(article: Dict) -> Dict:
+        """Convert a raw NewsAPI article to the internal format"""
+        return {
+            "title": article.get("title", ""),
+            "description": article.get("description", ""),
+            "content": article.get("content", ""),
+            "source": article.get("source", {}).get("name", "Unknown"),
+            "url": article.get("url", ""),
+            "published_at": article.get("publishedAt", ""),
+            "image_url": article.get("urlToImage")
+        }
     
     async def search_by_symbols(self, symbols: List[str]) -> List[Dict]:
         """Search news for specific stock symbols"""
         query = " OR ".join(symbols)
         return await self.search_financial_news(query=query, page_size=10)
     
-    async def search_by_category(self, category: str) -> List[Dict]:
+    async def search_by_category(self, category: str, page_size: int = 5, fallback: bool = True) -> List[Dict]:
         """Search news by category"""
-        category_queries = {
-            "market": "stock market OR financial markets",
-            "tech": "technology stocks OR tech companies",
-            "crypto": "cryptocurrency OR bitcoin OR ethereum",
-            "commodities": "commodities OR oil OR gold"
-        }
-        
-        query = category_queries.get(category, "financial news")
-        return await self.search_financial_news(query=query)
+        query = self.CATEGORY_QUERIES.get(category, "financial news")
+        return await self.search_financial_news(query=query, page_size=page_size, fallback=fallback)
+
+    def _fallback(self, query: str, fallback: bool) -> List[Dict]:
+        return self._get_fallback_news(query) if fallback else []
     
     def _get_fallback_news(self, query: str) -> List[Dict]:
         """Fallback news when API is not available"""
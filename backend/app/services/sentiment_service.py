@@ -0,0 +1,137 @@
+import math
+from typing import Dict, List, NamedTuple, Tuple
+from app.models.schemas import SentimentType
+from app.services.dedup_service import normalize
+
+# Financial-news lexicon, Portuguese and English. Terms are matched on
+# normalized text (lowercase, no accents or punctuation); weight 2 marks
+# unambiguous, strong moves.
+POSITIVE_TERMS = {
+    # English
+    "surge": 2, "surges": 2, "surged": 2, "soar": 2, "soars": 2, "soared": 2,
+    "rally": 1, "rallies": 1, "rallied": 1, "jump": 1, "jumps": 1, "jumped": 1,
+    "gain": 1, "gains": 1, "gained": 1, "rise": 1, "rises": 1, "rose": 1,
+    "climb": 1, "climbs": 1, "climbed": 1, "rebound": 1, "rebounds": 1, "rebounded": 1,
+    "beat": 1, "beats": 1, "tops estimates": 2, "beat estimates": 2, "beats estimates": 2,
+    "better than expected": 2, "record high": 2, "all time high": 2,
+    "upgrade": 2, "upgrades": 2, "upgraded": 2, "outperform": 1, "outperformed": 1,
+    "bullish": 2, "boom": 1, "profit": 1, "profits": 1, "profitable": 1,
+    "growth": 1, "strong": 1, "stronger": 1, "robust": 1, "optimism": 1, "optimistic": 1,
+    "recovery": 1, "exceeded": 1, "exceeds": 1, "raises guidance": 2, "raised guidance": 2,
+    "buyback": 1, "approval": 1, "approved": 1, "breakthrough": 1,
+    # Portuguese
+    "alta": 1, "altas": 1, "em alta": 1, "sobe": 1, "sobem": 1, "subiu": 1, "subiram": 1,
+    "dispara": 2, "disparam": 2, "disparou": 2, "dispararam": 2,
+    "avanca": 1, "avancam": 1, "avancou": 1, "avancaram": 1, "ganho": 1, "ganhos": 1,
+    "valoriza": 1, "valorizam": 1, "valorizou": 1, "valorizacao": 1,
+    "lucro": 1, "lucros": 1, "lucro recorde": 2, "alta recorde": 2, "maxima historica": 2,
+    "crescimento": 1, "cresce": 1, "cresceu": 1, "supera": 1, "superam": 1, "superou": 1,
+    "acima das estimativas": 2, "acima do esperado": 2, "melhor que o esperado": 2,
+    "melhores que o esperado": 2,
+    "otimismo": 1, "otimista": 1, "otimistas": 1, "recuperacao": 1, "forte": 1, "fortes": 1,
+    "positivo": 1, "positivos": 1, "positiva": 1, "impulsiona": 1, "impulsionado": 1,
+    "impulsionados": 1, "impulsionadas": 1, "eleva": 1, "elevou": 1, "melhora": 1,
+}
+
+NEGATIVE_TERMS = {
+    # English
+    "plunge": 2, "plunges": 2, "plunged": 2, "tumble": 2, "tumbles": 2, "tumbled": 2,
+    "slump": 2, "slumps": 2, "slumped": 2, "crash": 2, "crashes": 2, "crashed": 2,
+    "fall": 1, "falls": 1, "fell": 1, "drop": 1, "drops": 1, "dropped": 1,
+    "decline": 1, "declines": 1, "declined": 1, "sink": 1, "sinks": 1, "sank": 1,
+    "loss": 1, "losses": 1, "miss": 1, "misses": 1, "missed": 1, "missed estimates": 2,
+    "worse than expected": 2, "downgrade": 2, "downgrades": 2, "downgraded": 2,
+    "underperform": 1, "bearish": 2, "recession": 2, "layoff": 1, "layoffs": 1,
+    "bankruptcy": 2, "bankrupt": 2, "default": 1, "fraud": 2, "lawsuit": 1,
+    "investigation": 1, "probe": 1, "warning": 1, "warns": 1, "warned": 1, "cuts guidance": 2,
+    "cut guidance": 2, "lowers guidance": 2, "weak": 1, "weaker": 1, "slowdown": 1,
+    "fear": 1, "fears": 1, "concern": 1, "concerns": 1, "selloff": 2, "sell off": 2,
+    "crisis": 2, "scandal": 2, "volatility": 1, "uncertainty": 1,
+    # Portuguese
+    "queda": 1, "quedas": 1, "queda forte": 2, "cai": 1, "caem": 1, "caiu": 1, "cairam": 1,
+    "despenca": 2, "despencam": 2, "despencou": 2, "despencaram": 2, "desaba": 2, "desabou": 2,
+    "recua": 1, "recuam": 1, "recuou": 1, "recuaram": 1, "recuo": 1,
+    "perda": 1, "perdas": 1, "prejuizo": 2, "prejuizos": 2, "baixa": 1, "em baixa": 1,
+    "desvaloriza": 1, "desvalorizou": 1, "desvalorizacao": 1, "recessao": 2, "crise": 2,
+    "demissoes": 1, "falencia": 2, "calote": 2, "fraude": 2, "investigacao": 1,
+    "temor": 1, "temores": 1, "preocupacao": 1, "preocupacoes": 1, "pessimismo": 1,
+    "fraco": 1, "fraca": 1, "fracos": 1, "fracas": 1, "negativo": 1, "negativa": 1,
+    "abaixo das estimativas": 2, "abaixo do esperado": 2, "pior que o esperado": 2,
+    "piores que o esperado": 2,
+    "rebaixa": 2, "rebaixou": 2, "rebaixamento": 2, "volatilidade": 1, "incerteza": 1,
+}
+
+# A negator flips the polarity of terms in the next few words ("not strong",
+# "nao supera")
+NEGATORS = {"not", "no", "never", "without", "nao", "nem", "sem", "nunca"}
+NEGATION_SCOPE = 3
+
+LEXICON: Dict[Tuple[str, ...], float] = {
+    **{tuple(term.split()): float(weight) for term, weight in POSITIVE_TERMS.items()},
+    **{tuple(term.split()): -float(weight) for term, weight in NEGATIVE_TERMS.items()},
+}
+MAX_TERM_WORDS = max(len(term) for term in LEXICON)
+
+EVIDENCE_SCALE = 3.0  # matched weight at which evidence counts ~63% towards confidence
+MIN_POLARITY = 0.2  # below this net agreement the signals are mixed: neutral
+
+
+class SentimentScore(NamedTuple):
+    sentiment: SentimentType
+    confidence: float
+    positive: float  # matched positive weight
+    negative: float  # matched negative weight
+    terms: List[str]
+
+
+class SentimentClassifier:
+    """
+    Lexicon sentiment classifier for financial news (Portuguese and English)
+
+    Matches weighted terms of up to MAX_TERM_WORDS words, longest first,
+    flipping terms shortly after a negator. Confidence grows with how one-
+    sided the matched weight is and with how much of it there is: no
+    matches or mixed signals give neutral at 0.5, a few strong terms all
+    pointing the same way approach 1.
+    """
+
+    def classify(self, text: str) -> SentimentScore:
+        words = normalize(text).split()
+        positive = negative = 0.0
+        terms: List[str] = []
+        negated_until = -1
+        position = 0
+        while position < len(words):
+            if words[position] in NEGATORS:
+                negated_until = position + NEGATION_SCOPE
+                position += 1
+                continue
+            for size in range(min(MAX_TERM_WORDS, len(words) - position), 0, -1):
+                term = tuple(words[position:position + size])
+                weight = LEXICON.get(term)
+                if weight is None:
+                    continue
+                if position <= negated_until:
+                    weight = -weight
+                if weight > 0:
+                    positive += weight
+                else:
+                    negative -= weight
+                terms.append(" ".join(term))
+                position += size
+                break
+            else:
+                position += 1
+
+        total = positive + negative
+        polarity = (positive - negative) / total if total else 0.0
+        if abs(polarity) < MIN_POLARITY:
+            return SentimentScore(SentimentType.NEUTRAL, 0.5, positive, negative, terms)
+
+        evidence = 1 - math.exp(-total / EVIDENCE_SCALE)
+        confidence = 0.5 + 0.5 * abs(polarity) * evidence
+        sentiment = SentimentType.POSITIVE if polarity > 0 else SentimentType.NEGATIVE
+        return SentimentScore(sentiment, round(confidence, 3), positive, negative, terms)
+
+
+sentiment_classifier = SentimentClassifier()
@@ -0,0 +1,216 @@
+import asyncio
+import time
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.article_store import article_store
+from app.services.news_events import news_events
+
+# Bucket width, in seconds, of each resolution
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+POLARITY = {"positive": 1.0, "negative": -1.0, "neutral": 0.0}
+LOAD_PAGE = 10000  # articles read from the store per query while loading
+
+
+class Buckets:
+    """
+    Ring of fixed-width time buckets, one typed array per column
+
+    A slot holds the bucket number it was last written for, so stale slots
+    read as empty and no sweep is needed when time moves on. Reading or
+    writing a bucket is O(1).
+    """
+
+    __slots__ = ("width", "size", "bucket", "positive", "negative", "neutral", "score", "confidence")
+
+    def __init__(self, width: int, size: int):
+        self.width = width
+        self.size = size
+        self.bucket = array("q", [-1]) * size
+        self.positive = array("L", [0]) * size
+        self.negative = array("L", [0]) * size
+        self.neutral = array("L", [0]) * size
+        self.score = array("d", [0.0]) * size  # sum of polarity x confidence
+        self.confidence = array("d", [0.0]) * size  # sum of confidence
+
+    def add(self, timestamp: float, sentiment: str, confidence: float) -> bool:
+        """Count an analyzed article; False if it is older than the ring keeps"""
+        bucket = int(timestamp // self.width)
+        slot = bucket % self.size
+        if self.bucket[slot] != bucket:
+            if self.bucket[slot] > bucket:
+                return False
+            self.bucket[slot] = bucket
+            self.positive[slot] = self.negative[slot] = self.neutral[slot] = 0
+            self.score[slot] = self.confidence[slot] = 0.0
+
+        counts = self.positive if sentiment == "positive" else self.negative if sentiment == "negative" else self.neutral
+        counts[slot] += 1
+        self.score[slot] += POLARITY.get(sentiment, 0.0) * confidence
+        self.confidence[slot] += confidence
+        return True
+
+    def point(self, bucket: int) -> Dict[str, Any]:
+        slot = bucket % self.size
+        start = datetime.fromtimestamp(bucket * self.width, timezone.utc)
+        if self.bucket[slot] != bucket:
+            return {
+                "timestamp": start, "count": 0, "positive": 0, "negative": 0, "neutral": 0,
+                "score": 0.0, "confidence": None
+            }
+
+        count = self.positive[slot] + self.negative[slot] + self.neutral[slot]
+        confidence = self.confidence[slot]
+        return {
+            "timestamp": start,
+            "count": count,
+            "positive": self.positive[slot],
+            "negative": self.negative[slot],
+            "neutral": self.neutral[slot],
+            # Confidence-weighted mean polarity, from -1 (all negative) to 1
+            "score": round(self.score[slot] / confidence, 4) if confidence else 0.0,
+            "confidence": round(confidence / count, 4)
+        }
+
+
+class SentimentTimeseries:
+    """
+    Rolling sentiment aggregates of analyzed news, per category and symbol
+
+    Every stored article is counted once into 1m/1h/1d buckets of the
+    overall series, its category's and each of its symbols', as soon as
+    its analysis is no longer the pending fallback. Updates come
+    from the news event broker (articles ingested by this or, through
+    Redis, another process); on start the buckets are filled from the store
+    in pages. Queries only read buckets, never articles.
+    """
+
+    def __init__(self):
+        self._series: Dict[str, Dict[str, Buckets]] = {}
+        self._loaded_up_to: Optional[int] = None  # ids up to this come from the store
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+        self.counters = {"articles": 0, "expired": 0}
+
+    async def start(self):
+        """Follow new articles and load recent ones from the store in the background"""
+        news_events.add_listener(self._on_event)
+        self._task = asyncio.create_task(self._load())
+
+    async def close(self):
+        news_events.remove_listener(self._on_event)
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _load(self):
+        try:
+            # Articles stored after this point arrive as events
+            self._loaded_up_to = await article_store.last_id()
+            for event in self._pending:
+                self._on_article(event)
+            self._pending.clear()
+
+            retention = max(
+                RESOLUTIONS[resolution] * points
+                for resolution, points in settings.SENTIMENT_TIMESERIES_POINTS.items()
+            )
+            since = datetime.now(timezone.utc) - timedelta(seconds=retention)
+            after = None
+            while True:
+                rows = await article_store.sentiment_points(since, self._loaded_up_to, after, LOAD_PAGE)
+                for _, published_at, category, sentiment, confidence, symbols in rows:
+                    self.add(published_at, category, symbols, sentiment, confidence)
+                if len(rows) < LOAD_PAGE:
+                    break
+                after = (rows[-1][1], rows[-1][0])
+            self.ready = True
+            logger.info(f"Sentiment time series loaded ({self.counters['articles']} articles)")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error loading sentiment time series: {e}")
+            if self._loaded_up_to is None:
+                # Count new articles at least
+                self._loaded_up_to = 0
+                for event in self._pending:
+                    self._on_article(event)
+                self._pending.clear()
+
+    def _on_event(self, event: str, data: Dict[str, Any]):
+        if event not in ("article", "article_updated") or data.get("analysis_pending"):
+            return
+        if event == "article_updated":
+            # Left out of the load while pending: counted when its analysis arrives
+            data = {**data, "reanalyzed": True}
+        if self._loaded_up_to is None:
+            self._pending.append(data)
+        else:
+            self._on_article(data)
+
+    def _on_article(self, item: Dict[str, Any]):
+        if item["id"] <= self._loaded_up_to and not item.get("reanalyzed"):
+            return
+        self.add(
+            datetime.fromisoformat(item["timestamp"]).timestamp(),
+            item["category"],
+            item.get("symbols") or [],
+            item.get("sentiment"),
+            item.get("confidence")
+        )
+
+    def add(
+        self,
+        timestamp: float,
+        category: str,
+        symbols: List[str],
+        sentiment: Optional[str],
+        confidence: Optional[float]
+    ):
+        """Count one analyzed article into every series it belongs to"""
+        if sentiment not in POLARITY or timestamp > time.time() + 60:
+            return
+        confidence = 0.5 if confidence is None else confidence
+        self.counters["articles"] += 1
+        for key in ["all", f"category:{category}"] + [f"symbol:{symbol}" for symbol in symbols]:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    resolution: Buckets(RESOLUTIONS[resolution], points)
+                    for resolution, points in settings.SENTIMENT_TIMESERIES_POINTS.items()
+                }
+            for buckets in series.values():
+                if not buckets.add(timestamp, sentiment, confidence):
+                    self.counters["expired"] += 1
+
+    def query(
+        self,
+        resolution: str,
+        category: Optional[str] = None,
+        symbol: Optional[str] = None,
+        points: int = 24,
+        until: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The last ``points`` buckets up to ``until`` (default now), oldest
+        first; empty buckets are included with zero counts
+        """
+        key = f"symbol:{symbol}" if symbol else f"category:{category}" if category else "all"
+        width = RESOLUTIONS[resolution]
+        points = min(points, settings.SENTIMENT_TIMESERIES_POINTS[resolution])
+        last = int((until.timestamp() if until else time.time()) // width)
+        # Series with no articles yet read as empty
+        buckets = self._series.get(key, {}).get(resolution) or Buckets(width, 1)
+        return [buckets.point(bucket) for bucket in range(last - points + 1, last + 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "series": len(self._series), "ready": self.ready}
+
+
+sentiment_timeseries = SentimentTimeseries()
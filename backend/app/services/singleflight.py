@@ -0,0 +1,56 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Call:
+    """An in-flight computation shared by every caller of the same key"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution
+
+    The first caller starts the work; callers arriving while it runs await
+    the same result instead of repeating it. The shared task is cancelled
+    only when every waiter has gone away (e.g. all clients disconnected).
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+        self.counters = {
+            "executed": 0,
+            "coalesced": 0,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.counters["executed"] += 1
+        else:
+            self.counters["coalesced"] += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,150 @@
+import json
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+
+# Symbol -> names it is mentioned by. An alias written in lowercase matches
+# in any case; anything else (tickers, "Apple", "Vale") only as written, so
+# "apple pie" or "vale a pena" do not count. Extend with SYMBOLS_FILE.
+SYMBOLS: Dict[str, List[str]] = {
+    # US
+    "AAPL": ["AAPL", "Apple"],
+    "MSFT": ["MSFT", "Microsoft"],
+    "GOOGL": ["GOOGL", "GOOG", "Alphabet", "Google"],
+    "AMZN": ["AMZN", "Amazon.com", "Amazon"],
+    "META": ["META", "Meta Platforms", "Facebook"],
+    "TSLA": ["TSLA", "Tesla"],
+    "NVDA": ["NVDA", "Nvidia", "NVIDIA"],
+    "AMD": ["AMD", "Advanced Micro Devices"],
+    "INTC": ["INTC", "Intel"],
+    "NFLX": ["NFLX", "Netflix"],
+    "ORCL": ["ORCL", "Oracle"],
+    "CRM": ["CRM", "Salesforce"],
+    "ADBE": ["ADBE", "Adobe"],
+    "IBM": ["IBM"],
+    "JPM": ["JPM", "JPMorgan", "JP Morgan"],
+    "GS": ["Goldman Sachs"],
+    "BAC": ["Bank of America"],
+    "MS": ["Morgan Stanley"],
+    "BRK.B": ["BRK.B", "Berkshire Hathaway"],
+    "V": ["Visa Inc"],
+    "MA": ["Mastercard"],
+    "WMT": ["WMT", "Walmart"],
+    "KO": ["Coca-Cola"],
+    "DIS": ["Disney"],
+    "BA": ["Boeing"],
+    "XOM": ["XOM", "ExxonMobil", "Exxon Mobil", "Exxon"],
+    "CVX": ["CVX", "Chevron"],
+    "PFE": ["PFE", "Pfizer"],
+    "UBER": ["UBER", "Uber"],
+    "COIN": ["Coinbase"],
+    # Brazil
+    "PETR4": ["PETR4", "PETR3", "Petrobras"],
+    "VALE3": ["VALE3", "Vale S.A.", "mineradora Vale"],
+    "ITUB4": ["ITUB4", "Itaú Unibanco", "Itaú"],
+    "BBDC4": ["BBDC4", "Bradesco"],
+    "BBAS3": ["BBAS3", "Banco do Brasil"],
+    "ABEV3": ["ABEV3", "Ambev"],
+    "WEGE3": ["WEGE3", "WEG"],
+    "MGLU3": ["MGLU3", "Magazine Luiza", "Magalu"],
+    "EMBR3": ["EMBR3", "Embraer"],
+    # Crypto
+    "BTC": ["BTC", "bitcoin"],
+    "ETH": ["ETH", "ethereum"],
+    "SOL": ["solana"],
+    "XRP": ["XRP"],
+    "DOGE": ["DOGE", "dogecoin"],
+}
+
+
+class SymbolMatcher:
+    """
+    Multi-pattern symbol extractor (Aho-Corasick)
+
+    All aliases are compiled into one automaton over lowercased text, so an
+    article is scanned once regardless of dictionary size. Matches must sit
+    on word boundaries; case-sensitive aliases are then checked against the
+    original text.
+    """
+
+    def __init__(self, symbols: Dict[str, List[str]]):
+        # Trie: per node its transitions, failure link and (symbol, alias) outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+        for symbol, aliases in symbols.items():
+            for alias in aliases:
+                self._add(symbol, alias)
+        self._link()
+        self.symbols = sorted(symbols)
+
+    def _add(self, symbol: str, alias: str):
+        node = 0
+        for char in alias.lower():
+            if char not in self._goto[node]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = len(self._goto) - 1
+            node = self._goto[node][char]
+        self._output[node].append((symbol, alias))
+
+    def _link(self):
+        """Breadth-first failure links; outputs inherit their failure node's"""
+        queue = deque(self._goto[0].values())  # depth 1 fails to the root
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def extract(self, text: str) -> List[str]:
+        """Symbols mentioned in text, sorted"""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to several; keep offsets aligned
+            lowered = "".join(char.lower()[:1] for char in text)
+
+        found: Set[str] = set()
+        node = 0
+        for end, char in enumerate(lowered, 1):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for symbol, alias in self._output[node]:
+                if symbol in found:
+                    continue
+                start = end - len(alias)
+                if not self._on_boundary(text, start, end):
+                    continue
+                if alias != alias.lower() and text[start:end] != alias:
+                    continue
+                found.add(symbol)
+        return sorted(found)
+
+    @staticmethod
+    def _on_boundary(text: str, start: int, end: int) -> bool:
+        return (
+            (start == 0 or not text[start - 1].isalnum())
+            and (end == len(text) or not text[end].isalnum())
+        )
+
+
+def load_symbols(path: Optional[str]) -> Dict[str, List[str]]:
+    """Built-in dictionary, extended/overridden by a JSON file of {symbol: [aliases]}"""
+    symbols = dict(SYMBOLS)
+    if path:
+        try:
+            with open(path) as f:
+                symbols.update({symbol.upper(): aliases for symbol, aliases in json.load(f).items()})
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not load symbols file {path}: {e}")
+    return symbols
+
+
+symbol_matcher = SymbolMatcher(load_symbols(settings.SYMBOLS_FILE))
@@ -0,0 +1,120 @@
+"""
+Benchmark: article store queries at scale
+
+Fills a temporary SQLite article store with N synthetic articles, then times
+the lookups behind /api/news and /api/news/{id}/summary: first and deep
+keyset pages per category and per symbol, exact totals and get by id. Query
+plans are printed to confirm every lookup is an index seek.
+
+Usage:
+    python benchmarks/article_store.py --articles 1000000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+CATEGORIES = ["market", "tech", "crypto", "commodities"]
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "BTC", "ETH", "SPY", "QQQ", "USO", "XLE"]
+
+
+def make_articles(start: int, count: int):
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(start)
+    for number in range(start, start + count):
+        yield {
+            "title": f"Notícia sintética {number}",
+            "content": "Conteúdo sintético para benchmark do armazenamento de notícias.",
+            "source": f"Wire {number % 20}",
+            "url": f"https://news.example.com/{number}",
+            "published_at": (base + timedelta(seconds=number * 60)).isoformat(),
+            "category": CATEGORIES[number % len(CATEGORIES)],
+            "symbols": rng.sample(SYMBOLS, 2),
+            "analysis": {"summary": "Resumo", "sentiment": "neutral", "confidence": 0.5},
+        }
+
+
+async def timed(fn, repeat: int = 200):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000, max(samples) * 1000
+
+
+async def run(total: int, batch: int):
+    from app.services.article_store import ArticleStore
+
+    path = Path(tempfile.mkdtemp()) / "articles.db"
+    store = ArticleStore(str(path))
+
+    started = time.perf_counter()
+    for offset in range(0, total, batch):
+        await store.add_many(list(make_articles(offset, min(batch, total - offset))))
+    elapsed = time.perf_counter() - started
+    print(f"Inserted {total} articles in {elapsed:.1f}s ({total / elapsed:,.0f}/s)")
+
+    # Cursor deep into the feed: walk a few pages, then seek from there
+    _, deep_cursor = await store.list("tech", limit=50, offset=total // 8)
+    _, deep_symbol_cursor = await store.list(symbol="NVDA", limit=50, offset=total // 12)
+
+    checks = [
+        ("first page (all)", lambda: store.list(limit=50)),
+        ("first page (category)", lambda: store.list("crypto", limit=50)),
+        ("deep page (category, cursor)", lambda: store.list("tech", limit=50, cursor=deep_cursor)),
+        ("first page (symbol)", lambda: store.list(symbol="AAPL", limit=50)),
+        ("deep page (symbol, cursor)", lambda: store.list(symbol="NVDA", limit=50, cursor=deep_symbol_cursor)),
+        ("total (all)", lambda: store.count()),
+        ("total (category)", lambda: store.count("market")),
+        ("total (symbol)", lambda: store.count(symbol="BTC")),
+        ("get by id", lambda: store.get(random.randint(1, total))),
+    ]
+    print(f"\n{'query':<30} {'median':>10} {'max':>10}")
+    for name, fn in checks:
+        median, worst = await timed(fn)
+        print(f"{name:<30} {median:8.3f}ms {worst:8.3f}ms")
+
+    conn = store._connect()
+    print("\nQuery plans:")
+    for sql, params in [
+        (
+            "SELECT id FROM articles WHERE category = ? AND (published_at, id) < (?, ?) "
+            "ORDER BY published_at DESC, id DESC LIMIT 50",
+            ("tech", 1e12, 1 << 62)
+        ),
+        (
+            "SELECT a.id FROM article_symbols s JOIN articles a ON a.id = s.article_id "
+            "WHERE s.symbol = ? ORDER BY s.published_at DESC, s.article_id DESC LIMIT 50",
+            ("AAPL",)
+        ),
+    ]:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        print(" | ".join(row[-1] for row in plan))
+
+    await store.close()
+    print(f"\nDatabase size: {path.stat().st_size / 1024 / 1024:.1f} MiB ({path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.articles, args.batch))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: single-article vs batched news analysis
+
+Runs the same set of articles through OpenAIService.analyze_news (one
+completion per article, issued concurrently) and analyze_news_batch (articles
+packed OPENAI_BATCH_SIZE per prompt) against the local fake OpenAI server, and
+reports upstream calls, tokens per article and wall-clock latency.
+
+Usage:
+    python benchmarks/batch_analysis.py --articles 50 --latency 1.0
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9101
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+os.environ["SENTIMENT_PRECLASSIFIER_ENABLED"] = "false"  # every analysis needs a completion
+sys.path.insert(0, str(BACKEND_DIR))
+
+SAMPLE = (
+    "Os mercados globais registraram ganhos significativos hoje, impulsionados "
+    "por dados econômicos melhores que o esperado. O índice S&P 500 subiu 1.2%, "
+    "enquanto o Nasdaq avançou 1.5%. Investidores demonstram otimismo com os "
+    "resultados corporativos."
+)
+
+
+def make_articles(count: int):
+    # Unique suffix so nothing is served from a warm Redis cache
+    run_id = uuid.uuid4().hex[:8]
+    return [f"{SAMPLE} (ref {run_id}-{i})" for i in range(count)]
+
+
+async def fake_stats(client):
+    return (await client.get(f"{FAKE_OPENAI_URL}/stats")).json()
+
+
+async def measure(name, articles, analyze):
+    async with httpx.AsyncClient() as client:
+        await client.post(f"{FAKE_OPENAI_URL}/reset")
+        started = time.perf_counter()
+        results = await analyze(articles)
+        elapsed = time.perf_counter() - started
+        stats = await fake_stats(client)
+
+    tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+    print(
+        f"{name:<8} articles={len(results):<4} calls={stats['calls']:<4} "
+        f"prompt_tokens/article={stats['prompt_tokens'] / len(articles):7.1f}  "
+        f"total_tokens/article={tokens / len(articles):7.1f}  "
+        f"latency={elapsed * 1000:8.1f} ms"
+    )
+
+
+async def run(count: int):
+    from app.services.openai_service import openai_service
+
+    async def single(articles):
+        return await asyncio.gather(*(openai_service.analyze_news(a) for a in articles))
+
+    await measure("single", make_articles(count), single)
+    await measure("batch", make_articles(count), openai_service.analyze_news_batch)
+    await openai_service.close()
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=1.0, help="fake OpenAI latency (s)")
+    args = parser.parse_args()
+
+    fake_openai = subprocess.Popen(
+        [
+            sys.executable, "benchmarks/fake_openai.py",
+            "--port", str(FAKE_OPENAI_PORT),
+            "--latency", str(args.latency)
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        asyncio.run(run(args.articles))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+
+if __name__ == "__main__":
+    main()
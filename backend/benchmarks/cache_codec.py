@@ -0,0 +1,160 @@
+"""
+Benchmark: size and encode/decode time of cached values per codec and size class
+
+Builds cache entries shaped like the ones the services store (one news
+analysis, a symbol's insights, a page of analysed articles, an article
+batch) and encodes each with plain json.dumps, as the cache did before
+the codec, and with every serializer/compression pair installed here.
+Reports the bytes stored per value (MEMORY USAGE when --redis points at a
+Redis server, the blob length otherwise) and the encode and decode time.
+
+Usage:
+    python benchmarks/cache_codec.py
+    python benchmarks/cache_codec.py --redis localhost:6379
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "BTC", "ETH", "PETR4", "VALE3"]
+WORDS = (
+    "mercado ações alta queda juros inflação resultado trimestre receita lucro "
+    "guidance dólar petróleo minério demanda oferta investidores analistas"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def analysis(rng: random.Random) -> dict:
+    return {
+        "summary": " ".join(sentence(rng, 14) for _ in range(3)),
+        "sentiment": rng.choice(["positive", "negative", "neutral"]),
+        "confidence": round(rng.random(), 2),
+        "key_points": [sentence(rng, 10) for _ in range(3)],
+        "symbols": rng.sample(SYMBOLS, 2),
+    }
+
+
+def article(rng: random.Random, number: int) -> dict:
+    return {
+        "id": number,
+        "title": sentence(rng, 9),
+        "content": " ".join(sentence(rng, 15) for _ in range(4)),
+        "source": f"Wire {number % 20}",
+        "url": f"https://news.example.com/{number}",
+        "published_at": f"2026-10-{1 + number % 28:02d}T{number % 24:02d}:00:00Z",
+        "category": rng.choice(["market", "tech", "crypto", "commodities"]),
+        "analysis": analysis(rng),
+    }
+
+
+def size_classes():
+    rng = random.Random(25)
+    insights = {
+        "symbol": "AAPL",
+        "timeframe": "1w",
+        "overview": " ".join(sentence(rng, 16) for _ in range(8)),
+        "risks": [sentence(rng, 12) for _ in range(6)],
+        "opportunities": [sentence(rng, 12) for _ in range(6)],
+        "sentiment_history": [{"day": day, "score": round(rng.uniform(-1, 1), 3)} for day in range(30)],
+    }
+    values = {
+        "analysis": analysis(rng),
+        "insights": insights,
+        "news page": [article(rng, number) for number in range(20)],
+        "batch": [article(rng, number) for number in range(200)],
+    }
+    # Wrapped as CacheService stores them
+    return {name: {"value": value, "fresh_until": time.time()} for name, value in values.items()}
+
+
+def per_call(fn, arg, seconds: float = 0.2) -> float:
+    """Best of five runs, in microseconds per call"""
+    count = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(count):
+            fn(arg)
+        if time.perf_counter() - started >= seconds / 5:
+            break
+        count *= 2
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(count):
+            fn(arg)
+        best = min(best, (time.perf_counter() - started) / count)
+    return best * 1e6
+
+
+def codecs(min_compress_bytes: int):
+    """(name, encode, decode) for the old format and each installed codec"""
+    from app.services import cache_codec
+    from app.services.cache_codec import CacheCodec
+
+    yield "json (before)", lambda value: json.dumps(value).encode(), json.loads
+    serializers = ["json", "orjson"] * cache_codec.ORJSON_AVAILABLE + ["msgpack"] * cache_codec.MSGPACK_AVAILABLE
+    compressions = (
+        ["none", "zlib"] + ["zstd"] * cache_codec.ZSTD_AVAILABLE + ["lz4"] * cache_codec.LZ4_AVAILABLE
+    )
+    for serializer in dict.fromkeys(serializers or ["json"]):
+        for compression in compressions:
+            codec = CacheCodec(serializer, compression, min_compress_bytes)
+            yield (
+                f"{serializer}+{compression}",
+                lambda value, codec=codec: codec.encode(value)[0],
+                lambda blob, codec=codec: codec.decode(blob)[0],
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--redis", help="host:port of a Redis server to measure MEMORY USAGE on")
+    parser.add_argument("--min-compress-bytes", type=int, default=1024)
+    args = parser.parse_args()
+
+    client = None
+    if args.redis:
+        import redis
+
+        host, port = args.redis.rsplit(":", 1)
+        client = redis.Redis(host=host, port=int(port))
+        client.ping()
+
+    classes = size_classes()
+    sizes = {name: len(json.dumps(entry)) for name, entry in classes.items()}
+    print("Size classes (json): " + ", ".join(f"{name} {size / 1024:.1f} KiB" for name, size in sizes.items()))
+    print(f"Stored bytes: {'Redis MEMORY USAGE' if client else 'blob length'}\n")
+    print(f"{'size class':<11} {'codec':<15} {'stored':>10} {'ratio':>6} {'encode':>10} {'decode':>10}")
+
+    for name, entry in classes.items():
+        for codec_name, encode, decode in codecs(args.min_compress_bytes):
+            blob = encode(entry)
+            assert decode(blob) == entry
+            stored = len(blob)
+            if client:
+                key = f"bench:codec:{codec_name}"
+                client.set(key, blob)
+                stored = client.memory_usage(key)
+                client.delete(key)
+            print(
+                f"{name:<11} {codec_name:<15} {stored:>10,} {stored / sizes[name]:>6.2f} "
+                f"{per_call(encode, entry):>8.1f}µs {per_call(decode, blob):>8.1f}µs"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
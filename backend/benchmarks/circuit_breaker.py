@@ -0,0 +1,118 @@
+"""
+Benchmark: news analysis during an OpenAI outage, with and without the circuit breaker
+
+The local fake OpenAI server answers slower than OPENAI_TIMEOUT, so every
+completion times out. Runs --requests analyses, --concurrency at a time,
+with the breaker disabled and then enabled, and reports the latency until
+each caller got its (fallback) analysis and the completions attempted.
+
+Usage:
+    python benchmarks/circuit_breaker.py --requests 40 --concurrency 4
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9106
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+os.environ["REDIS_PORT"] = "1"  # in-process cache only
+os.environ["SENTIMENT_PRECLASSIFIER_ENABLED"] = "false"  # every analysis needs a completion
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def outage(name: str, requests: int, concurrency: int):
+    from app.services.openai_service import openai_service
+
+    run = uuid.uuid4().hex[:8]
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def analyze(number: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await openai_service.analyze_news(f"Notícia {run}-{number} sobre o mercado financeiro.")
+            latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient() as fake:
+        await fake.post(f"{FAKE_OPENAI_URL}/reset")
+        started = time.perf_counter()
+        await asyncio.gather(*(analyze(number) for number in range(requests)))
+        elapsed = time.perf_counter() - started
+        stats = (await fake.get(f"{FAKE_OPENAI_URL}/stats")).json()
+
+    latencies.sort()
+    print(
+        f"{name:<8} {statistics.median(latencies) * 1000:>9.0f}ms "
+        f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:>9.0f}ms {elapsed:>9.1f}s {stats['calls']:>9}"
+    )
+
+
+async def run(requests: int, concurrency: int):
+    from app.services.cache_service import cache_service
+    from app.services.openai_service import openai_service
+
+    logging.getLogger("finmarket").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await cache_service.start()
+
+    print(f"{'breaker':<8} {'p50':>11} {'p95':>11} {'total':>10} {'upstream':>9}")
+    openai_service.breaker.enabled = False
+    await outage("off", requests, concurrency)
+    openai_service.breaker.enabled = True
+    await outage("on", requests, concurrency)
+    print(f"\nBreaker stats: {openai_service.breaker.stats()}")
+
+    await openai_service.close()
+    await cache_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=1.0, help="OPENAI_TIMEOUT during the outage (s)")
+    args = parser.parse_args()
+    os.environ["OPENAI_TIMEOUT"] = str(args.timeout)
+
+    fake_openai = subprocess.Popen(
+        [sys.executable, "benchmarks/fake_openai.py", "--port", str(FAKE_OPENAI_PORT), "--latency", "60"],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        asyncio.run(run(args.requests, args.concurrency))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark: LLM analyses saved by near-duplicate clustering
+
+Replays recorded NewsAPI responses through the same deduplication the
+ingestion service runs (article key, then content hash / MinHash clusters)
+and reports how many analyses and LLM calls it saves. Record a sample first
+with a real NEWS_API_KEY; each run appends one poll of every category.
+
+Usage:
+    python benchmarks/dedup_report.py --record samples/newsapi.json
+    python benchmarks/dedup_report.py samples/newsapi.json --threshold 0.6 0.7 0.8
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def record(path: Path, page_size: int):
+    """Append one raw NewsAPI response per category to ``path``"""
+    import httpx
+    from app.core.config import settings
+    from app.services.search_service import SearchService
+
+    if not settings.NEWS_API_KEY:
+        sys.exit("NEWS_API_KEY is not configured")
+
+    polls = json.loads(path.read_text()) if path.exists() else []
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        for category, query in SearchService.CATEGORY_QUERIES.items():
+            response = await client.get(settings.NEWS_API_URL, params={
+                "q": query,
+                "language": "en",
+                "sortBy": "publishedAt",
+                "pageSize": page_size,
+                "apiKey": settings.NEWS_API_KEY
+            })
+            response.raise_for_status()
+            polls.append({"category": category, "response": response.json()})
+            print(f"{category}: {len(response.json().get('articles', []))} articles")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(polls))
+    print(f"Recorded {len(polls)} responses in {path}")
+
+
+def load_articles(paths):
+    """Articles in ingestion order from recorded responses"""
+    from app.services.search_service import SearchService
+
+    for path in paths:
+        polls = json.loads(Path(path).read_text())
+        if isinstance(polls, dict):
+            polls = [{"response": polls}]
+        for poll in polls:
+            for article in poll["response"].get("articles", []):
+                if article.get("title") and article.get("description"):
+                    yield SearchService.parse_article(article)
+
+
+def report(articles, threshold: float, batch_size: int, show: int):
+    from app.services.article_store import ArticleStore
+    from app.services.dedup_service import NearDuplicateIndex, signature
+
+    keys, digests = set(), set()
+    index = NearDuplicateIndex(threshold)
+    clusters = []
+    exact = 0
+    for article in articles:
+        key = ArticleStore.article_key(article)
+        if key in keys:
+            continue
+        keys.add(key)
+
+        digest, minhash_signature = signature(article)
+        exact += digest in digests
+        digests.add(digest)
+        cluster = index.find(digest, minhash_signature)
+        if cluster is None:
+            index.add(len(clusters), digest, minhash_signature)
+            clusters.append([article])
+        else:
+            clusters[cluster].append(article)
+
+    unique = len(keys)
+    analyses = len(clusters)
+    print(f"\nthreshold {threshold}")
+    print(f"  unique articles (by URL):   {unique}")
+    print(f"  exact content duplicates:   {exact}")
+    print(f"  near-duplicates clustered:  {unique - analyses - exact}")
+    print(f"  analyses without / with:    {unique} / {analyses} "
+          f"({(unique - analyses) / max(unique, 1):.1%} saved)")
+    print(f"  LLM calls without / with:   {math.ceil(unique / batch_size)} / "
+          f"{math.ceil(analyses / batch_size)} (batches of {batch_size})")
+
+    for members in sorted(clusters, key=len, reverse=True)[:show]:
+        if len(members) < 2:
+            break
+        print(f"  [{len(members)}] " + " | ".join(
+            f"{member['source']}: {member['title'][:60]}" for member in members[:4]
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("samples", nargs="*", help="recorded NewsAPI responses (JSON)")
+    parser.add_argument("--record", type=Path, help="poll NewsAPI and append to this file")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--threshold", type=float, nargs="+")
+    parser.add_argument("--show", type=int, default=5, help="largest clusters to print")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.page_size))
+        return
+    if not args.samples:
+        parser.error("pass recorded samples or --record")
+
+    from app.core.config import settings
+
+    articles = list(load_articles(args.samples))
+    print(f"Loaded {len(articles)} articles from {len(args.samples)} file(s)")
+    for threshold in args.threshold or [settings.DEDUP_SIMILARITY]:
+        report(articles, threshold, settings.OPENAI_BATCH_SIZE, args.show)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Local fake NewsAPI server for tests and benchmarks
+
+Serves GET /v2/everything in NewsAPI's response format. Every poll of a
+query returns the latest --page-size articles of a feed that grows by
+--new-per-poll articles per call, so repeated polls mix new and already
+seen articles. Every --syndicate-every-th article is a lightly edited copy
+of the previous story from another wire, as syndicated news is.
+
+Responses carry an ETag and Last-Modified that change only when the feed
+grows, and conditional requests for an unchanged feed get a 304. /stats
+reports requests, 304s and distinct client connections. Point the backend
+at it with:
+
+    NEWS_API_URL=http://127.0.0.1:9200/v2/everything NEWS_API_KEY=fake
+
+Usage:
+    python benchmarks/fake_newsapi.py --port 9200 --latency 0.2
+"""
+import argparse
+import asyncio
+import random
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from email.utils import format_datetime
+
+from fastapi import FastAPI, Query, Request, Response
+
+app = FastAPI(title="Fake NewsAPI")
+app.state.latency = 0.0
+app.state.new_per_poll = 3
+app.state.initial_articles = 0
+app.state.syndicate_every = 4
+app.state.polls = {}
+app.state.requests = 0
+app.state.not_modified = 0
+app.state.connections = set()
+
+TEMPLATES = [
+    ("{q}: índices sobem após dados de emprego", "Os índices avançaram após dados de emprego acima do esperado."),
+    ("{q}: investidores cautelosos antes do Fed", "Investidores reduziram posições antes da decisão do Federal Reserve."),
+    (
+        "{q}: resultados trimestrais superam estimativas",
+        "Empresas do setor divulgaram lucros acima das estimativas dos analistas."
+    ),
+    ("{q}: queda forte com temor de recessão", "Os papéis recuaram com o aumento dos temores de recessão global."),
+]
+# Recent enough to fall inside the ingestion dedup window
+FEED_START = datetime.now(timezone.utc) - timedelta(days=1)
+WORDS = (
+    "juros inflação dólar câmbio bolsa ações lucro receita dívida crédito consumo varejo "
+    "energia petróleo ouro minério safra exportação importação emprego salário tesouro "
+    "títulos fundos bancos seguradoras tecnologia chips nuvem software bitcoin ethereum "
+    "Apple Nvidia Petrobras Itaú"
+).split()
+
+
+def make_article(query: str, number: int) -> dict:
+    story = number
+    syndicated = app.state.syndicate_every and number % app.state.syndicate_every == 0
+    if syndicated:
+        story = number - 1
+
+    title, content = TEMPLATES[story % len(TEMPLATES)]
+    details = " ".join(random.Random(f"{query}:{story}").sample(WORDS, 12))
+    published = FEED_START + timedelta(minutes=number)
+    article = {
+        "source": {"id": None, "name": f"Fake Wire {number % 5}"},
+        "author": "Fake Reporter",
+        "title": f"{title.format(q=query)} (#{story})",
+        "description": content,
+        "url": f"https://news.example.com/{zlib.crc32(query.encode()) % 10000}/{number}",
+        "urlToImage": None,
+        "publishedAt": published.isoformat().replace("+00:00", "Z"),
+        "content": f"{content} Artigo {story} sobre {query}: {details}.",
+    }
+    if syndicated:
+        article["title"] += f" - {article['source']['name']}"
+    return article
+
+
+@app.get("/v2/everything")
+async def everything(
+    request: Request,
+    response: Response,
+    q: str = Query(...),
+    pageSize: int = Query(20),
+    apiKey: str = Query(None),
+):
+    app.state.requests += 1
+    app.state.connections.add((request.client.host, request.client.port))
+    await asyncio.sleep(app.state.latency)
+
+    polls = app.state.polls.get(q, 0) + 1
+    app.state.polls[q] = polls
+    newest = app.state.initial_articles + polls * app.state.new_per_poll
+    numbers = range(newest, max(0, newest - pageSize), -1)
+
+    etag = f'"{zlib.crc32(q.encode())}-{newest}-{pageSize}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(FEED_START + timedelta(minutes=newest), usegmt=True),
+    }
+    if request.headers.get("if-none-match") == etag:
+        app.state.not_modified += 1
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return {
+        "status": "ok",
+        "totalResults": newest,
+        "articles": [make_article(q, number) for number in numbers],
+    }
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "requests": app.state.requests,
+        "not_modified": app.state.not_modified,
+        "connections": len(app.state.connections),
+        "polls": app.state.polls,
+    }
+
+
+@app.post("/reset")
+async def reset():
+    app.state.requests = 0
+    app.state.not_modified = 0
+    app.state.connections = set()
+    return {"ok": True}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake NewsAPI server")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--new-per-poll", type=int, default=3)
+    parser.add_argument("--initial-articles", type=int, default=0, help="feed size before the first poll")
+    parser.add_argument("--syndicate-every", type=int, default=4, help="0 disables syndicated copies")
+    args = parser.parse_args()
+
+    app.state.latency = args.latency
+    app.state.new_per_poll = args.new_per_poll
+    app.state.initial_articles = args.initial_articles
+    app.state.syndicate_every = args.syndicate_every
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
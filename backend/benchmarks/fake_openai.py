@@ -0,0 +1,204 @@
+"""
+Local fake OpenAI server for benchmarks
+
+Implements just enough of POST /v1/chat/completions to stand in for the real
+API: every call sleeps for a configurable latency and answers with a valid
+analysis JSON (or a JSON array with one entry per "[ID n]" article for batch
+prompts). With --max-concurrency it answers calls beyond that many in
+flight with a 429 and Retry-After, like an exhausted rate limit. Point the
+backend at it with OPENAI_BASE_URL.
+
+The completion is generated in --chunk-chars pieces, one every
+--token-interval seconds after the initial latency; "stream": true requests
+receive them as server-sent chunks, followed by a usage chunk when
+"stream_options" asks for it; others wait for the whole text. With
+--replay, recorded chunk streams (see benchmarks/stream_replay.py) are
+served in turn instead, with their recorded timing.
+
+Usage:
+    python benchmarks/fake_openai.py --port 9100 --latency 1.5
+    python benchmarks/fake_openai.py --port 9100 --replay recordings.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import re
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+app = FastAPI(title="Fake OpenAI")
+app.state.latency = 1.0
+app.state.token_interval = 0.0
+app.state.chunk_chars = 4
+app.state.recordings = None
+app.state.max_concurrency = 0
+app.state.in_flight = 0
+app.state.calls = 0
+app.state.rate_limited = 0
+app.state.prompt_tokens = 0
+app.state.completion_tokens = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+ANALYSIS = {
+    "summary": "Mercado reage a dados econômicos.",
+    "sentiment": "positive",
+    "confidence": 0.8,
+    "key_points": ["Dados acima do esperado", "Índices em alta"],
+    "recommendations": ["Acompanhar resultados", "Diversificar carteira"]
+}
+
+
+def build_content(messages) -> str:
+    """Build the completion text for a request"""
+    prompt = messages[-1].get("content", "") if messages else ""
+    ids = re.findall(r"\[ID (\d+)\]", prompt)
+    if ids:
+        return json.dumps(
+            [{"id": int(idx), **ANALYSIS} for idx in ids],
+            ensure_ascii=False
+        )
+    return json.dumps(ANALYSIS, ensure_ascii=False)
+
+
+def build_chunks(messages):
+    """(delay, text) pieces of the completion for a request"""
+    if app.state.recordings is not None:
+        return next(app.state.recordings)
+    content = build_content(messages)
+    size = app.state.chunk_chars
+    return [
+        (app.state.latency if start == 0 else app.state.token_interval, content[start:start + size])
+        for start in range(0, len(content), size)
+    ]
+
+
+def usage(messages, chunks):
+    """Token usage of one completion, counted into the server totals"""
+    prompt_tokens = sum(estimate_tokens(m.get("content", "")) for m in messages)
+    completion_tokens = estimate_tokens("".join(text for _, text in chunks))
+    app.state.prompt_tokens += prompt_tokens
+    app.state.completion_tokens += completion_tokens
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+def stream_chunks(chunks, body):
+    async def events():
+        app.state.in_flight += 1
+        try:
+            for delay, text in chunks:
+                await asyncio.sleep(delay)
+                chunk = {
+                    "id": f"chatcmpl-fake-{app.state.calls}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+            if (body.get("stream_options") or {}).get("include_usage"):
+                final = {
+                    "id": f"chatcmpl-fake-{app.state.calls}",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [],
+                    "usage": usage(body.get("messages", []), chunks)
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+        finally:
+            app.state.in_flight -= 1
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if app.state.max_concurrency and app.state.in_flight >= app.state.max_concurrency:
+        app.state.rate_limited += 1
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": "1"},
+            content={"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+        )
+
+    app.state.calls += 1
+    messages = body.get("messages", [])
+    chunks = build_chunks(messages)
+    if body.get("stream"):
+        return stream_chunks(chunks, body)
+
+    app.state.in_flight += 1
+    try:
+        await asyncio.sleep(sum(delay for delay, _ in chunks))
+    finally:
+        app.state.in_flight -= 1
+
+    content = "".join(text for _, text in chunks)
+    return {
+        "id": f"chatcmpl-fake-{app.state.calls}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }
+        ],
+        "usage": usage(messages, chunks)
+    }
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "calls": app.state.calls,
+        "rate_limited": app.state.rate_limited,
+        "prompt_tokens": app.state.prompt_tokens,
+        "completion_tokens": app.state.completion_tokens
+    }
+
+
+@app.post("/reset")
+async def reset():
+    app.state.calls = 0
+    app.state.rate_limited = 0
+    app.state.prompt_tokens = 0
+    app.state.completion_tokens = 0
+    return {"ok": True}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake OpenAI server")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--max-concurrency", type=int, default=0, help="429 above this many calls in flight")
+    parser.add_argument("--token-interval", type=float, default=0.0, help="seconds between completion chunks")
+    parser.add_argument("--chunk-chars", type=int, default=4, help="characters per completion chunk")
+    parser.add_argument("--replay", help="JSON file of recorded chunk streams to serve in turn")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay) as f:
+            app.state.recordings = itertools.cycle(json.load(f)["streams"])
+    app.state.latency = args.latency
+    app.state.token_interval = args.token_interval
+    app.state.chunk_chars = args.chunk_chars
+    app.state.max_concurrency = args.max_concurrency
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
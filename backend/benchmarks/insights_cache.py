@@ -0,0 +1,139 @@
+"""
+Benchmark: insight reuse across a realistic stream of watchlist requests
+
+Sends generate_market_insights requests for watchlists drawn from a
+Zipf-popular symbol universe (a few mega-caps in most lists, a long tail
+rarely), with 1-10 symbols per list in random order and case, against the
+local fake OpenAI server. Reports the per-symbol cache hit rate and the
+completions per request, next to what caching whole watchlists (one key per
+exact list, as before) would have needed for the same requests.
+
+Usage:
+    python benchmarks/insights_cache.py --requests 500 --universe 60 --concurrency 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9105
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["REDIS_PORT"] = "1"  # in-process cache only
+os.environ["INSIGHTS_CONTEXT_ARTICLES"] = "0"  # no article store needed
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Watchlist sizes and how often users keep that many symbols
+SIZE_WEIGHTS = {1: 8, 2: 10, 3: 16, 4: 16, 5: 14, 6: 10, 7: 8, 8: 7, 9: 5, 10: 6}
+
+
+def make_watchlists(count: int, universe: int, skew: float, seed: int = 42):
+    """Watchlists of distinct symbols, popular ones Zipf-weighted, shuffled and in mixed case"""
+    from app.services.symbol_service import SYMBOLS
+
+    rng = random.Random(seed)
+    names = list(SYMBOLS)[:universe] + [f"X{n:03d}" for n in range(max(0, universe - len(SYMBOLS)))]
+    weights = [1 / rank ** skew for rank in range(1, len(names) + 1)]
+    sizes, size_weights = zip(*SIZE_WEIGHTS.items())
+
+    watchlists = []
+    for _ in range(count):
+        size = rng.choices(sizes, size_weights)[0]
+        picked = []
+        while len(picked) < size:
+            symbol = rng.choices(names, weights)[0]
+            if symbol not in picked:
+                picked.append(symbol)
+        watchlists.append([symbol.lower() if rng.random() < 0.2 else symbol for symbol in picked])
+    return watchlists
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def run(watchlists, concurrency: int):
+    from app.services.cache_service import cache_service
+    from app.services.openai_service import openai_service
+
+    logging.getLogger("finmarket").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await cache_service.start()
+
+    queue = asyncio.Queue()
+    for watchlist in watchlists:
+        queue.put_nowait(watchlist)
+
+    async def worker():
+        while not queue.empty():
+            await openai_service.generate_market_insights(queue.get_nowait())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    async with httpx.AsyncClient() as client:
+        calls = (await client.get(f"{FAKE_OPENAI_URL}/stats")).json()["calls"]
+    await openai_service.close()
+    await cache_service.close()
+    return calls, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--universe", type=int, default=60, help="distinct symbols users pick from")
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of symbol popularity")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake completion latency (s)")
+    args = parser.parse_args()
+
+    watchlists = make_watchlists(args.requests, args.universe, args.skew)
+    symbols = sum(len(watchlist) for watchlist in watchlists)
+    # Whole-list keys: one completion per distinct (ordered, as sent) list
+    list_calls = len({tuple(watchlist) for watchlist in watchlists})
+
+    os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+    fake_openai = subprocess.Popen(
+        [sys.executable, "benchmarks/fake_openai.py", "--port", str(FAKE_OPENAI_PORT), "--latency", str(args.latency)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        calls, elapsed = asyncio.run(run(watchlists, args.concurrency))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+    print(f"Requests: {args.requests}   symbols requested: {symbols} "
+          f"({symbols / args.requests:.1f}/request)   distinct symbols: "
+          f"{len({symbol.upper() for watchlist in watchlists for symbol in watchlist})}")
+    print(f"\n{'scheme':<22} {'completions':>12} {'per request':>12} {'hit rate':>9}")
+    print(f"{'per symbol':<22} {calls:>12} {calls / args.requests:>12.2f} {1 - calls / symbols:>9.1%}")
+    print(f"{'whole watchlist':<22} {list_calls:>12} {list_calls / args.requests:>12.2f} "
+          f"{1 - list_calls / args.requests:>9.1%}")
+    print(f"\nElapsed: {elapsed:.1f}s ({args.requests / elapsed:.0f} requests/s at concurrency {args.concurrency})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: OpenAI governor under a burst
+
+Against the local fake OpenAI server limited to --upstream-concurrency
+calls in flight (429 + Retry-After beyond that), queues --background
+background analyses and then fires --interactive interactive ones, with the
+governor disabled and then enabled. Reports upstream 429s, analyses that
+fell back to the degraded default, and latency per priority.
+
+Usage:
+    python benchmarks/llm_governor.py --background 60 --interactive 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9103
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+os.environ["REDIS_PORT"] = "1"  # in-process cache only
+os.environ["SENTIMENT_PRECLASSIFIER_ENABLED"] = "false"  # every analysis needs a completion
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def timed(coro):
+    started = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - started
+
+
+async def burst(name: str, background: int, interactive: int):
+    from app.services.llm_governor import Priority
+    from app.services.openai_service import openai_service
+
+    run = uuid.uuid4().hex[:8]
+    async with httpx.AsyncClient() as fake:
+        await fake.post(f"{FAKE_OPENAI_URL}/reset")
+
+        background_tasks = [
+            asyncio.create_task(timed(openai_service.analyze_news(
+                f"Notícia de fundo {run}-{number} sobre o mercado financeiro.", Priority.BACKGROUND
+            )))
+            for number in range(background)
+        ]
+        await asyncio.sleep(0.1)
+        interactive_results = await asyncio.gather(*(
+            timed(openai_service.analyze_news(f"Notícia interativa {run}-{number} sobre ações."))
+            for number in range(interactive)
+        ))
+        background_results = await asyncio.gather(*background_tasks)
+        stats = (await fake.get(f"{FAKE_OPENAI_URL}/stats")).json()
+
+    def summarize(results):
+        fallbacks = sum(result["key_points"] == ["Análise automática indisponível"] for result, _ in results)
+        latencies = [elapsed for _, elapsed in results]
+        return fallbacks, statistics.median(latencies) * 1000, max(latencies) * 1000
+
+    interactive_fallbacks, interactive_p50, interactive_max = summarize(interactive_results)
+    background_fallbacks, background_p50, background_max = summarize(background_results)
+    print(
+        f"{name:<10} {stats['rate_limited']:>5} {interactive_fallbacks + background_fallbacks:>9} "
+        f"{interactive_p50:>10.0f}ms {interactive_max:>8.0f}ms {background_p50:>10.0f}ms {background_max:>8.0f}ms"
+    )
+
+
+async def run(background: int, interactive: int, max_in_flight: int):
+    from app.services.cache_service import cache_service
+    from app.services.llm_governor import llm_governor
+
+    logging.getLogger("finmarket").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await cache_service.start()
+
+    print(f"{'governor':<10} {'429s':>5} {'fallbacks':>9} {'inter p50':>12} {'max':>10} {'bg p50':>12} {'max':>10}")
+
+    # Disabled: no admission control and no retries, as before the governor
+    max_retries = llm_governor.max_retries
+    llm_governor.max_in_flight, llm_governor.max_retries = 0, 0
+    await burst("off", background, interactive)
+
+    llm_governor.max_in_flight, llm_governor.max_retries = max_in_flight, max_retries
+    await burst("on", background, interactive)
+    print(f"\nGovernor stats: {llm_governor.stats()}")
+    await cache_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--background", type=int, default=60)
+    parser.add_argument("--interactive", type=int, default=10)
+    parser.add_argument("--upstream-concurrency", type=int, default=8)
+    parser.add_argument("--max-in-flight", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3, help="fake OpenAI latency (s)")
+    args = parser.parse_args()
+
+    fake_openai = subprocess.Popen(
+        [
+            sys.executable, "benchmarks/fake_openai.py",
+            "--port", str(FAKE_OPENAI_PORT),
+            "--latency", str(args.latency),
+            "--max-concurrency", str(args.upstream_concurrency)
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        asyncio.run(run(args.background, args.interactive, args.max_in_flight))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Load test: health and news latency while LLM analyses are in flight
+
+Starts the fake OpenAI server and the API in subprocesses, keeps a number of
+/api/news/analyze calls in flight against the fake server (each one waits
+--latency seconds upstream) and samples /api/health and /api/news meanwhile.
+With a blocking OpenAI client the health probe queues behind every analysis;
+with the async client it should stay in the low milliseconds.
+
+Usage:
+    python benchmarks/load_test.py --concurrency 50 --duration 15
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9100
+API_PORT = 8100
+API_URL = f"http://127.0.0.1:{API_PORT}"
+
+
+def start_process(args, env=None):
+    return subprocess.Popen(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name, samples):
+    if not samples:
+        print(f"{name:<14} no samples")
+        return
+    print(
+        f"{name:<14} n={len(samples):<5} "
+        f"p50={percentile(samples, 50) * 1000:8.1f} ms  "
+        f"p99={percentile(samples, 99) * 1000:8.1f} ms  "
+        f"mean={statistics.mean(samples) * 1000:8.1f} ms"
+    )
+
+
+async def analysis_worker(client, stop, completed):
+    while not stop.is_set():
+        payload = {"content": f"Ações sobem após balanço trimestral {uuid.uuid4()}"}
+        try:
+            await client.post(f"{API_URL}/api/news/analyze", json=payload)
+            completed.append(1)
+        except httpx.HTTPError:
+            pass
+
+
+async def sampler(client, path, stop, samples, interval):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            response = await client.get(f"{API_URL}{path}")
+            if response.status_code == 200:
+                samples.append(time.perf_counter() - started)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def run(concurrency: int, duration: float):
+    limits = httpx.Limits(max_connections=concurrency + 10)
+    async with httpx.AsyncClient(timeout=120.0, limits=limits) as client:
+        stop = asyncio.Event()
+        health, news, completed = [], [], []
+
+        tasks = [
+            asyncio.create_task(analysis_worker(client, stop, completed))
+            for _ in range(concurrency)
+        ]
+        tasks.append(asyncio.create_task(sampler(client, "/api/health", stop, health, 0.05)))
+        tasks.append(asyncio.create_task(sampler(client, "/api/news?limit=5", stop, news, 0.2)))
+
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    print(f"\nConcurrent analyses: {concurrency}, duration: {duration:.0f}s")
+    print(f"Completed analyses: {len(completed)} ({len(completed) / duration:.1f}/s)")
+    report("/api/health", health)
+    report("/api/news", news)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--latency", type=float, default=1.5, help="fake OpenAI latency (s)")
+    args = parser.parse_args()
+
+    fake_openai = start_process([
+        "benchmarks/fake_openai.py",
+        "--port", str(FAKE_OPENAI_PORT),
+        "--latency", str(args.latency)
+    ])
+    api = start_process(
+        ["-m", "uvicorn", "main:app", "--port", str(API_PORT), "--log-level", "warning"],
+        env={
+            "OPENAI_API_KEY": "fake-key",
+            "SECRET_KEY": "benchmark",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{FAKE_OPENAI_PORT}/v1",
+            "RATE_LIMIT_PER_MINUTE": "1000000",
+            "RATE_LIMIT_ROUTES": "{}",
+            "DEBUG": "false"
+        }
+    )
+    try:
+        asyncio.run(wait_until_up(f"http://127.0.0.1:{FAKE_OPENAI_PORT}/stats"))
+        asyncio.run(wait_until_up(f"{API_URL}/api/health"))
+        asyncio.run(run(args.concurrency, args.duration))
+    finally:
+        api.terminate()
+        fake_openai.terminate()
+        api.wait()
+        fake_openai.wait()
+
+
+if __name__ == "__main__":
+    main()
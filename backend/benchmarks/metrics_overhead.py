@@ -0,0 +1,133 @@
+"""
+Microbenchmark: cost of the metrics instrumentation on the hot path
+
+Times, per call, what instrumentation adds: the @timed decorator around an
+async call, a cache lookup counter, and the metrics middleware on an
+in-process ASGI request (a small FastAPI app with the repo's error
+handler, with and without MetricsMiddleware on top), plus the cost of one
+/metrics scrape.
+
+Usage:
+    python benchmarks/metrics_overhead.py
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def per_call(fns, count: int, rounds: int = 7):
+    """
+    Median over rounds of the mean seconds per awaited call, for each of
+    ``fns``; their rounds are interleaved so drift hits all of them alike
+    """
+    samples = [[] for _ in fns]
+    for _ in range(rounds):
+        for fn, timings in zip(fns, samples):
+            started = time.perf_counter()
+            for _ in range(count):
+                await fn()
+            timings.append((time.perf_counter() - started) / count)
+    return [statistics.median(timings) for timings in samples]
+
+
+def make_app(instrumented: bool):
+    from fastapi import FastAPI
+    from app.middleware.error_handler import error_handler_middleware
+    from app.middleware.metrics import MetricsMiddleware
+
+    app = FastAPI()
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    app.middleware("http")(error_handler_middleware)
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def asgi_request(app, path: str):
+    """One GET through the ASGI app, without a client or sockets"""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    def request():
+        sent = False
+        finished = asyncio.Event()
+
+        async def receive():
+            # The body once, then a disconnect as soon as the response is out, as a
+            # server reports a closed connection; no middleware is left waiting on it
+            nonlocal sent
+            if sent:
+                await finished.wait()
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start" and message["status"] != 200:
+                raise RuntimeError(f"benchmark request failed with {message['status']}")
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                finished.set()
+
+        return app(dict(scope), receive, send)
+
+    return request
+
+
+async def run(calls: int, requests: int):
+    from prometheus_client import generate_latest
+    from app.core.metrics import record_cache_lookup, timed
+
+    async def call():
+        return None
+
+    async def lookup():
+        record_cache_lookup("news_analysis:0123456789abcdef", "l1")
+
+    bare, decorated, counted = await per_call([call, timed("bench", "call")(call), lookup], calls)
+    plain, measured = await per_call([
+        asgi_request(make_app(False), "/api/items/42"),
+        asgi_request(make_app(True), "/api/items/42")
+    ], requests)
+
+    started = time.perf_counter()
+    for _ in range(100):
+        exposition = generate_latest()
+    scrape = (time.perf_counter() - started) / 100
+
+    print(f"{'':<34} {'per call':>12}")
+    print(f"{'@timed overhead':<34} {(decorated - bare) * 1e6:>10.2f}µs")
+    print(f"{'cache lookup counter':<34} {(counted - bare) * 1e6:>10.2f}µs")
+    print(f"{'request, no metrics middleware':<34} {plain * 1e6:>10.1f}µs")
+    print(f"{'request, metrics middleware':<34} {measured * 1e6:>10.1f}µs")
+    print(f"{'middleware overhead':<34} {(measured - plain) * 1e6:>10.1f}µs "
+          f"({(measured - plain) / plain:+.0%} of a trivial request)")
+    print(f"{'/metrics scrape':<34} {scrape * 1e3:>10.2f}ms ({len(exposition) / 1024:.0f} KiB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=20_000, help="calls per round for the decorator and counter")
+    parser.add_argument("--requests", type=int, default=2_000, help="ASGI requests per round")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: NewsAPI connection reuse and conditional requests
+
+Runs the category queries against the local fake NewsAPI server (feed not
+growing, so responses stay valid) in four modes and reports per-query
+latency, upstream requests, 304s and TCP connections the server saw:
+
+    per-call client   a new httpx.AsyncClient per query (previous behaviour)
+    shared pool       SearchService's long-lived client, response cache off
+    revalidate        shared client, cache expired: If-None-Match -> 304
+    fresh cache       shared client within NEWS_API_CACHE_TTL: no request
+
+The stub is plain HTTP on localhost, so HTTP/2 is not negotiated and no TLS
+handshake is saved; against newsapi.org each avoided connection also saves
+a TLS handshake.
+
+Usage:
+    python benchmarks/newsapi_client.py --queries 200 --latency 0.01
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_NEWSAPI_PORT = 9201
+FAKE_NEWSAPI_URL = f"http://127.0.0.1:{FAKE_NEWSAPI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["NEWS_API_KEY"] = "fake-key"
+os.environ["NEWS_API_URL"] = f"{FAKE_NEWSAPI_URL}/v2/everything"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def per_call_client(params):
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(os.environ["NEWS_API_URL"], params=params)
+        response.raise_for_status()
+        return response.json()
+
+
+async def measure(name: str, fetch, queries: int, page_size: int):
+    from app.services.search_service import SearchService
+
+    async with httpx.AsyncClient() as fake:
+        await fake.post(f"{FAKE_NEWSAPI_URL}/reset")
+        samples = []
+        categories = list(SearchService.CATEGORY_QUERIES.values())
+        for number in range(queries):
+            params = {
+                "q": categories[number % len(categories)],
+                "language": "en",
+                "sortBy": "publishedAt",
+                "pageSize": page_size,
+                "apiKey": "fake-key"
+            }
+            started = time.perf_counter()
+            await fetch(params)
+            samples.append(time.perf_counter() - started)
+        stats = (await fake.get(f"{FAKE_NEWSAPI_URL}/stats")).json()
+
+    samples.sort()
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{name:<16} {statistics.median(samples) * 1000:8.2f}ms {p99 * 1000:8.2f}ms "
+        f"{stats['requests']:>9} {stats['not_modified']:>6} {stats['connections']:>12}"
+    )
+
+
+async def run(queries: int, page_size: int):
+    from app.core.config import settings
+    from app.services.search_service import search_service
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    await search_service.start()
+
+    async def shared_pool(params):
+        search_service._responses.clear()
+        return await search_service._get_json(params)
+
+    print(f"{'mode':<16} {'p50':>10} {'p99':>10} {'upstream':>9} {'304s':>6} {'connections':>12}")
+    await measure("per-call client", per_call_client, queries, page_size)
+    await measure("shared pool", shared_pool, queries, page_size)
+
+    search_service._responses.clear()
+    settings.NEWS_API_CACHE_TTL = 0
+    await measure("revalidate", search_service._get_json, queries, page_size)
+
+    search_service._responses.clear()
+    settings.NEWS_API_CACHE_TTL = 300
+    await measure("fresh cache", search_service._get_json, queries, page_size)
+    await search_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.01, help="fake NewsAPI latency (s)")
+    args = parser.parse_args()
+
+    fake_newsapi = subprocess.Popen(
+        [
+            sys.executable, "benchmarks/fake_newsapi.py",
+            "--port", str(FAKE_NEWSAPI_PORT),
+            "--latency", str(args.latency),
+            "--new-per-poll", "0",
+            "--initial-articles", str(args.page_size)
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_NEWSAPI_URL}/stats"))
+        asyncio.run(run(args.queries, args.page_size))
+    finally:
+        fake_newsapi.terminate()
+        fake_newsapi.wait()
+
+
+if __name__ == "__main__":
+    main()
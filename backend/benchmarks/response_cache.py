@@ -0,0 +1,171 @@
+"""
+Benchmark: /api/news with and without the response cache
+
+Fills a temporary article store, then sends GET /api/news requests through
+the full application (middlewares included) as in-process ASGI calls,
+rotating over --pages distinct queries. Compares the uncached path (models
+built, validated and serialized per request), cache hits (stored bytes)
+and revalidations answered 304, in requests per second and in memory
+allocated per request (tracemalloc peak).
+
+Usage:
+    python benchmarks/response_cache.py --articles 5000 --requests 5000
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["STORE_PATH"] = str(Path(tempfile.mkdtemp()) / "articles.db")
+os.environ["REDIS_PORT"] = "1"  # in-process cache only
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "100000000"
+os.environ["INGESTION_ENABLED"] = "false"
+sys.path.insert(0, str(BACKEND_DIR))
+
+CATEGORIES = ["market", "tech", "crypto", "commodities"]
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "TSLA", "BTC", "ETH", "PETR4", "VALE3"]
+
+
+def make_articles(count: int):
+    base = datetime.now(timezone.utc) - timedelta(days=30)
+    rng = random.Random(count)
+    for number in range(count):
+        yield {
+            "title": f"Notícia sintética {number} sobre o mercado financeiro",
+            "content": "Conteúdo sintético para benchmark das respostas de /api/news. " * 8,
+            "source": f"Wire {number % 20}",
+            "url": f"https://news.example.com/{number}",
+            "published_at": (base + timedelta(minutes=number)).isoformat(),
+            "category": CATEGORIES[number % len(CATEGORIES)],
+            "symbols": rng.sample(SYMBOLS, 2),
+            "analysis": {
+                "summary": "Resumo sintético da notícia para o benchmark.",
+                "sentiment": rng.choice(["positive", "negative", "neutral"]),
+                "confidence": round(rng.random(), 2),
+                "key_points": ["Primeiro ponto", "Segundo ponto", "Terceiro ponto"],
+            },
+        }
+
+
+class Client:
+    """GET requests straight into the ASGI app, without sockets"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def get(self, path: str, query: str, headers=()):
+        scope = {
+            "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+            "headers": [(b"host", b"bench"), *headers], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+        }
+        sent = False
+        finished = asyncio.Event()
+        response = {"body": b""}
+
+        async def receive():
+            # The body once, then a disconnect once the response is out
+            nonlocal sent
+            if sent:
+                await finished.wait()
+                return {"type": "http.disconnect"}
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = dict(message["headers"])
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+                if not message.get("more_body", False):
+                    finished.set()
+
+        await self.app(scope, receive, send)
+        return response
+
+
+async def measure(client: Client, queries, requests: int, etags=None):
+    """(requests per second, KiB allocated per request at peak)"""
+    def headers(query):
+        return [(b"if-none-match", etags[query])] if etags else ()
+
+    started = time.perf_counter()
+    for number in range(requests):
+        query = queries[number % len(queries)]
+        await client.get("/api/news", query, headers(query))
+    rate = requests / (time.perf_counter() - started)
+
+    sample = min(requests, 500)
+    peaks = 0
+    tracemalloc.start()
+    for number in range(sample):
+        query = queries[number % len(queries)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await client.get("/api/news", query, headers(query))
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return rate, peaks / sample / 1024
+
+
+async def run(articles: int, requests: int, pages: int, limit: int):
+    from app.api.response_cache import response_cache
+    from app.core.config import settings
+    from app.services.article_store import article_store
+    from main import app
+
+    generated = list(make_articles(articles))
+    for offset in range(0, articles, 1000):
+        await article_store.add_many(generated[offset:offset + 1000])
+
+    client = Client(app)
+    queries = [
+        f"category={CATEGORIES[number % len(CATEGORIES)]}&limit={limit}&page={number // len(CATEGORIES) + 1}"
+        for number in range(pages)
+    ]
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    uncached = {query: await client.get("/api/news", query) for query in queries}
+    before = await measure(client, queries, requests)
+
+    settings.RESPONSE_CACHE_ENABLED = True
+    cached = {query: await client.get("/api/news", query) for query in queries}
+    for query in queries:
+        # The cache must not change a byte of the response
+        assert cached[query]["body"] == uncached[query]["body"]
+    hits = await measure(client, queries, requests)
+    etags = {query: cached[query]["headers"][b"etag"] for query in queries}
+    not_modified = await measure(client, queries, requests, etags)
+
+    print(f"{pages} pages of {limit} articles, {len(uncached[queries[0]]['body']) / 1024:.1f} KiB per response\n")
+    print(f"{'':<12} {'req/s':>10} {'KiB/req':>10}")
+    for name, (rate, allocated) in [("uncached", before), ("cache hit", hits), ("304", not_modified)]:
+        print(f"{name:<12} {rate:>10,.0f} {allocated:>10.1f}")
+    print(f"\nResponse cache: {response_cache.stats()}")
+    await article_store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--pages", type=int, default=8, help="distinct queries rotated over")
+    parser.add_argument("--limit", type=int, default=20, help="articles per page")
+    args = parser.parse_args()
+    asyncio.run(run(args.articles, args.requests, args.pages, args.limit))
+
+
+if __name__ == "__main__":
+    main()
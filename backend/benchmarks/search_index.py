@@ -0,0 +1,150 @@
+"""
+Benchmark: full-text search index build throughput and query latency
+
+Fills a temporary article store with N synthetic analyzed articles (title,
+content, summary and key points drawn from a Zipf-distributed financial
+vocabulary, so a few words appear in most articles and most words are
+rare), reporting insert throughput with the index maintained by triggers
+and the throughput of a full index rebuild. Then times /api/news/search
+queries, from rare to near-universal terms, with filters and both sort
+orders.
+
+Usage:
+    python benchmarks/search_index.py --articles 1000000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+CATEGORIES = ["market", "tech", "crypto", "commodities"]
+SENTIMENTS = ["positive", "negative", "neutral"]
+COMMON_WORDS = (
+    "mercado ações bolsa juros inflação dólar câmbio lucro receita dívida crédito consumo varejo "
+    "energia petróleo ouro minério safra exportação emprego salário tesouro títulos fundos bancos "
+    "tecnologia chips nuvem software bitcoin ethereum investidores analistas trimestre resultados "
+    "alta queda recorde estimativas guidance dividendos recompra fusão aquisição regulação tarifa "
+    "markets stocks earnings revenue shares rates growth outlook demand supply"
+).split()
+# Long tail: company and place names that appear in few articles
+RARE_WORDS = [f"empresa{n}" for n in range(20_000)]
+
+
+def make_vocabulary(skew: float):
+    words = COMMON_WORDS + RARE_WORDS
+    weights = itertools.accumulate(1 / rank ** skew for rank in range(1, len(words) + 1))
+    return words, list(weights)
+
+
+def make_articles(start: int, count: int, vocabulary):
+    words, weights = vocabulary
+    base = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    rng = random.Random(start)
+
+    def text(length: int) -> str:
+        return " ".join(rng.choices(words, cum_weights=weights, k=length))
+
+    for number in range(start, start + count):
+        yield {
+            "title": text(9),
+            "content": text(60),
+            "source": f"Wire {number % 20}",
+            "url": f"https://news.example.com/{number}",
+            "published_at": (base + timedelta(seconds=number * 60)).isoformat(),
+            "category": CATEGORIES[number % len(CATEGORIES)],
+            "analysis": {
+                "summary": text(20),
+                "sentiment": rng.choice(SENTIMENTS),
+                "confidence": 0.8,
+                "key_points": [text(5), text(5)],
+            },
+        }
+
+
+async def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fn()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000, len(result)
+
+
+async def run(total: int, batch: int, repeat: int, skew: float):
+    from app.core.config import settings
+    from app.services.article_store import ArticleStore
+
+    path = Path(tempfile.mkdtemp()) / "articles.db"
+    store = ArticleStore(str(path))
+    vocabulary = make_vocabulary(skew)
+
+    generating = inserting = 0.0
+    for offset in range(0, total, batch):
+        started = time.perf_counter()
+        articles = list(make_articles(offset, min(batch, total - offset), vocabulary))
+        generating += time.perf_counter() - started
+        started = time.perf_counter()
+        await store.add_many(articles)
+        inserting += time.perf_counter() - started
+    print(f"Inserted {total} articles, index kept by triggers: {inserting:.1f}s ({total / inserting:,.0f}/s)"
+          f"   [generation {generating:.1f}s, not counted]")
+
+    started = time.perf_counter()
+    indexed = await store.rebuild_search_index()
+    elapsed = time.perf_counter() - started
+    print(f"Full index rebuild: {indexed} articles in {elapsed:.1f}s ({indexed / elapsed:,.0f}/s)")
+    await store._run(lambda conn: conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('optimize')"))
+
+    # The last week of the corpus, as "news from the past week" would be
+    until = datetime(2020, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=total * 60)
+    since = until - timedelta(days=7)
+    checks = [
+        ("rare term", dict(query="empresa15000")),
+        ("mid term", dict(query="empresa40")),
+        ("common term", dict(query="acoes")),
+        ("two common terms", dict(query="mercado lucro")),
+        ("phrase", dict(query='"bolsa juros"')),
+        ("prefix", dict(query="empresa123*")),
+        ("common + category + sentiment", dict(query="juros", category="crypto", sentiment="negative")),
+        ("common + date range", dict(query="dolar", since=since, until=until)),
+    ]
+    print(f"\nRelevance ranks the newest {settings.SEARCH_RANK_WINDOW} matches (SEARCH_RANK_WINDOW)")
+    print(f"{'query':<32} {'sort':<10} {'median':>10} {'p99':>10} {'hits':>5}")
+    for name, params in checks:
+        for sort in ("relevance", "recent"):
+            median, p99, hits = await timed(lambda: store.search(**params, sort=sort, limit=21), repeat)
+            print(f"{name:<32} {sort:<10} {median:8.2f}ms {p99:8.2f}ms {hits:>5}")
+
+    await store.close()
+    print(f"\nDatabase size: {path.stat().st_size / 1024 / 1024:.1f} MiB ({path})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=50, help="runs per query")
+    parser.add_argument("--window", type=int, help="override SEARCH_RANK_WINDOW")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of word frequency")
+    args = parser.parse_args()
+    if args.window:
+        os.environ["SEARCH_RANK_WINDOW"] = str(args.window)
+    asyncio.run(run(args.articles, args.batch, args.repeat, args.skew))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Offline evaluation: lexicon sentiment pre-classifier vs. LLM labels
+
+Scores every LLM-analyzed article in the article store with the lexicon
+classifier and reports, per confidence threshold, the share of analyses it
+would take over (LLM calls avoided) and how often it agrees with the LLM's
+sentiment on those, plus overall agreement, a confusion matrix and the
+classifier's cost per article. Articles analyzed by the lexicon itself or
+by the fallback are skipped.
+
+Usage:
+    python benchmarks/sentiment_eval.py --store data/articles.db --threshold 0.75 0.8 0.85 0.9
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def load_labels(path: str):
+    """(content, LLM sentiment) of every LLM-analyzed article in the store"""
+    from app.services.article_store import ArticleStore
+
+    store = ArticleStore(path)
+    articles = await store.recent(datetime.fromtimestamp(0, timezone.utc))
+    await store.close()
+    return [
+        (article.get("content") or article.get("description", ""), article["analysis"]["sentiment"])
+        for article in articles
+        if article.get("analysis") and article["analysis"].get("method") is None
+    ]
+
+
+def main():
+    from app.core.config import settings
+    from app.models.schemas import SentimentType
+    from app.services.sentiment_service import sentiment_classifier
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--store", default=settings.STORE_PATH)
+    parser.add_argument("--threshold", type=float, nargs="+", default=[0.75, 0.8, 0.85, 0.9])
+    args = parser.parse_args()
+
+    if not Path(args.store).exists():
+        sys.exit(f"No article store at {args.store}")
+    labels = asyncio.run(load_labels(args.store))
+    if not labels:
+        sys.exit("No LLM-analyzed articles in the store")
+
+    started = time.perf_counter()
+    scores = [sentiment_classifier.classify(content) for content, _ in labels]
+    elapsed = time.perf_counter() - started
+
+    agree = sum(score.sentiment.value == label for score, (_, label) in zip(scores, labels))
+    print(f"Articles: {len(labels)}   classifier: {elapsed / len(labels) * 1000:.3f} ms/article")
+    print(f"Overall agreement: {agree / len(labels):.1%}\n")
+
+    print(f"{'threshold':>9} {'avoided':>9} {'agreement':>10} {'articles':>9}")
+    for threshold in sorted(args.threshold):
+        covered = [
+            (score, label) for score, (_, label) in zip(scores, labels)
+            if score.confidence >= threshold
+        ]
+        matched = sum(score.sentiment.value == label for score, label in covered)
+        agreement = f"{matched / len(covered):.1%}" if covered else "-"
+        print(f"{threshold:>9.2f} {len(covered) / len(labels):>9.1%} {agreement:>10} {len(covered):>9}")
+
+    sentiments = [sentiment.value for sentiment in SentimentType]
+    print("\nConfusion (rows: LLM, columns: lexicon)")
+    print(f"{'':>10}" + "".join(f"{sentiment:>10}" for sentiment in sentiments))
+    for label in sentiments:
+        row = [
+            sum(score.sentiment.value == predicted and actual == label for score, (_, actual) in zip(scores, labels))
+            for predicted in sentiments
+        ]
+        print(f"{label:>10}" + "".join(f"{count:>10}" for count in row))
+    print(f"\nCurrent SENTIMENT_PRECLASSIFIER_THRESHOLD: {settings.SENTIMENT_PRECLASSIFIER_THRESHOLD}")
+
+
+if __name__ == "__main__":
+    main()
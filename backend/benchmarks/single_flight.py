@@ -0,0 +1,111 @@
+"""
+Check: concurrent identical /api/insights requests make one upstream call per symbol
+
+Fires N concurrent POST /api/insights requests with the same symbols at the
+API (in-process, over ASGI) backed by the local fake OpenAI server, then
+reads the fake server's call counter. Exits non-zero unless exactly one
+completion per symbol was requested.
+
+Usage:
+    python benchmarks/single_flight.py --requests 100
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9102
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+os.environ["RATE_LIMIT_PER_MINUTE"] = "1000000"
+os.environ["RATE_LIMIT_ROUTES"] = "{}"
+sys.path.insert(0, str(BACKEND_DIR))
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def run(count: int) -> bool:
+    from main import app
+    from app.services.cache_service import cache_service
+
+    # Symbols no earlier run has cached, so the first request really misses
+    payload = {"symbols": [f"T{uuid.uuid4().hex[:6].upper()}" for _ in range(2)], "timeframe": "1d"}
+
+    # ASGITransport does not run the lifespan hook; probe Redis up front so
+    # requests skip it in degraded mode instead of all racing to connect
+    await cache_service.start()
+
+    async with httpx.AsyncClient() as fake:
+        await fake.post(f"{FAKE_OPENAI_URL}/reset")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60.0) as client:
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post("/api/insights", json=payload) for _ in range(count)
+            ))
+            elapsed = time.perf_counter() - started
+
+        calls = (await fake.get(f"{FAKE_OPENAI_URL}/stats")).json()["calls"]
+
+    ok = sum(response.status_code == 200 for response in responses)
+    stats = cache_service.stats()
+    await cache_service.close()
+    print(f"Requests: {count} ({ok} OK) in {elapsed * 1000:.0f} ms")
+    print(f"Upstream completions: {calls}")
+    print(
+        f"Single-flight executed={stats['single_flight_executed']} "
+        f"coalesced={stats['single_flight_coalesced']}"
+    )
+    return calls == len(payload["symbols"]) and ok == count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake OpenAI latency (s)")
+    args = parser.parse_args()
+
+    fake_openai = subprocess.Popen(
+        [
+            sys.executable, "benchmarks/fake_openai.py",
+            "--port", str(FAKE_OPENAI_PORT),
+            "--latency", str(args.latency)
+        ],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        passed = asyncio.run(run(args.requests))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+    print("PASS" if passed else "FAIL")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    main()
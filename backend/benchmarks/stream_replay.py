@@ -0,0 +1,185 @@
+"""
+Benchmark: time-to-first-field, blocking vs streamed completions
+
+Replays completion chunk streams from the local fake OpenAI server and
+measures, for news analyses and market insights, when the caller first has
+something to show: for the blocking path (analyze_news,
+generate_market_insights) that is the whole parsed object; for the streamed
+path (stream_news_analysis, stream_market_insights) the first summary text
+and the first complete field. Also checks that every streamed result ended
+up in the cache.
+
+Without --recording the fake generates chunks at --latency (time to first
+token) and --token-interval; record real chunk timing first with --record
+(uses the configured OPENAI_API_KEY/OPENAI_BASE_URL) and replay it with
+--recording.
+
+Usage:
+    python benchmarks/stream_replay.py --runs 20
+    python benchmarks/stream_replay.py --record recordings.json --runs 5
+    python benchmarks/stream_replay.py --recording recordings.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+FAKE_OPENAI_PORT = 9104
+FAKE_OPENAI_URL = f"http://127.0.0.1:{FAKE_OPENAI_PORT}"
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ["REDIS_PORT"] = "1"  # in-process cache only
+os.environ["SENTIMENT_PRECLASSIFIER_ENABLED"] = "false"  # every analysis needs a completion
+sys.path.insert(0, str(BACKEND_DIR))
+
+SAMPLE_NEWS = [
+    "Ações de tecnologia sobem após resultados trimestrais acima das estimativas.",
+    "Petróleo recua com aumento inesperado dos estoques nos Estados Unidos.",
+    "Bitcoin oscila enquanto investidores aguardam decisão do Federal Reserve.",
+]
+
+
+async def wait_until_up(url: str, timeout: float = 20.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+async def record(path: str, runs: int):
+    """Record real chunk streams: [[seconds since previous chunk, text], ...]"""
+    from app.services.openai_service import openai_service
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    streams = []
+    for number in range(runs):
+        for messages in (
+            openai_service._analysis_messages(SAMPLE_NEWS[number % len(SAMPLE_NEWS)]),
+            openai_service._insights_messages(["AAPL"], "1d"),
+        ):
+            chunks, last = [], time.perf_counter()
+            async for text in openai_service._stream_completion(messages):
+                now = time.perf_counter()
+                chunks.append([round(now - last, 4), text])
+                last = now
+            streams.append(chunks)
+            print(f"recorded stream {len(streams)}: {len(chunks)} chunks")
+
+    with open(path, "w") as f:
+        json.dump({"streams": streams}, f, ensure_ascii=False)
+    await openai_service.close()
+
+
+async def blocking(call):
+    started = time.perf_counter()
+    await call()
+    elapsed = time.perf_counter() - started
+    return elapsed, elapsed, elapsed
+
+
+async def streamed(events):
+    started = time.perf_counter()
+    first_text = first_field = None
+    async for kind, _, _ in events:
+        now = time.perf_counter() - started
+        if kind == "delta" and first_text is None:
+            first_text = now
+        if kind == "field" and first_field is None:
+            first_field = now
+            first_text = first_text or now
+    total = time.perf_counter() - started
+    return first_text or total, first_field or total, total
+
+
+def report(name: str, samples):
+    first_text, first_field, total = (
+        statistics.median(sample[i] for sample in samples) * 1000 for i in range(3)
+    )
+    print(f"{name:<22} {first_text:>12.0f}ms {first_field:>12.0f}ms {total:>10.0f}ms")
+
+
+async def replay(runs: int):
+    from app.services.cache_service import cache_service
+    from app.services.openai_service import openai_service
+
+    logging.getLogger("finmarket").setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    await cache_service.start()
+
+    def content():
+        return f"{SAMPLE_NEWS[0]} ({uuid.uuid4().hex[:8]})"
+
+    def symbols():
+        # One uncached symbol: several would be answered per symbol, not token by token
+        return [f"T{uuid.uuid4().hex[:4].upper()}"]
+
+    results = {name: [] for name in ["analysis blocking", "analysis streamed", "insights blocking", "insights streamed"]}
+    cached = 0
+    for _ in range(runs):
+        results["analysis blocking"].append(await blocking(lambda: openai_service.analyze_news(content())))
+        text = content()
+        results["analysis streamed"].append(await streamed(openai_service.stream_news_analysis(text)))
+        cached += await cache_service.get(cache_service._generate_key("news_analysis", text)) is not None
+
+        results["insights blocking"].append(await blocking(lambda: openai_service.generate_market_insights(symbols())))
+        results["insights streamed"].append(await streamed(openai_service.stream_market_insights(symbols())))
+
+    print(f"{'path':<22} {'first text':>14} {'first field':>14} {'complete':>12}")
+    for name, samples in results.items():
+        report(name, samples)
+    print(f"\nStreamed analyses cached: {cached}/{runs}")
+    await openai_service.close()
+    await cache_service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--record", help="record real chunk streams to this file")
+    parser.add_argument("--recording", help="replay chunk streams recorded with --record")
+    parser.add_argument("--latency", type=float, default=0.4, help="fake time to first token (s)")
+    parser.add_argument("--token-interval", type=float, default=0.03, help="fake seconds between chunks")
+    args = parser.parse_args()
+
+    if args.record:
+        asyncio.run(record(args.record, args.runs))
+        return
+
+    os.environ["OPENAI_BASE_URL"] = f"{FAKE_OPENAI_URL}/v1"
+    command = [sys.executable, "benchmarks/fake_openai.py", "--port", str(FAKE_OPENAI_PORT)]
+    if args.recording:
+        command += ["--replay", str(Path(args.recording).resolve())]
+    else:
+        command += ["--latency", str(args.latency), "--token-interval", str(args.token_interval)]
+    fake_openai = subprocess.Popen(
+        command,
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"{FAKE_OPENAI_URL}/stats"))
+        asyncio.run(replay(args.runs))
+    finally:
+        fake_openai.terminate()
+        fake_openai.wait()
+
+
+if __name__ == "__main__":
+    main()
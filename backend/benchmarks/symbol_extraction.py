@@ -0,0 +1,96 @@
+"""
+Benchmark: ticker extraction, one-pass automaton vs. one regex per alias
+
+Extracts symbols from synthetic articles (NewsAPI-sized title, description
+and content with a few company mentions) with SymbolMatcher and with a
+naive scan that runs one word-boundary regex per dictionary alias, checks
+both agree and reports the cost per article as the dictionary grows.
+
+Usage:
+    python benchmarks/symbol_extraction.py --articles 2000 --extra-symbols 0 500 2000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+sys.path.insert(0, str(BACKEND_DIR))
+
+FILLER = (
+    "markets investors shares quarter guidance earnings revenue analysts rates inflation "
+    "bolsa ações lucro receita juros inflação dólar investidores trimestre resultados"
+).split()
+
+
+def make_articles(count: int, symbols):
+    rng = random.Random(42)
+    aliases = [alias for names in symbols.values() for alias in names]
+    articles = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(220)]
+        for _ in range(3):
+            words.insert(rng.randrange(len(words)), rng.choice(aliases))
+        articles.append(" ".join(words))
+    return articles
+
+
+class RegexMatcher:
+    """One case-aware, word-bounded regex per alias"""
+
+    def __init__(self, symbols):
+        self.patterns = [
+            (symbol, re.compile(
+                rf"(?<!\w){re.escape(alias)}(?!\w)",
+                re.IGNORECASE if alias == alias.lower() else 0
+            ))
+            for symbol, aliases in symbols.items()
+            for alias in aliases
+        ]
+
+    def extract(self, text: str):
+        return sorted({symbol for symbol, pattern in self.patterns if pattern.search(text)})
+
+
+def main():
+    from app.services.symbol_service import SYMBOLS, SymbolMatcher
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--extra-symbols", type=int, nargs="+", default=[0, 500, 2000],
+                        help="synthetic symbols added to the built-in dictionary")
+    args = parser.parse_args()
+
+    print(f"{'symbols':>8} {'aliases':>8} {'automaton':>12} {'regex':>12} {'speedup':>8}")
+    for extra in args.extra_symbols:
+        symbols = dict(SYMBOLS)
+        symbols.update({f"X{n:04d}": [f"X{n:04d}", f"Empresa{n} Holdings"] for n in range(extra)})
+        articles = make_articles(args.articles, symbols)
+        automaton, regex = SymbolMatcher(symbols), RegexMatcher(symbols)
+
+        started = time.perf_counter()
+        fast = [automaton.extract(article) for article in articles]
+        automaton_time = (time.perf_counter() - started) / len(articles)
+
+        started = time.perf_counter()
+        slow = [regex.extract(article) for article in articles]
+        regex_time = (time.perf_counter() - started) / len(articles)
+
+        if fast != slow:
+            mismatches = sum(a != b for a, b in zip(fast, slow))
+            print(f"warning: {mismatches} articles extracted differently")
+        aliases = sum(len(names) for names in symbols.values())
+        print(
+            f"{len(symbols):>8} {aliases:>8} {automaton_time * 1000:>10.3f}ms "
+            f"{regex_time * 1000:>10.3f}ms {regex_time / automaton_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
 from app.core.config import settings
 from app.core.logging import logger
+from app.core.metrics import loop_monitor
+from app.api.response_cache import response_cache
 from app.api.router import api_router
 from app.middleware.error_handler import error_handler_middleware
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.rate_limit import rate_limit_middleware
+from app.services.article_store import article_store
+from app.services.cache_service import cache_service
+from app.services.circuit_breaker import circuit_breakers
+from app.services.health_service import health_monitor
+from app.services.ingestion_service import ingestion_service
+from app.services.news_events import news_events
+from app.services.openai_service import openai_service
+from app.services.search_service import search_service
+from app.services.sentiment_timeseries import sentiment_timeseries
 
 
 @asynccontextmanager
@@ -16,9 +29,31 @@ async def lifespan(app: FastAPI):
     logger.info("Starting FinMarket AI API...")
     logger.info(f"Version: {settings.API_VERSION}")
     logger.info(f"Debug mode: {settings.DEBUG}")
+    if settings.METRICS_ENABLED:
+        await loop_monitor.start()
+    await cache_service.start()
+    await circuit_breakers.start()
+    await search_service.start()
+    await news_events.start()
+    await sentiment_timeseries.start()
+    await response_cache.start()
+    if settings.INGESTION_ENABLED:
+        await ingestion_service.start()
+    await health_monitor.start()
     yield
     # Shutdown
     logger.info("Shutting down FinMarket AI API...")
+    await health_monitor.close()
+    await ingestion_service.stop()
+    await response_cache.close()
+    await sentiment_timeseries.close()
+    await news_events.close()
+    await openai_service.close()
+    await search_service.close()
+    await circuit_breakers.close()
+    await cache_service.close()
+    await article_store.close()
+    await loop_monitor.close()
 
 
 # Create FastAPI application
@@ -43,6 +78,9 @@ app.add_middleware(
 # Custom middlewares
 app.middleware("http")(error_handler_middleware)
 app.middleware("http")(rate_limit_middleware)
+if settings.METRICS_ENABLED:
+    # Added last so it is outermost and times everything below it
+    app.add_middleware(MetricsMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix="/api")
@@ -59,6 +97,13 @@ async def root():
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics"""
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,42 @@
+"""
+Standalone news ingestion worker
+
+Runs the ingestion loop in its own process, writing to the shared article
+store. Run exactly one; the API workers only read (INGESTION_ENABLED
+defaults to false).
+
+Usage:
+    python worker.py
+"""
+import asyncio
+
+from app.core.config import settings
+from app.core.logging import logger
+from app.services.article_store import article_store
+from app.services.cache_service import cache_service
+from app.services.circuit_breaker import circuit_breakers
+from app.services.ingestion_service import ingestion_service
+from app.services.openai_service import openai_service
+from app.services.search_service import search_service
+
+
+async def main():
+    logger.info(f"Starting ingestion worker (store: {settings.STORE_PATH})")
+    await cache_service.start()
+    await circuit_breakers.start()
+    await search_service.start()
+    try:
+        await ingestion_service.run_forever()
+    finally:
+        await openai_service.close()
+        await search_service.close()
+        await circuit_breakers.close()
+        await cache_service.close()
+        await article_store.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("Ingestion worker stopped")
@@ -30,6 +30,77 @@ class ApiService {
         }
     }
 
+    // Busca nas notícias já analisadas (q, category, sentiment, from, to, sort, limit, page)
+    async searchNews(query, filters = {}) {
+        try {
+            const queryParams = new URLSearchParams({ q: query, ...filters }).toString();
+            const response = await fetch(`${API_BASE_URL}/api/news/search?${queryParams}`);
+
+            if (!response.ok) {
+                throw new Error('Erro ao buscar notícias');
+            }
+
+            return await response.json();
+        } catch (error) {
+            console.error('Erro na API:', error);
+            throw error;
+        }
+    }
+
+    // Série temporal de sentimento (resolution: 1m, 1h ou 1d; category ou symbol; points)
+    async getSentimentTimeseries(filters = {}) {
+        try {
+            const queryParams = new URLSearchParams(filters).toString();
+            const response = await fetch(`${API_BASE_URL}/api/sentiment/timeseries?${queryParams}`);
+
+            if (!response.ok) {
+                throw new Error('Erro ao buscar série de sentimento');
+            }
+
+            return await response.json();
+        } catch (error) {
+            console.error('Erro na API:', error);
+            throw error;
+        }
+    }
+
+    // Abre o stream de notícias (Server-Sent Events) e chama onEvent(evento, dados)
+    // para cada `headline`, `analysis` e `article`. Retorna uma função que fecha o stream.
+    // Usa XMLHttpRequest porque o fetch do React Native não entrega o corpo aos poucos.
+    streamNews(filters = {}, onEvent, onError) {
+        const queryParams = new URLSearchParams(filters).toString();
+        const xhr = new XMLHttpRequest();
+        let offset = 0;
+        let buffer = '';
+
+        xhr.onprogress = () => {
+            buffer += xhr.responseText.slice(offset);
+            offset = xhr.responseText.length;
+
+            const messages = buffer.split('\n\n');
+            buffer = messages.pop();
+            for (const message of messages) {
+                let event = 'message';
+                let data = '';
+                for (const line of message.split('\n')) {
+                    if (line.startsWith('event: ')) event = line.slice(7);
+                    else if (line.startsWith('data: ')) data += line.slice(6);
+                }
+                if (data) onEvent(event, JSON.parse(data));
+            }
+        };
+        xhr.onerror = () => {
+            console.error('Erro no stream de notícias');
+            if (onError) onError(new Error('Erro no stream de notícias'));
+        };
+
+        xhr.open('GET', `${API_BASE_URL}/api/news/stream?${queryParams}`);
+        xhr.setRequestHeader('Accept', 'text/event-stream');
+        xhr.send();
+
+        return () => xhr.abort();
+    }
+
     async getNewsSummary(newsId) {
         try {
             const response = await fetch(`${API_BASE_URL}/api/news/${newsId}/summary`);